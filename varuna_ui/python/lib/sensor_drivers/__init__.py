@@ -10,10 +10,13 @@ LOCATION: varuna_ui/python/lib/sensor_drivers/__init__.py
 
 """
 Sensor driver package for Varuna water level monitoring system.
+
+Importing the package loads no driver. Scripts get drivers from
+registry.DriverRegistry, which imports only those enabled in config.json.
 """
 
 __version__ = "1.0.0"
-__all__ = ["mpu6050_driver", "dht22_driver"]
+__all__ = ["mpu6050_driver", "dht22_driver", "sim800l_driver", "fusion_filters", "sms_pdu", "simulated_hardware", "registry", "metrics"]
 
 """
 ═══════════════════════════════════════════════════════════════
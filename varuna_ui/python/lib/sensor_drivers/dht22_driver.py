@@ -8,36 +8,58 @@ LOCATION: varuna_ui/python/lib/sensor_drivers/dht22_driver.py
 ═══════════════════════════════════════════════════════════════
 """
 
+import sys
 import time
+import random
+import threading
+import importlib.util
 
-# Try to import Adafruit DHT library
-try:
-    import adafruit_dht
-    import board
-    DHT_AVAILABLE = True
-except ImportError:
-    DHT_AVAILABLE = False
-    print("Warning: adafruit_dht not available - DHT22 will use simulated data")
+# The Adafruit DHT library is imported when the first DHT22 is created:
+# importing board brings up Blinka, which costs more than the rest of a
+# one-shot reading. Checking that it is installed is cheap.
+DHT_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("adafruit_dht", "board"))
 
 
 class DHT22:
     """Driver for DHT22 temperature and humidity sensor."""
 
-    def __init__(self, pin=4, retry_count=3):
+    # The DHT22 cannot be read more often than every 2 seconds
+    MIN_INTERVAL = 2.0
+
+    # A cached reading older than this is reported as STALE
+    STALE_AFTER = 10.0
+
+    def __init__(self, pin=4, retry_count=3, metrics=None):
         """
         Initialize DHT22 sensor.
 
         Args:
             pin: GPIO pin number (BCM numbering)
             retry_count: Number of retries on read failure
+            metrics: metrics.Metrics that times every transfer and counts
+                     retries, or None (no timing)
         """
         self.pin = pin
         self.retry_count = retry_count
+        self.metrics = metrics
         self.dht_device = None
         self.is_available = DHT_AVAILABLE
 
-        if self.is_available:
+        # Background sampler state (see start_sampler)
+        self._lock = threading.Lock()
+        self._cache = None            # (temperature, humidity, monotonic time)
+        self._last_attempt = None      # monotonic end of the last transfer
+        self._consecutive_failures = 0
+        self._sampler = None
+        self._stop_event = threading.Event()
+
+        if not self.is_available:
+            print("Warning: adafruit_dht not available - DHT22 will use simulated data", file=sys.stderr)
+        else:
             try:
+                import adafruit_dht
+                import board
+
                 # Map GPIO pin number to board pin
                 pin_map = {
                     4: board.D4,
@@ -50,40 +72,85 @@ class DHT22:
 
                 board_pin = pin_map.get(pin, board.D4)
                 self.dht_device = adafruit_dht.DHT22(board_pin, use_pulseio=False)
-                print(f"DHT22: Initialized on GPIO pin {pin}")
+                print(f"DHT22: Initialized on GPIO pin {pin}", file=sys.stderr)
             except Exception as e:
-                print(f"DHT22: Failed to initialize - {e}")
+                print(f"DHT22: Failed to initialize - {e}", file=sys.stderr)
                 self.is_available = False
                 self.dht_device = None
 
-    def read_temperature(self):
+    def _simulated_measurement(self):
+        """Random values for development without a sensor (never cached)."""
+        return 25.0 + random.uniform(-5, 10), 60.0 + random.uniform(-10, 20)
+
+    def _wait_min_interval(self, stop_event=None):
+        """Sleep until MIN_INTERVAL has passed since the last acquisition attempt."""
+        if self._last_attempt is None:
+            return
+        wait = self._last_attempt + self.MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            if stop_event is not None:
+                stop_event.wait(wait)
+            else:
+                time.sleep(wait)
+
+    def read_measurement(self, stop_event=None):
         """
-        Read temperature from DHT22 sensor.
+        Read temperature and humidity in one acquisition.
+
+        The sensor sends both values in the same 40-bit frame, so one
+        transfer serves both. Retries respect MIN_INTERVAL.
+
+        Args:
+            stop_event: Optional threading.Event that aborts retry waits
 
         Returns:
-            Temperature in Celsius, or None on failure
+            Tuple of (temperature in Celsius, relative humidity in %), or
+            (None, None) on failure
         """
         if not self.is_available:
-            # Return simulated data
-            import random
-            return 25.0 + random.uniform(-5, 10)
+            return self._simulated_measurement()
 
         for attempt in range(self.retry_count):
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            self._wait_min_interval(stop_event)
+            metrics = self.metrics
+            if metrics is not None:
+                if attempt:
+                    metrics.increment("dht_retries")
+                start = time.perf_counter()
             try:
+                # adafruit_dht performs one transfer; the second property
+                # returns the value from the same frame
                 temperature = self.dht_device.temperature
-                if temperature is not None:
-                    return temperature
-                time.sleep(0.5)
+                humidity = self.dht_device.humidity
+                if temperature is not None and humidity is not None:
+                    return temperature, humidity
             except RuntimeError as e:
-                if attempt < self.retry_count - 1:
-                    time.sleep(1.0)
-                else:
-                    print(f"DHT22: Failed to read temperature after {self.retry_count} attempts - {e}")
+                # Checksum/timing glitches are common on the DHT22
+                if attempt == self.retry_count - 1:
+                    print(f"DHT22: Failed to read sensor after {self.retry_count} attempts - {e}", file=sys.stderr)
             except Exception as e:
-                print(f"DHT22: Unexpected error reading temperature - {e}")
+                print(f"DHT22: Unexpected error reading sensor - {e}", file=sys.stderr)
                 break
+            finally:
+                # Timed from the end of the transfer: calling adafruit_dht again
+                # within 2 s of its start silently returns the previous values
+                self._last_attempt = time.monotonic()
+                if metrics is not None:
+                    metrics.observe("dht_transfer", time.perf_counter() - start)
 
-        return None
+        return None, None
+
+    def read_temperature(self):
+        """
+        Read temperature from DHT22 sensor.
+
+        Returns:
+            Temperature in Celsius, or None on failure
+        """
+        return self.read_measurement()[0]
 
     def read_humidity(self):
         """
@@ -92,47 +159,101 @@ class DHT22:
         Returns:
             Relative humidity in %, or None on failure
         """
-        if not self.is_available:
-            # Return simulated data
-            import random
-            return 60.0 + random.uniform(-10, 20)
+        return self.read_measurement()[1]
 
-        for attempt in range(self.retry_count):
-            try:
-                humidity = self.dht_device.humidity
-                if humidity is not None:
-                    return humidity
-                time.sleep(0.5)
-            except RuntimeError as e:
-                if attempt < self.retry_count - 1:
-                    time.sleep(1.0)
-                else:
-                    print(f"DHT22: Failed to read humidity after {self.retry_count} attempts - {e}")
-            except Exception as e:
-                print(f"DHT22: Unexpected error reading humidity - {e}")
-                break
+    def _sampler_loop(self, interval):
+        while not self._stop_event.is_set():
+            temperature, humidity = self.read_measurement(self._stop_event)
 
-        return None
+            if temperature is not None and self._is_valid(temperature, humidity):
+                with self._lock:
+                    self._cache = (temperature, humidity, time.monotonic())
+                self._consecutive_failures = 0
+            elif not self._stop_event.is_set():
+                self._consecutive_failures += 1
+
+            self._stop_event.wait(max(interval, self.MIN_INTERVAL))
+
+    def start_sampler(self, interval=MIN_INTERVAL):
+        """
+        Sample the sensor on a background thread.
+
+        read_sensor_data() then returns the last good reading at once
+        instead of blocking on the sensor. Nothing is started when the
+        sensor is unavailable, so simulated values never enter the cache.
+
+        Args:
+            interval: Seconds between acquisitions (at least MIN_INTERVAL)
+        """
+        if not self.is_available or self._sampler is not None:
+            return
+
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sampler_loop, args=(interval,),
+                                         name="dht22-sampler", daemon=True)
+        self._sampler.start()
+        print(f"DHT22: Background sampling every {max(interval, self.MIN_INTERVAL):.1f}s", file=sys.stderr)
+
+    def stop_sampler(self):
+        """Stop the background sampler."""
+        if self._sampler is None:
+            return
+        self._stop_event.set()
+        self._sampler.join(timeout=self.MIN_INTERVAL + 1.0)
+        self._sampler = None
+
+    @staticmethod
+    def _is_valid(temperature, humidity):
+        """Check if readings are within the sensor's valid ranges."""
+        return -40 <= temperature <= 80 and 0 <= humidity <= 100
+
+    def _cached_sensor_data(self):
+        """Last good sampler reading with its age."""
+        with self._lock:
+            cache = self._cache
+
+        if cache is None:
+            # STALE until the first acquisition has had a chance to finish
+            return {
+                "temperature": 0.0,
+                "humidity": 0.0,
+                "status": "FAULT" if self._consecutive_failures else "STALE",
+                "age_s": None
+            }
+
+        temperature, humidity, taken = cache
+        age = time.monotonic() - taken
+        return {
+            "temperature": round(temperature, 1),
+            "humidity": round(humidity, 1),
+            "status": "OK" if age <= self.STALE_AFTER else "STALE",
+            "age_s": round(age, 1)
+        }
 
     def read_sensor_data(self):
         """
         Read complete sensor data package.
 
+        Returns the background sampler's cache when it is running (status
+        STALE if the last good reading is older than STALE_AFTER), otherwise
+        performs one combined acquisition.
+
         Returns:
             Dictionary containing temperature, humidity, and status
         """
+        if self._sampler is not None:
+            return self._cached_sensor_data()
+
         try:
-            temperature = self.read_temperature()
-            humidity = self.read_humidity()
+            temperature, humidity = self.read_measurement()
 
             # Validate readings
             if temperature is not None and humidity is not None:
-                # Check if readings are within valid ranges
-                if -40 <= temperature <= 80 and 0 <= humidity <= 100:
+                if self._is_valid(temperature, humidity):
                     status = "OK" if self.is_available else "SIMULATED"
                 else:
                     status = "FAULT"
-                    print(f"DHT22: Invalid reading - Temp: {temperature:.1f}°C, Humidity: {humidity:.1f}%")
+                    print(f"DHT22: Invalid reading - Temp: {temperature:.1f}°C, Humidity: {humidity:.1f}%", file=sys.stderr)
             else:
                 status = "FAULT"
                 temperature = 0.0
@@ -145,7 +266,7 @@ class DHT22:
             }
 
         except Exception as e:
-            print(f"DHT22: Error reading sensor - {e}")
+            print(f"DHT22: Error reading sensor - {e}", file=sys.stderr)
             return {
                 "temperature": 0.0,
                 "humidity": 0.0,
@@ -154,12 +275,14 @@ class DHT22:
 
     def close(self):
         """Clean up sensor resources."""
+        self.stop_sampler()
+
         if self.dht_device:
             try:
                 self.dht_device.exit()
-                print("DHT22: Sensor closed")
+                print("DHT22: Sensor closed", file=sys.stderr)
             except Exception as e:
-                print(f"DHT22: Error closing sensor - {e}")
+                print(f"DHT22: Error closing sensor - {e}", file=sys.stderr)
 
 
 """
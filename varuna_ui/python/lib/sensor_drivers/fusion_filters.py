@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/sensor_drivers/fusion_filters.py
+PHASE: PRODUCTION - Real MPU6050 Integration
+LOCATION: varuna_ui/python/lib/sensor_drivers/fusion_filters.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Pitch fusion filters for the MPU6050 lever arm.
+
+Every filter fuses an accelerometer pitch angle (noisy, no drift) with the
+gyro pitch rate (smooth, drifts) one sample at a time:
+
+    angle = filter.update(accel_angle, gyro_rate, dt)
+
+Select one from config.json:
+
+    "fusion": {"filter": "kalman", "q_angle": 0.001, ...}
+"""
+
+
+class FusionFilter:
+    """Base class for single-axis pitch fusion filters."""
+
+    name = "base"
+
+    def __init__(self, seed_from_accel=True):
+        """
+        Args:
+            seed_from_accel: Start from the first accelerometer angle instead of 0°
+        """
+        self.seed_from_accel = seed_from_accel
+        self.angle = 0.0
+        self.seeded = False
+
+    def reset(self, angle=0.0):
+        """Forget the filter state and restart from the given angle."""
+        self.angle = angle
+        self.seeded = False
+
+    def update(self, accel_angle, gyro_rate, dt):
+        """
+        Advance the filter by one sample.
+
+        Args:
+            accel_angle: Accelerometer pitch in degrees
+            gyro_rate: Gyro pitch rate in degrees/second
+            dt: Time since the previous sample in seconds
+
+        Returns:
+            Filtered pitch angle in degrees
+        """
+        if not self.seeded:
+            self.seeded = True
+            if self.seed_from_accel:
+                self.angle = accel_angle
+                return self.angle
+
+        return self._step(accel_angle, gyro_rate, dt)
+
+    def _step(self, accel_angle, gyro_rate, dt):
+        raise NotImplementedError
+
+
+class ComplementaryFilter(FusionFilter):
+    """Fixed-gain blend of integrated gyro and accelerometer angle."""
+
+    name = "complementary"
+
+    def __init__(self, alpha=0.98, seed_from_accel=False):
+        """
+        Args:
+            alpha: Gyro weight (0.98 = trust gyro 98%, accel 2%)
+            seed_from_accel: Start from the first accelerometer angle instead of 0°
+        """
+        super().__init__(seed_from_accel=seed_from_accel)
+        self.alpha = alpha
+
+    def _step(self, accel_angle, gyro_rate, dt):
+        self.angle = self.alpha * (self.angle + gyro_rate * dt) + (1 - self.alpha) * accel_angle
+        return self.angle
+
+
+class KalmanFilter(FusionFilter):
+    """Two-state (angle, gyro bias) Kalman filter with online bias estimation."""
+
+    name = "kalman"
+
+    def __init__(self, q_angle=0.001, q_bias=0.003, r_measure=0.03, seed_from_accel=True):
+        """
+        Args:
+            q_angle: Process noise of the angle
+            q_bias: Process noise of the gyro bias
+            r_measure: Variance of the accelerometer angle
+            seed_from_accel: Start from the first accelerometer angle instead of 0°
+        """
+        super().__init__(seed_from_accel=seed_from_accel)
+        self.q_angle = q_angle
+        self.q_bias = q_bias
+        self.r_measure = r_measure
+        self.reset()
+
+    def reset(self, angle=0.0):
+        super().reset(angle)
+        self.bias = 0.0
+        self.p = [[0.0, 0.0], [0.0, 0.0]]
+
+    def _step(self, accel_angle, gyro_rate, dt):
+        p = self.p
+
+        # Predict: integrate the bias-corrected rate
+        self.angle += dt * (gyro_rate - self.bias)
+        p[0][0] += dt * (dt * p[1][1] - p[0][1] - p[1][0] + self.q_angle)
+        p[0][1] -= dt * p[1][1]
+        p[1][0] -= dt * p[1][1]
+        p[1][1] += self.q_bias * dt
+
+        # Correct with the accelerometer angle
+        s = p[0][0] + self.r_measure
+        k0 = p[0][0] / s
+        k1 = p[1][0] / s
+        innovation = accel_angle - self.angle
+
+        self.angle += k0 * innovation
+        self.bias += k1 * innovation
+
+        p00, p01 = p[0][0], p[0][1]
+        p[0][0] -= k0 * p00
+        p[0][1] -= k0 * p01
+        p[1][0] -= k1 * p00
+        p[1][1] -= k1 * p01
+
+        return self.angle
+
+
+class MahonyFilter(FusionFilter):
+    """Mahony-style PI observer: the integral term tracks the gyro bias."""
+
+    name = "mahony"
+
+    def __init__(self, kp=2.0, ki=0.1, seed_from_accel=True):
+        """
+        Args:
+            kp: Proportional gain on the accel/gyro disagreement (1/s)
+            ki: Integral gain (1/s²)
+            seed_from_accel: Start from the first accelerometer angle instead of 0°
+        """
+        super().__init__(seed_from_accel=seed_from_accel)
+        self.kp = kp
+        self.ki = ki
+        self.integral = 0.0
+
+    def reset(self, angle=0.0):
+        super().reset(angle)
+        self.integral = 0.0
+
+    def _step(self, accel_angle, gyro_rate, dt):
+        error = accel_angle - self.angle
+        self.integral += self.ki * error * dt
+        self.angle += (gyro_rate + self.kp * error + self.integral) * dt
+        return self.angle
+
+
+FILTERS = {
+    ComplementaryFilter.name: ComplementaryFilter,
+    KalmanFilter.name: KalmanFilter,
+    MahonyFilter.name: MahonyFilter,
+}
+
+
+def create_filter(fusion_config=None):
+    """
+    Build a fusion filter from the "fusion" section of config.json.
+
+    Args:
+        fusion_config: Dictionary with "filter" (name) and that filter's
+                       keyword parameters; None selects the complementary filter
+
+    Returns:
+        FusionFilter instance
+    """
+    params = dict(fusion_config or {})
+    name = params.pop("filter", ComplementaryFilter.name)
+
+    if name not in FILTERS:
+        raise ValueError(f"Unknown fusion filter '{name}' (choose from {', '.join(FILTERS)})")
+
+    return FILTERS[name](**params)
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/sensor_drivers/fusion_filters.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/sensor_drivers/metrics.py
+PHASE: PRODUCTION - Diagnostics
+LOCATION: varuna_ui/python/lib/sensor_drivers/metrics.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Per-stage latency histograms and error counters for the acquisition
+pipeline.
+
+Drivers take an optional Metrics instance and time their stages with
+time.perf_counter (monotonic). Without one (the default) they skip the
+timing entirely, so disabled metrics cost one attribute test per stage.
+A snapshot goes into the reader's output as "_metrics", and
+TextfileExporter writes the Prometheus text format for node_exporter's
+textfile collector.
+"""
+
+import os
+import sys
+import time
+import bisect
+import threading
+import contextlib
+
+# Histogram bucket upper bounds in seconds: I2C bursts are ~0.1-1 ms,
+# DHT transfers ~5 ms, modem round-trips up to a minute
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Counters that are always exported, so a rate() sees them from zero
+COUNTERS = {
+    "i2c_errors": "Failed MPU6050 I2C transactions",
+    "dht_retries": "DHT22 transfers repeated after a checksum or timing error",
+    "at_timeouts": "AT commands without a final result code before the timeout",
+    "sample_deadlines_missed": "Polled MPU6050 sample slots skipped because a sample woke a period late"
+}
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative only when exported)."""
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding the q-quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Seconds (never above the largest observation), or None if empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Span:
+    """Context manager that observes its duration on exit."""
+
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+# Shared by every span() taken while metrics are disabled
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(metrics, stage):
+    """
+    Time a block if metrics are enabled: with span(metrics, "history"): ...
+
+    Args:
+        metrics: Metrics instance, or None
+        stage: Stage name
+
+    Returns:
+        Context manager (a shared no-op one when metrics is None)
+    """
+    return _NO_SPAN if metrics is None else metrics.span(stage)
+
+
+class Metrics:
+    """Thread-safe stage histograms and counters for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.started = time.time()
+
+    def observe(self, stage, seconds):
+        """
+        Record one stage duration.
+
+        Args:
+            stage: Stage name (e.g. "mpu_i2c_burst", "json_encode")
+            seconds: Duration measured with time.perf_counter
+        """
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def increment(self, counter, amount=1):
+        """Add to a counter (created on first use if not in COUNTERS)."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def span(self, stage):
+        """
+        Time a block: with metrics.span("history"): ...
+
+        Hot paths use observe() with their own perf_counter calls instead;
+        the context manager costs about a microsecond more.
+        """
+        return _Span(self, stage)
+
+    def snapshot(self):
+        """
+        Summary for the "_metrics" output block.
+
+        Returns:
+            {"uptime_s", "stages": {stage: {count, mean_ms, p50_ms, p99_ms,
+            max_ms}}, "counters": {name: value}}
+        """
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000.0, 3)
+
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": h.count,
+                    "mean_ms": ms(h.sum / h.count),
+                    "p50_ms": ms(h.quantile(0.5)),
+                    "p99_ms": ms(h.quantile(0.99)),
+                    "max_ms": ms(h.max)
+                }
+                for stage, h in sorted(self.histograms.items())
+            }
+            counters = dict(self.counters)
+
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "stages": stages,
+            "counters": counters
+        }
+
+    def prometheus(self, prefix="varuna", labels=None):
+        """
+        Render every histogram and counter in the Prometheus text format.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Extra labels for every sample, e.g. {"device_id": ...}
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        extra = "".join(f',{key}="{_escape(value)}"' for key, value in sorted((labels or {}).items()))
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of one acquisition pipeline stage",
+            f"# TYPE {name} histogram"
+        ]
+
+        with self._lock:
+            for stage, h in sorted(self.histograms.items()):
+                label = f'stage="{_escape(stage)}"{extra}'
+                cumulative = 0
+                for bound, count in zip(h.bounds, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {h.count}')
+                lines.append(f"{name}_sum{{{label}}} {h.sum:.9g}")
+                lines.append(f"{name}_count{{{label}}} {h.count}")
+
+            counters = sorted(self.counters.items())
+
+        for counter, value in counters:
+            counter_name = f"{prefix}_{counter}_total"
+            lines.append(f"# HELP {counter_name} {COUNTERS.get(counter, counter.replace('_', ' '))}")
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name}{{{extra[1:]}}} {value}" if extra else f"{counter_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class TextfileExporter:
+    """Writes Metrics.prometheus() to a .prom file for node_exporter."""
+
+    def __init__(self, metrics, path, interval=15.0, prefix="varuna", labels=None):
+        """
+        Args:
+            metrics: Metrics instance to export
+            path: Output file; node_exporter reads *.prom from its
+                  --collector.textfile.directory
+            interval: Seconds between writes from the background thread
+            prefix: Metric name prefix
+            labels: Extra labels for every sample
+        """
+        self.metrics = metrics
+        self.path = str(path)
+        self.interval = interval
+        self.prefix = prefix
+        self.labels = labels
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def write(self):
+        """
+        Write the file with an atomic rename, so the collector never reads
+        half of it. Failures are reported, not raised.
+        """
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary, "w") as f:
+                f.write(self.metrics.prometheus(self.prefix, self.labels))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"WARNING: Cannot write metrics to {self.path} - {e}", file=sys.stderr)
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def start(self):
+        """Write every interval seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="metrics-textfile", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write the final values."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.write()
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/sensor_drivers/metrics.py
+═══════════════════════════════════════════════════════════════
+"""
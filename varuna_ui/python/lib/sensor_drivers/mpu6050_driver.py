@@ -10,24 +10,332 @@ LOCATION: varuna_ui/python/lib/sensor_drivers/mpu6050_driver.py
 
 import time
 import math
+import struct
 import sys
+import importlib.util
 
+# smbus2 is only needed for real hardware; a simulated bus can be injected
 try:
     import smbus2
     SMBUS_AVAILABLE = True
 except ImportError:
-    print("ERROR: smbus2 not installed. Install with: sudo pip3 install smbus2", file=sys.stderr)
-    sys.exit(1)
+    SMBUS_AVAILABLE = False
+
+from .fusion_filters import ComplementaryFilter
+
+# NumPy is optional: scalar calls use math, arrays need NumPy. It is
+# imported on first batch use so one-shot readings do not pay for it.
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+# ═══════════════════════════════════════════════════════════════
+# Batch fusion engine
+#
+# These functions accept scalars or NumPy arrays. The MPU6050 methods
+# delegate to them, so live readings, FIFO windows and recorded raw data
+# all go through the same arithmetic.
+# ═══════════════════════════════════════════════════════════════
+
+def _is_scalar(*values):
+    return all(isinstance(v, (int, float)) for v in values)
+
+
+def _require_numpy(*values):
+    """Import NumPy on first use; raise if array-likes are passed without it."""
+    global np
+    if np is None:
+        if not NUMPY_AVAILABLE:
+            if _is_scalar(*values):
+                return None
+            raise RuntimeError("numpy is required for batch processing. Install with: sudo pip3 install numpy")
+        import numpy
+        np = numpy
+    return np
+
+
+def accel_pitch_angles(accel_x, accel_y, accel_z):
+    """
+    Pitch from accelerometer data: atan2(accel_y, sqrt(accel_x^2 + accel_z^2)).
+
+    Args:
+        accel_x, accel_y, accel_z: Acceleration in g's (scalars or arrays)
+
+    Returns:
+        Pitch angle(s) in degrees
+    """
+    if not _is_scalar(accel_x, accel_y, accel_z):
+        _require_numpy(accel_x, accel_y, accel_z)
+        accel_x = np.asarray(accel_x, dtype=np.float64)
+        accel_y = np.asarray(accel_y, dtype=np.float64)
+        accel_z = np.asarray(accel_z, dtype=np.float64)
+        return np.degrees(np.arctan2(accel_y, np.sqrt(accel_x * accel_x + accel_z * accel_z)))
+
+    return math.degrees(math.atan2(accel_y, math.sqrt(accel_x * accel_x + accel_z * accel_z)))
+
+
+def complementary_filter(accel_angles, gyro_x, dt, alpha=0.98, initial_angle=0.0):
+    """
+    Run the complementary filter over a whole sample sequence.
+
+    The recurrence angle[n] = alpha * (angle[n-1] + gyro_x[n] * dt[n])
+    + (1 - alpha) * accel_angle[n] is linear, so it is evaluated in blocks:
+    inside a block every output is a scaled prefix sum of the inputs, and
+    only the last angle of each block is carried forward. Block length is
+    chosen so alpha^-length stays below 1e6 and the prefix sums keep full
+    precision.
+
+    Args:
+        accel_angles: Accelerometer pitch angles in degrees (array)
+        gyro_x: Pitch rates in degrees/second (array)
+        dt: Sample period(s) in seconds (scalar or array)
+        alpha: Gyro weight (0-1)
+        initial_angle: Filter state before the first sample
+
+    Returns:
+        Array of filtered pitch angles in degrees
+    """
+    _require_numpy(accel_angles, gyro_x, dt)
+
+    accel_angles = np.asarray(accel_angles, dtype=np.float64)
+    gyro_x = np.asarray(gyro_x, dtype=np.float64)
+
+    # Per-sample input of the recurrence: angle[n] = alpha * angle[n-1] + u[n]
+    u = alpha * (gyro_x * dt) + (1 - alpha) * accel_angles
+    angles = np.empty_like(u)
+
+    if alpha <= 0.0:
+        angles[:] = u
+        return angles
+
+    if alpha >= 1.0:
+        block = max(1, len(u))
+    else:
+        block = int(min(1024, max(1, 6.0 * math.log(10) / -math.log(alpha))))
+
+    powers = alpha ** np.arange(1, block + 1, dtype=np.float64)
+    previous = initial_angle
+
+    for start in range(0, len(u), block):
+        chunk = u[start:start + block]
+        p = powers[:len(chunk)]
+        angles[start:start + len(chunk)] = p * (previous + np.cumsum(chunk / p))
+        previous = angles[start + len(chunk) - 1]
+
+    return angles
+
+
+def water_levels_cm(angle_degrees, L_arm=1.5, H_pivot=2.0, R_float=0.15):
+    """
+    Lever-arm water level: (H_pivot - L_arm * sin(θ) - R_float) * 100.
+
+    Args:
+        angle_degrees: Pitch angle(s) in degrees (scalar or array)
+        L_arm: Length of arm from pivot to float center (meters)
+        H_pivot: Height of pivot above datum (meters)
+        R_float: Radius of float sphere (meters)
+
+    Returns:
+        Water level(s) in centimeters relative to datum
+    """
+    if not _is_scalar(angle_degrees):
+        _require_numpy(angle_degrees)
+        H_sub = L_arm * np.sin(np.radians(np.asarray(angle_degrees, dtype=np.float64)))
+    else:
+        H_sub = L_arm * math.sin(math.radians(angle_degrees))
+
+    return (H_pivot - H_sub - R_float) * 100.0
+
+
+def process_batch(accel, gyro_x, timestamps, L_arm=1.5, H_pivot=2.0, R_float=0.15,
+                  alpha=0.98, calibration_offset=0.0, initial_angle=0.0, last_time=None):
+    """
+    Convert raw samples to filtered pitch angles and water levels.
+
+    Args:
+        accel: Array of shape (N, 3) with accel X/Y/Z in g's
+        gyro_x: Array of N pitch rates in degrees/second
+        timestamps: Array of N sample times in seconds
+        L_arm, H_pivot, R_float: Lever-arm geometry in meters
+        alpha: Complementary filter gyro weight
+        calibration_offset: Pitch offset in degrees added after filtering
+        initial_angle: Filter state before the first sample
+        last_time: Time of the sample before the batch (first dt is 0 if None)
+
+    Returns:
+        Tuple of (pitch angles in degrees, water levels in cm) arrays
+    """
+    _require_numpy(accel)
+
+    accel = np.asarray(accel, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    previous = timestamps[:1] if last_time is None else [last_time]
+    dt = np.diff(timestamps, prepend=previous)
+
+    accel_angles = accel_pitch_angles(accel[:, 0], accel[:, 1], accel[:, 2])
+    angles = complementary_filter(accel_angles, gyro_x, dt, alpha=alpha, initial_angle=initial_angle)
+    angles += calibration_offset
+
+    return angles, water_levels_cm(angles, L_arm=L_arm, H_pivot=H_pivot, R_float=R_float)
+
+
+class RunningStats:
+    """Streaming mean and variance (Welford), mergeable so windows can be folded in."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Fold another RunningStats in (Chan et al. pairwise update)."""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        """Standard error of the mean (inf until there are two values)."""
+        return math.sqrt(self.variance / self.n) if self.n > 1 else math.inf
+
+
+class SampleClock:
+    """
+    Paces polled samples against absolute deadlines on time.monotonic_ns().
+
+    Deadline k is start + k * period, so compute and I2C time inside a
+    slot do not push the following samples back, and NTP or GSM clock
+    steps cannot stretch or shrink the interval. A sample that wakes more
+    than a whole period late counts the slots it skipped as missed and
+    continues on the grid instead of bursting to catch up.
+    """
+
+    def __init__(self, period, spin=0.0):
+        """
+        Args:
+            period: Seconds between samples (0 = back to back, unpaced)
+            spin: Busy-wait this many seconds before each deadline instead of
+                  sleeping, trading CPU for lower jitter (default: sleep only)
+        """
+        self.period_ns = max(0, int(round(period * 1e9)))
+        self.spin_ns = max(0, int(round(spin * 1e9)))
+        self.start_ns = None
+        self.deadline = None
+        self.stamps = []         # monotonic_ns of every sample
+        self.lateness = []       # ns after its deadline each paced sample woke
+        self.missed = 0
+
+    def start(self):
+        """
+        Put the first deadline at the current time (the first wait() does
+        this if start() was not called).
+
+        Returns:
+            Start time in monotonic nanoseconds
+        """
+        self.start_ns = self.deadline = time.monotonic_ns()
+        return self.start_ns
+
+    def wait(self):
+        """
+        Block until the next deadline.
+
+        Returns:
+            Sample time in monotonic nanoseconds
+        """
+        if self.deadline is None:
+            self.start()
+
+        now = time.monotonic_ns()
+        if not self.stamps:
+            # The first sample is taken at once; it has no wake-up lateness
+            self.stamps.append(now)
+            return now
+
+        self.deadline += self.period_ns
+        late = now - self.deadline
+        if self.period_ns and late >= self.period_ns:
+            skipped = late // self.period_ns
+            self.missed += skipped
+            self.deadline += skipped * self.period_ns
+
+        remaining = self.deadline - now
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        # time.sleep never returns early on the monotonic clock, so this
+        # only spins within the spin margin
+        while now < self.deadline:
+            now = time.monotonic_ns()
+
+        self.stamps.append(now)
+        self.lateness.append(now - self.deadline)
+        return now
+
+    def stats(self):
+        """
+        Achieved rate and jitter of the samples taken so far.
+
+        Returns:
+            Dictionary with target_hz, achieved_hz, jitter_ms (p50, p99 and
+            max wake-up lateness after the deadline), missed deadlines and
+            the sample count
+        """
+        count = len(self.stamps)
+        span = self.stamps[-1] - self.stamps[0] if count > 1 else 0
+        lateness = sorted(self.lateness)
+
+        def percentile(q):
+            if not lateness:
+                return None
+            n = len(lateness)
+            return round(lateness[min(n - 1, max(0, int(math.ceil(q * n)) - 1))] / 1e6, 3)
+
+        return {
+            "target_hz": round(1e9 / self.period_ns, 2) if self.period_ns else None,
+            "achieved_hz": round((count - 1) * 1e9 / span, 2) if span > 0 else None,
+            "jitter_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": percentile(1.0)},
+            "missed": self.missed,
+            "samples": count
+        }
 
 
 class MPU6050:
     """Driver for MPU-6050 IMU sensor - REAL HARDWARE ONLY."""
 
     # MPU6050 Registers
+    SMPLRT_DIV = 0x19
+    CONFIG = 0x1A
+    FIFO_EN = 0x23
+    INT_STATUS = 0x3A
+    USER_CTRL = 0x6A
     PWR_MGMT_1 = 0x6B
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
     ACCEL_XOUT_H = 0x3B
     ACCEL_YOUT_H = 0x3D
     ACCEL_ZOUT_H = 0x3F
+    TEMP_OUT_H = 0x41
     GYRO_XOUT_H = 0x43
     GYRO_YOUT_H = 0x45
     GYRO_ZOUT_H = 0x47
@@ -36,7 +344,29 @@ class MPU6050:
     ACCEL_SCALE = 16384.0  # For ±2g range
     GYRO_SCALE = 131.0     # For ±250°/s range
 
-    def __init__(self, address=0x68, bus=1, calibration_offset=0.0):
+    # Burst layout of the 14 data registers 0x3B-0x48:
+    # accel X/Y/Z, temperature, gyro X/Y/Z as big-endian signed words
+    SAMPLE_LENGTH = 14
+    SAMPLE_FORMAT = struct.Struct('>7h')
+
+    # FIFO configuration bits
+    FIFO_EN_XG = 0x40          # FIFO_EN: gyro X
+    FIFO_EN_ACCEL = 0x08       # FIFO_EN: accel X/Y/Z
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+    INT_FIFO_OFLOW = 0x10      # INT_STATUS: FIFO overflow
+
+    # FIFO frames hold accel X/Y/Z then gyro X (registers in address order).
+    # 8-byte frames divide both the 1024-byte FIFO and the 32-byte SMBus
+    # block limit, so every drain transaction carries four whole samples.
+    FIFO_SIZE = 1024
+    FIFO_FRAME_LENGTH = 8
+    FIFO_FRAME_FORMAT = struct.Struct('>4h')
+    FIFO_READ_CHUNK = 32
+    GYRO_OUTPUT_RATE = 1000.0  # Hz, with the DLPF enabled (DLPF_CFG 1-6)
+
+    def __init__(self, address=0x68, bus=1, calibration_offset=0.0, fusion_filter=None, smbus=None,
+                 gyro_bias=(0.0, 0.0, 0.0), metrics=None):
         """
         Initialize MPU6050 sensor - REQUIRES REAL HARDWARE.
 
@@ -44,25 +374,50 @@ class MPU6050:
             address: I2C address of MPU6050 (default 0x68)
             bus: I2C bus number (default 1 for Raspberry Pi)
             calibration_offset: Pitch angle calibration offset in degrees
+            fusion_filter: FusionFilter instance (default: complementary, alpha 0.98)
+            smbus: Already open SMBus-like object to use instead of opening
+                   /dev/i2c-<bus> (e.g. simulated_hardware.FakeSMBus)
+            gyro_bias: Gyro X/Y/Z zero-rate offsets in degrees/second,
+                       subtracted from every reading (see calibrate_static)
+            metrics: metrics.Metrics that times I2C transactions and the
+                     filter and counts I2C errors, or None (no timing)
+
+        Raises:
+            RuntimeError: If smbus2 is missing or the sensor does not respond
         """
         self.address = address
         self.bus_number = bus
         self.calibration_offset = calibration_offset
-
-        # Complementary filter parameter (0.98 = trust gyro 98%, accel 2%)
-        self.alpha = 0.98
-        self.filtered_angle = 0.0
-        self.last_time = time.time()
+        self.gyro_bias = tuple(float(b) for b in gyro_bias)
+        self.metrics = metrics
+        self._filter_seconds = 0.0
+
+        # Gyro/accel fusion (see fusion_filters.create_filter)
+        self.fusion_filter = fusion_filter if fusion_filter is not None else ComplementaryFilter(alpha=0.98)
+        # monotonic_ns of the previous polled sample (dt for the filter)
+        self.last_time_ns = time.monotonic_ns()
+        self.last_sampling = None
+
+        # Hardware FIFO state (see enable_fifo)
+        self.fifo_enabled = False
+        self.fifo_sample_period = None
+        self.fifo_overflows = 0
+        self.fifo_dropped_samples = 0
+        self._fifo_last_drain = 0.0
+
+        if smbus is None and not SMBUS_AVAILABLE:
+            print("ERROR: smbus2 not installed. Install with: sudo pip3 install smbus2", file=sys.stderr)
+            raise RuntimeError("smbus2 not installed")
 
         try:
-            self.bus = smbus2.SMBus(self.bus_number)
+            self.bus = smbus if smbus is not None else smbus2.SMBus(self.bus_number)
             self.wake_up()
             time.sleep(0.1)
             print(f"MPU6050: Initialized on bus {bus}, address 0x{address:02X}", file=sys.stderr)
         except Exception as e:
             print(f"FATAL: MPU6050 initialization failed - {e}", file=sys.stderr)
             print("Check connections: SDA=GPIO2, SCL=GPIO3", file=sys.stderr)
-            sys.exit(1)
+            raise RuntimeError(f"MPU6050 initialization failed - {e}") from e
 
     def wake_up(self):
         """Wake up the MPU6050 from sleep mode."""
@@ -93,9 +448,50 @@ class MPU6050:
             else:
                 return value
         except Exception as e:
+            # Callers get 0; the failure is only visible in the log and
+            # the i2c_errors counter
+            if self.metrics is not None:
+                self.metrics.increment("i2c_errors")
             print(f"ERROR: Failed to read register 0x{register:02X} - {e}", file=sys.stderr)
             return 0
 
+    def read_raw_sample(self):
+        """
+        Read accelerometer, temperature and gyroscope in one I2C burst.
+
+        The data registers from ACCEL_XOUT_H are contiguous, so one 14-byte
+        block read replaces twelve single-byte transactions and returns
+        accel and gyro values latched at the same instant.
+
+        Returns:
+            Tuple of (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z),
+            accel in g's and gyro in degrees/second
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        try:
+            block = self.bus.read_i2c_block_data(self.address, self.ACCEL_XOUT_H, self.SAMPLE_LENGTH)
+        except Exception as e:
+            if metrics is not None:
+                metrics.increment("i2c_errors")
+            print(f"ERROR: Burst read from 0x{self.ACCEL_XOUT_H:02X} failed - {e}", file=sys.stderr)
+            raise
+        if metrics is not None:
+            metrics.observe("mpu_i2c_burst", time.perf_counter() - start)
+
+        accel_x, accel_y, accel_z, _temp, gyro_x, gyro_y, gyro_z = self.SAMPLE_FORMAT.unpack(bytes(block))
+        bias_x, bias_y, bias_z = self.gyro_bias
+
+        return (
+            accel_x / self.ACCEL_SCALE,
+            accel_y / self.ACCEL_SCALE,
+            accel_z / self.ACCEL_SCALE,
+            gyro_x / self.GYRO_SCALE - bias_x,
+            gyro_y / self.GYRO_SCALE - bias_y,
+            gyro_z / self.GYRO_SCALE - bias_z
+        )
+
     def read_accelerometer_raw(self):
         """
         Read raw accelerometer data.
@@ -103,11 +499,7 @@ class MPU6050:
         Returns:
             Tuple of (accel_x, accel_y, accel_z) in g's
         """
-        accel_x = self.read_word_2c(self.ACCEL_XOUT_H) / self.ACCEL_SCALE
-        accel_y = self.read_word_2c(self.ACCEL_YOUT_H) / self.ACCEL_SCALE
-        accel_z = self.read_word_2c(self.ACCEL_ZOUT_H) / self.ACCEL_SCALE
-
-        return (accel_x, accel_y, accel_z)
+        return self.read_raw_sample()[:3]
 
     def read_gyroscope_raw(self):
         """
@@ -116,11 +508,7 @@ class MPU6050:
         Returns:
             Tuple of (gyro_x, gyro_y, gyro_z) in degrees/second
         """
-        gyro_x = self.read_word_2c(self.GYRO_XOUT_H) / self.GYRO_SCALE
-        gyro_y = self.read_word_2c(self.GYRO_YOUT_H) / self.GYRO_SCALE
-        gyro_z = self.read_word_2c(self.GYRO_ZOUT_H) / self.GYRO_SCALE
-
-        return (gyro_x, gyro_y, gyro_z)
+        return self.read_raw_sample()[3:]
 
     def calculate_accel_angle(self):
         """
@@ -131,39 +519,288 @@ class MPU6050:
         """
         accel_x, accel_y, accel_z = self.read_accelerometer_raw()
 
-        # Calculate pitch: atan2(accel_y, sqrt(accel_x^2 + accel_z^2))
-        pitch_rad = math.atan2(accel_y, math.sqrt(accel_x**2 + accel_z**2))
-        pitch_deg = math.degrees(pitch_rad)
+        return float(accel_pitch_angles(accel_x, accel_y, accel_z))
+
+    @property
+    def filtered_angle(self):
+        """Current fusion filter pitch estimate in degrees."""
+        return self.fusion_filter.angle
 
-        return pitch_deg
+    @filtered_angle.setter
+    def filtered_angle(self, angle):
+        self.fusion_filter.angle = angle
 
-    def calculate_filtered_angle(self):
+    def update_filter(self, accel_x, accel_y, accel_z, gyro_x, dt):
+        """
+        Advance the fusion filter by one sample.
+
+        Args:
+            accel_x, accel_y, accel_z: Acceleration in g's
+            gyro_x: Pitch rate in degrees/second
+            dt: Time since the previous sample in seconds
+
+        Returns:
+            Filtered pitch angle in degrees
+        """
+        # Accelerometer angle (noisy but no drift)
+        accel_angle = float(accel_pitch_angles(accel_x, accel_y, accel_z))
+
+        # gyro_x is the rate of change of pitch (smooth but drifts)
+        return self.fusion_filter.update(accel_angle, gyro_x, dt)
+
+    def calculate_filtered_angle(self, sample_time_ns=None):
         """
         Calculate pitch angle using complementary filter (fuses gyro + accel).
         This provides stable, drift-free angle measurement.
 
+        Args:
+            sample_time_ns: time.monotonic_ns() the sample is taken at (e.g.
+                            from SampleClock.wait), or None for now
+
         Returns:
             Filtered pitch angle in degrees
         """
-        current_time = time.time()
-        dt = current_time - self.last_time
-        self.last_time = current_time
+        # Measured dt on the monotonic clock; wall-clock steps from NTP or
+        # the modem would otherwise become gyro integration errors
+        current_ns = time.monotonic_ns() if sample_time_ns is None else sample_time_ns
+        dt = (current_ns - self.last_time_ns) / 1e9
+        self.last_time_ns = current_ns
 
-        # Read sensors
-        accel_x, accel_y, accel_z = self.read_accelerometer_raw()
-        gyro_x, gyro_y, gyro_z = self.read_gyroscope_raw()
+        # Read sensors (single burst, accel and gyro from the same instant)
+        accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z = self.read_raw_sample()
 
-        # Accelerometer angle (noisy but no drift)
-        accel_angle = math.degrees(math.atan2(accel_y, math.sqrt(accel_x**2 + accel_z**2)))
+        if self.metrics is None:
+            return self.update_filter(accel_x, accel_y, accel_z, gyro_x, dt)
+
+        start = time.perf_counter()
+        angle = self.update_filter(accel_x, accel_y, accel_z, gyro_x, dt)
+        self._filter_seconds += time.perf_counter() - start
+        return angle
+
+    def enable_fifo(self, sample_rate_hz=200, dlpf_cfg=3):
+        """
+        Switch to hardware-timed sampling through the on-chip FIFO.
 
-        # Gyroscope angle (smooth but drifts)
-        # gyro_x is the rate of change of pitch
-        gyro_angle_delta = gyro_x * dt
+        The chip samples at 1 kHz / (1 + SMPLRT_DIV) and queues accel X/Y/Z
+        and gyro X frames, so the sample period is set by the MPU6050 clock
+        instead of Python sleeps.
 
-        # Complementary filter
-        self.filtered_angle = self.alpha * (self.filtered_angle + gyro_angle_delta) + (1 - self.alpha) * accel_angle
+        Args:
+            sample_rate_hz: Requested sample rate (4-1000 Hz)
+            dlpf_cfg: Digital low-pass filter setting (1-6)
 
-        return self.filtered_angle
+        Returns:
+            Actual sample rate in Hz after divider rounding
+        """
+        if not 1 <= dlpf_cfg <= 6:
+            raise ValueError(f"dlpf_cfg must be 1-6, got {dlpf_cfg}")
+        if not 4 <= sample_rate_hz <= self.GYRO_OUTPUT_RATE:
+            raise ValueError(f"sample_rate_hz must be 4-{self.GYRO_OUTPUT_RATE:.0f}, got {sample_rate_hz}")
+
+        divider = int(round(self.GYRO_OUTPUT_RATE / sample_rate_hz)) - 1
+        divider = max(0, min(255, divider))
+
+        self.bus.write_byte_data(self.address, self.CONFIG, dlpf_cfg)
+        self.bus.write_byte_data(self.address, self.SMPLRT_DIV, divider)
+        self.bus.write_byte_data(self.address, self.FIFO_EN, self.FIFO_EN_ACCEL | self.FIFO_EN_XG)
+
+        self.fifo_sample_period = (1 + divider) / self.GYRO_OUTPUT_RATE
+        self.fifo_enabled = True
+        self.reset_fifo()
+
+        rate = 1.0 / self.fifo_sample_period
+        print(f"MPU6050: FIFO enabled at {rate:.1f} Hz (SMPLRT_DIV={divider}, DLPF={dlpf_cfg})", file=sys.stderr)
+        return rate
+
+    def disable_fifo(self):
+        """Stop FIFO sampling and return to register polling."""
+        self.bus.write_byte_data(self.address, self.USER_CTRL, 0)
+        self.bus.write_byte_data(self.address, self.FIFO_EN, 0)
+        self.fifo_enabled = False
+
+    def reset_fifo(self):
+        """Discard FIFO contents and restart sampling from an empty buffer."""
+        self.bus.write_byte_data(self.address, self.USER_CTRL, 0)
+        self.bus.write_byte_data(self.address, self.USER_CTRL, self.USER_CTRL_FIFO_RESET)
+        self.bus.write_byte_data(self.address, self.USER_CTRL, self.USER_CTRL_FIFO_EN)
+        # Reading INT_STATUS clears a stale overflow flag
+        self.bus.read_byte_data(self.address, self.INT_STATUS)
+        self._fifo_last_drain = time.monotonic()
+
+    def read_fifo_count(self):
+        """
+        Read the number of bytes waiting in the FIFO.
+
+        Returns:
+            FIFO byte count
+        """
+        high, low = self.bus.read_i2c_block_data(self.address, self.FIFO_COUNTH, 2)
+        return (high << 8) | low
+
+    def read_fifo(self):
+        """
+        Drain every complete frame currently in the FIFO.
+
+        On overflow the oldest frames have already been overwritten, so the
+        FIFO is reset and the samples produced since the previous drain are
+        counted as dropped.
+
+        Returns:
+            List of (accel_x, accel_y, accel_z, gyro_x) tuples, oldest first,
+            or an empty list if the FIFO overflowed
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self._drain_fifo()
+
+        start = time.perf_counter()
+        try:
+            return self._drain_fifo()
+        except Exception:
+            metrics.increment("i2c_errors")
+            raise
+        finally:
+            metrics.observe("mpu_fifo_drain", time.perf_counter() - start)
+
+    def _drain_fifo(self):
+        now = time.monotonic()
+
+        if self.bus.read_byte_data(self.address, self.INT_STATUS) & self.INT_FIFO_OFLOW:
+            dropped = max(1, int((now - self._fifo_last_drain) / self.fifo_sample_period))
+            self.fifo_overflows += 1
+            self.fifo_dropped_samples += dropped
+            print(f"WARNING: MPU6050 FIFO overflow, ~{dropped} samples dropped", file=sys.stderr)
+            self.reset_fifo()
+            return []
+
+        frames = self.read_fifo_count() // self.FIFO_FRAME_LENGTH
+        self._fifo_last_drain = now
+
+        data = bytearray()
+        remaining = frames * self.FIFO_FRAME_LENGTH
+        while remaining > 0:
+            length = min(remaining, self.FIFO_READ_CHUNK)
+            data += bytes(self.bus.read_i2c_block_data(self.address, self.FIFO_R_W, length))
+            remaining -= length
+
+        bias_x = self.gyro_bias[0]
+        return [
+            (
+                accel_x / self.ACCEL_SCALE,
+                accel_y / self.ACCEL_SCALE,
+                accel_z / self.ACCEL_SCALE,
+                gyro_x / self.GYRO_SCALE - bias_x
+            )
+            for accel_x, accel_y, accel_z, gyro_x in self.FIFO_FRAME_FORMAT.iter_unpack(data)
+        ]
+
+    def read_fifo_samples(self, num_samples, timeout=None):
+        """
+        Collect a window of evenly spaced samples from the FIFO.
+
+        The FIFO is flushed first so the window starts now. If it overflows
+        part-way the window is restarted, so the returned samples are always
+        exactly fifo_sample_period apart.
+
+        Args:
+            num_samples: Number of consecutive samples to return
+            timeout: Give up after this many seconds (default: 4x window + 1 s)
+
+        Returns:
+            List of (accel_x, accel_y, accel_z, gyro_x) tuples
+        """
+        if not self.fifo_enabled:
+            raise RuntimeError("FIFO mode is not enabled")
+
+        if timeout is None:
+            timeout = 4 * num_samples * self.fifo_sample_period + 1.0
+        deadline = time.monotonic() + timeout
+
+        self.reset_fifo()
+        samples = []
+
+        while True:
+            # Sleep until the missing samples should have been produced,
+            # but drain at least every half FIFO so it cannot overflow
+            missing = min(num_samples - len(samples), self.FIFO_SIZE // self.FIFO_FRAME_LENGTH // 2)
+            time.sleep(missing * self.fifo_sample_period)
+
+            overflows = self.fifo_overflows
+            batch = self.read_fifo()
+            if self.fifo_overflows != overflows:
+                samples = []
+            samples.extend(batch)
+
+            if len(samples) >= num_samples:
+                return samples[:num_samples]
+
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"FIFO delivered {len(samples)}/{num_samples} samples in {timeout:.2f}s")
+
+    def _acquire_angles(self, num_samples, interval):
+        """
+        Run the filter over a window of samples.
+
+        Args:
+            num_samples: Number of samples
+            interval: Period of polled samples, paced by SampleClock
+                      (ignored in FIFO mode)
+
+        Returns:
+            List of filtered angles in degrees
+        """
+        metrics = self.metrics
+
+        if self.fifo_enabled:
+            dt = self.fifo_sample_period
+            samples = self.read_fifo_samples(num_samples)
+
+            if metrics is None:
+                return self._filter_window(samples, dt)
+            start = time.perf_counter()
+            angles = self._filter_window(samples, dt)
+            metrics.observe("mpu_filter", time.perf_counter() - start)
+            return angles
+
+        self._filter_seconds = 0.0
+        clock = SampleClock(interval)
+        # Restart the timebase for every window: the first sample integrates
+        # the gyro over one interval, not the whole gap since the last reading
+        self.last_time_ns = clock.start() - clock.period_ns
+        angles = [self.calculate_filtered_angle(clock.wait()) for _ in range(num_samples)]
+        self.last_sampling = clock.stats()
+        if metrics is not None:
+            metrics.observe("mpu_filter", self._filter_seconds)
+            for lateness in clock.lateness:
+                metrics.observe("mpu_sample_lateness", lateness / 1e9)
+            if clock.missed:
+                metrics.increment("sample_deadlines_missed", clock.missed)
+        return angles
+
+    def _filter_window(self, samples, dt):
+        """Filter an evenly spaced FIFO window (vectorized when possible)."""
+        fusion = self.fusion_filter
+        vectorizable = (
+            NUMPY_AVAILABLE
+            and type(fusion) is ComplementaryFilter
+            and (fusion.seeded or not fusion.seed_from_accel)
+        )
+
+        if not vectorizable:
+            return [
+                self.update_filter(accel_x, accel_y, accel_z, gyro_x, dt)
+                for accel_x, accel_y, accel_z, gyro_x in samples
+            ]
+
+        # Evenly spaced window: filter it in one vectorized pass
+        np = _require_numpy(samples)
+        raw = np.array(samples, dtype=np.float64)
+        accel_angles = accel_pitch_angles(raw[:, 0], raw[:, 1], raw[:, 2])
+        angles = complementary_filter(accel_angles, raw[:, 3], dt,
+                                      alpha=fusion.alpha, initial_angle=fusion.angle)
+        fusion.angle = float(angles[-1])
+        fusion.seeded = True
+        return angles.tolist()
 
     def calculate_water_level(self, angle_degrees, L_arm=1.5, H_pivot=2.0, R_float=0.15):
         """
@@ -182,21 +819,9 @@ class MPU6050:
         Returns:
             Water level in centimeters relative to datum
         """
-        # Convert to radians
-        angle_radians = math.radians(angle_degrees)
-
-        # Calculate vertical drop distance
-        H_sub = L_arm * math.sin(angle_radians)
-
-        # Calculate water level relative to datum
-        L_water_m = H_pivot - H_sub - R_float
-
-        # Convert to centimeters
-        L_water_cm = L_water_m * 100.0
-
-        return L_water_cm
+        return float(water_levels_cm(angle_degrees, L_arm=L_arm, H_pivot=H_pivot, R_float=R_float))
 
-    def read_sensor_data(self, L_arm=1.5, H_pivot=2.0, R_float=0.15, num_samples=10):
+    def read_sensor_data(self, L_arm=1.5, H_pivot=2.0, R_float=0.15, num_samples=10, sample_interval=0.02):
         """
         Read complete sensor data package with filtering.
 
@@ -205,17 +830,18 @@ class MPU6050:
             H_pivot: Pivot height in meters
             R_float: Float radius in meters
             num_samples: Number of samples for averaging
+            sample_interval: Period of polled samples in seconds, kept on
+                             absolute deadlines (FIFO mode uses the FIFO
+                             sample rate instead)
 
         Returns:
-            Dictionary containing pitch angle, water level, and status
+            Dictionary containing pitch angle, water level, and status;
+            polled readings add "sampling" (target and achieved rate,
+            jitter, missed deadlines)
         """
         try:
-            # Take multiple filtered readings
-            angles = []
-            for _ in range(num_samples):
-                angle = self.calculate_filtered_angle()
-                angles.append(angle)
-                time.sleep(0.02)  # 20ms between samples
+            # Take multiple filtered readings (sample_interval apart unless FIFO-timed)
+            angles = self._acquire_angles(num_samples, sample_interval)
 
             # Average the angles
             avg_angle = sum(angles) / len(angles)
@@ -238,13 +864,24 @@ class MPU6050:
                 status = "FAULT"
                 print(f"WARNING: Out of range - Angle: {calibrated_angle:.2f}°, Level: {water_level:.1f}cm", file=sys.stderr)
 
-            return {
+            data = {
                 "pitch_angle": round(calibrated_angle, 2),
                 "water_level_cm": round(water_level, 1),
                 "status": status,
                 "raw_angle": round(avg_angle, 2)
             }
 
+            if self.fifo_enabled:
+                data["fifo"] = {
+                    "sample_rate_hz": round(1.0 / self.fifo_sample_period, 2),
+                    "overflows": self.fifo_overflows,
+                    "dropped_samples": self.fifo_dropped_samples
+                }
+            elif self.last_sampling is not None:
+                data["sampling"] = self.last_sampling
+
+            return data
+
         except Exception as e:
             print(f"ERROR: MPU6050 read failed - {e}", file=sys.stderr)
             return {
@@ -254,47 +891,121 @@ class MPU6050:
                 "raw_angle": 0.0
             }
 
-    def calibrate(self, samples=100):
+    def calibrate_static(self, target_stderr=0.02, min_samples=100, max_seconds=15.0, window_size=25,
+                         sample_interval=0.005, max_gyro_std=0.5, max_gyro_rate=10.0,
+                         max_pitch_std=1.0, max_accel_error=0.1, settle=0.2):
         """
-        Calibrate the sensor by taking multiple readings at rest position.
+        Measure the pitch offset and gyro bias with the arm at rest.
+
+        Pitch comes from the accelerometer alone, so the result does not
+        depend on fusion filter state. Samples are taken in windows; a
+        window with motion (accel magnitude away from 1 g, gyro rate or
+        gyro/pitch scatter above the limits) is discarded, and accepted
+        windows are merged into streaming Welford statistics. Sampling
+        stops as soon as the standard error of the mean pitch is below
+        target_stderr, or at max_seconds.
+
         The arm should be HORIZONTAL (θ=0) during calibration.
 
         Args:
-            samples: Number of samples for calibration
+            target_stderr: Standard error of the mean pitch to stop at (degrees)
+            min_samples: Accepted samples needed before stopping early
+            max_seconds: Time limit for sampling
+            window_size: Samples per motion-check window
+            sample_interval: Seconds between samples
+            max_gyro_std: Largest gyro standard deviation in a still window (deg/s)
+            max_gyro_rate: Largest mean gyro rate in a still window (deg/s)
+            max_pitch_std: Largest accelerometer pitch scatter in a still window (deg)
+            max_accel_error: Largest | |a| - 1 g | in a still window (g)
+            settle: Seconds to wait before sampling
 
         Returns:
-            Calculated calibration offset
-        """
-        print(f"MPU6050: Starting calibration with {samples} samples...", file=sys.stderr)
-        print("MPU6050: Ensure arm is HORIZONTAL and water is STILL", file=sys.stderr)
-
-        # Wait for stabilization
-        time.sleep(2)
-
-        # Reset filtered angle
-        self.filtered_angle = 0.0
-        self.last_time = time.time()
-
-        angles = []
-        for i in range(samples):
-            angle = self.calculate_filtered_angle()
-            angles.append(angle)
+            Dictionary with offset_deg, pitch_deg, stderr_deg,
+            gyro_bias_dps (X/Y/Z, absolute), samples, rejected_windows,
+            elapsed_s and converged
 
-            if (i + 1) % 10 == 0:
-                print(f"MPU6050: Calibration progress: {i + 1}/{samples}", file=sys.stderr)
-
-            time.sleep(0.05)
-
-        average_angle = sum(angles) / len(angles)
+        Raises:
+            RuntimeError: If no window was still enough within max_seconds
+        """
+        print("MPU6050: Calibrating - keep the arm HORIZONTAL and the water STILL", file=sys.stderr)
+        time.sleep(settle)
+
+        pitch = RunningStats()
+        gyro = [RunningStats(), RunningStats(), RunningStats()]
+        rejected = 0
+        converged = False
+
+        start = time.monotonic()
+        while time.monotonic() - start < max_seconds:
+            window_pitch = RunningStats()
+            window_gyro = [RunningStats(), RunningStats(), RunningStats()]
+            worst_accel_error = 0.0
+
+            for _ in range(window_size):
+                accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z = self.read_raw_sample()
+                window_pitch.add(float(accel_pitch_angles(accel_x, accel_y, accel_z)))
+                for stats, value in zip(window_gyro, (gyro_x, gyro_y, gyro_z)):
+                    stats.add(value)
+                magnitude = math.sqrt(accel_x * accel_x + accel_y * accel_y + accel_z * accel_z)
+                worst_accel_error = max(worst_accel_error, abs(magnitude - 1.0))
+                time.sleep(sample_interval)
+
+            still = (
+                worst_accel_error <= max_accel_error
+                and all(stats.std <= max_gyro_std for stats in window_gyro)
+                and math.sqrt(sum(stats.mean ** 2 for stats in window_gyro)) <= max_gyro_rate
+                and window_pitch.std <= max_pitch_std
+            )
+            if not still:
+                rejected += 1
+                continue
+
+            pitch.merge(window_pitch)
+            for total, stats in zip(gyro, window_gyro):
+                total.merge(stats)
+
+            if pitch.n >= min_samples and pitch.stderr <= target_stderr:
+                converged = True
+                break
+
+        elapsed = time.monotonic() - start
+        if pitch.n == 0:
+            raise RuntimeError(f"Calibration failed - sensor was moving for {elapsed:.1f}s "
+                               f"({rejected} windows rejected)")
+
+        # Readings already had the current bias removed; the residual adds to it
+        gyro_bias = [bias + stats.mean for bias, stats in zip(self.gyro_bias, gyro)]
+
+        result = {
+            "offset_deg": -pitch.mean,
+            "pitch_deg": pitch.mean,
+            "stderr_deg": pitch.stderr,
+            "gyro_bias_dps": gyro_bias,
+            "samples": pitch.n,
+            "rejected_windows": rejected,
+            "elapsed_s": elapsed,
+            "converged": converged
+        }
+
+        state = "converged" if converged else "NOT converged"
+        print(f"MPU6050: Calibration {state} in {elapsed:.1f}s - pitch {pitch.mean:.3f}° "
+              f"± {pitch.stderr:.3f}° from {pitch.n} samples, {rejected} windows rejected", file=sys.stderr)
+        print(f"MPU6050: Calibration offset: {-pitch.mean:.3f}°, gyro bias: "
+              f"{gyro_bias[0]:.3f}/{gyro_bias[1]:.3f}/{gyro_bias[2]:.3f} °/s", file=sys.stderr)
+
+        return result
 
-        # Calibration offset should bring average to zero (horizontal)
-        calibration_offset = -average_angle
+    def calibrate(self, samples=100):
+        """
+        Calibrate the pitch offset at rest (see calibrate_static).
 
-        print(f"MPU6050: Calibration complete.", file=sys.stderr)
-        print(f"MPU6050: Average angle: {average_angle:.2f}°", file=sys.stderr)
-        print(f"MPU6050: Calibration offset: {calibration_offset:.2f}°", file=sys.stderr)
+        Args:
+            samples: Accepted samples needed before stopping early
 
-        return calibration_offset
+        Returns:
+            Calculated calibration offset
+        """
+        return self.calibrate_static(min_samples=samples)["offset_deg"]
 
     def close(self):
         """Close the I2C bus connection."""
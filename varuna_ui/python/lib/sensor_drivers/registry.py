@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/sensor_drivers/registry.py
+PHASE: PRODUCTION - Real Sensor Integration
+LOCATION: varuna_ui/python/lib/sensor_drivers/registry.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Lazy driver registry.
+
+Drivers are listed by name with the module and class that implement
+them. A driver module is imported, and the driver constructed, only when
+the "drivers" section of config.json enables it, so a one-shot reading
+pays for the drivers it uses and nothing else. Import and init times are
+recorded per driver for --profile-startup.
+
+Example config.json section (unlisted drivers are enabled with defaults):
+    "drivers": {
+        "mpu6050": {"enabled": true, "address": 104, "bus": 1},
+        "dht22": {"enabled": true, "pin": 4}
+    }
+"""
+
+import sys
+import time
+import importlib
+import threading
+
+# name -> (module in this package, class name, default constructor arguments)
+DRIVERS = {
+    "mpu6050": ("mpu6050_driver", "MPU6050", {"address": 0x68, "bus": 1}),
+    "dht22": ("dht22_driver", "DHT22", {"pin": 4}),
+    "sim800l": ("sim800l_driver", "SIM800L", {"port": "/dev/ttyUSB0", "baudrate": 9600}),
+}
+
+
+class DriverRegistry:
+    """Imports and constructs enabled drivers on first use."""
+
+    def __init__(self, config=None):
+        """
+        Create a registry for one configuration.
+
+        Args:
+            config: Parsed configuration dictionary (its "drivers" section
+                    is used), or None for every driver with defaults
+        """
+        self.settings = (config or {}).get("drivers", {})
+        self.timings = {}      # name -> {"status", "import_ms", "init_ms"}
+        self._classes = {}     # name -> driver class, or None if unavailable
+        self._lock = threading.Lock()
+
+    def _timing(self, name):
+        return self.timings.setdefault(name, {"status": "NOT_LOADED", "import_ms": 0.0, "init_ms": 0.0})
+
+    def is_enabled(self, name):
+        """True unless config.json sets "enabled": false for the driver."""
+        if name not in DRIVERS:
+            raise ValueError(f"Unknown driver '{name}' (known: {', '.join(DRIVERS)})")
+        return bool(self.settings.get(name, {}).get("enabled", True))
+
+    def options(self, name):
+        """Constructor arguments: defaults overridden by config.json."""
+        options = dict(DRIVERS[name][2])
+        options.update({k: v for k, v in self.settings.get(name, {}).items() if k != "enabled"})
+        return options
+
+    def status(self, name):
+        """OK, DISABLED, NOT_INSTALLED, FAULT or NOT_LOADED."""
+        return self._timing(name)["status"]
+
+    def load(self, name):
+        """
+        Import a driver module once.
+
+        Args:
+            name: Driver name from DRIVERS
+
+        Returns:
+            Driver class, or None if the driver is disabled or cannot be imported
+        """
+        enabled = self.is_enabled(name)
+
+        # Workers may load the same driver concurrently; import it once
+        with self._lock:
+            if name in self._classes:
+                return self._classes[name]
+
+            timing = self._timing(name)
+            driver_class = None
+
+            if not enabled:
+                timing["status"] = "DISABLED"
+            else:
+                module_name, class_name, _ = DRIVERS[name]
+                start = time.perf_counter()
+                try:
+                    module = importlib.import_module(f"{__package__}.{module_name}")
+                    driver_class = getattr(module, class_name)
+                except (ImportError, AttributeError) as e:
+                    timing["status"] = "NOT_INSTALLED"
+                    print(f"WARNING: {name} driver not available - {e}", file=sys.stderr)
+                timing["import_ms"] = (time.perf_counter() - start) * 1000.0
+
+            self._classes[name] = driver_class
+            return driver_class
+
+    def create(self, name, **overrides):
+        """
+        Construct an enabled driver.
+
+        Args:
+            name: Driver name from DRIVERS
+            **overrides: Constructor arguments that take precedence over
+                         config.json (e.g. an injected smbus)
+
+        Returns:
+            Driver instance, or None if the driver is disabled or not installed
+
+        Raises:
+            Whatever the driver constructor raises (the status becomes FAULT)
+        """
+        driver_class = self.load(name)
+        if driver_class is None:
+            return None
+
+        options = self.options(name)
+        options.update(overrides)
+
+        timing = self._timing(name)
+        start = time.perf_counter()
+        try:
+            driver = driver_class(**options)
+        except Exception:
+            timing["status"] = "FAULT"
+            raise
+        finally:
+            timing["init_ms"] += (time.perf_counter() - start) * 1000.0
+
+        timing["status"] = "OK"
+        return driver
+
+    def profile(self):
+        """Per-driver status, import and init times (ms) for reporting."""
+        return {
+            name: {
+                "status": timing["status"],
+                "import_ms": round(timing["import_ms"], 1),
+                "init_ms": round(timing["init_ms"], 1)
+            }
+            for name, timing in self.timings.items()
+        }
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/sensor_drivers/registry.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -8,21 +8,341 @@ LOCATION: varuna_ui/python/lib/sensor_drivers/sim800l_driver.py
 ═══════════════════════════════════════════════════════════════
 """
 
+import csv
+import sys
 import time
-import serial
+import random
+import threading
+
+from . import sms_pdu
 
 try:
     import serial
     SERIAL_AVAILABLE = True
 except ImportError:
     SERIAL_AVAILABLE = False
-    print("Warning: pyserial not available - SIM800L will use simulated mode")
+    print("Warning: pyserial not available - SIM800L will use simulated mode", file=sys.stderr)
+
+
+class ATResponse:
+    """Result of one AT command: information lines plus the final result code."""
+
+    def __init__(self, command, lines, final):
+        self.command = command
+        self.lines = lines
+        self.final = final  # "OK", an error result code, or None on timeout
+
+    @property
+    def ok(self):
+        return self.final == "OK"
+
+    @property
+    def text(self):
+        return "\n".join(self.lines + ([self.final] if self.final else []))
+
+
+class _PendingCommand:
+    """Book-keeping for the command currently waiting on the modem."""
+
+    def __init__(self, command, prefix, expect_prompt=False, prompt=">"):
+        self.command = command
+        self.prefix = prefix
+        self.expect_prompt = expect_prompt
+        self.prompt = prompt
+        self.prompted = False
+        self.lines = []
+        self.final = None
+        self.done = False
+
+
+class ATChannel:
+    """
+    Event-driven AT command channel.
+
+    A background thread reads the serial port and splits it into lines.
+    Lines are matched to the single command in flight (echo, information
+    lines, final result code) or, if they are unsolicited result codes
+    such as +CMTI, dispatched to registered callbacks. The "> " prompt of
+    AT+CMGS and the DOWNLOAD prompt of AT+HTTPDATA are detected directly,
+    so nothing waits on fixed sleeps.
+    """
+
+    FINAL_ERRORS = ("ERROR", "+CME ERROR", "+CMS ERROR", "NO CARRIER", "BUSY", "NO ANSWER", "NO DIALTONE")
+    URC_PREFIXES = (
+        "+CMTI:", "+CMT:", "+CDS:", "+CBM:", "+CLIP:", "RING", "+CREG:", "+CUSD:",
+        "+CPIN:", "+CFUN:", "Call Ready", "SMS Ready", "+HTTPACTION:",
+        "UNDER-VOLTAGE", "OVER-VOLTAGE", "NORMAL POWER DOWN"
+    )
+    # URCs whose payload follows on the next line
+    TWO_LINE_URCS = ("+CMT:", "+CDS:", "+CBM:")
+    # Information lines followed by message text; the next line is always
+    # the text, even when an SMS reads "OK", "ERROR" or "RING"
+    MESSAGE_HEADERS = ("+CMGL:", "+CMGR:")
+    CTRL_Z = b"\x1a"
+    ESC = b"\x1b"
+
+    def __init__(self, port, metrics=None):
+        """
+        Start the reader thread.
+
+        Args:
+            port: Open pyserial-compatible port (read timeout should be short)
+            metrics: metrics.Metrics that times every command round-trip and
+                     counts timeouts, or None
+        """
+        self.port = port
+        self.metrics = metrics
+        self._command_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending = None
+        self._urc_handlers = []
+        self._urc_header = None
+        self._buffer = bytearray()
+        self._running = True
+
+        self._thread = threading.Thread(target=self._reader_loop, name="sim800l-reader", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _response_prefix(command):
+        """Information-line prefix of an extended command (AT+CSQ -> +CSQ:)."""
+        if not command.upper().startswith("AT+"):
+            return None
+        name = command[2:]
+        for separator in "=?":
+            name = name.split(separator, 1)[0]
+        return name + ":"
+
+    def on_urc(self, prefix, callback):
+        """
+        Register a callback for unsolicited result codes.
+
+        Callbacks run on the reader thread and must not issue AT commands
+        themselves; hand work off to another thread instead.
+
+        Args:
+            prefix: URC prefix to match, e.g. "+CMTI:" ("" matches all)
+            callback: Called as callback(line, body); body is the second
+                      line of two-line URCs such as +CMT, otherwise None
+        """
+        self._urc_handlers.append((prefix, callback))
+
+    def _dispatch(self, line, body=None):
+        for prefix, callback in self._urc_handlers:
+            if line.startswith(prefix):
+                try:
+                    callback(line, body)
+                except Exception as e:
+                    print(f"SIM800L: URC handler error for '{line}' - {e}", file=sys.stderr)
+
+    def _reader_loop(self):
+        while self._running:
+            try:
+                data = self.port.read(self.port.in_waiting or 1)
+            except Exception as e:
+                if self._running:
+                    print(f"SIM800L: Reader stopped - {e}", file=sys.stderr)
+                break
+
+            if data:
+                self._buffer += data
+                self._process_buffer()
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _process_buffer(self):
+        while True:
+            pending = self._pending
+
+            # The "> " prompt is not newline-terminated
+            if pending and pending.expect_prompt and not pending.prompted and pending.prompt == ">":
+                stripped = self._buffer.lstrip(b"\r\n")
+                if stripped.startswith(b">"):
+                    self._buffer = bytearray(stripped[1:].lstrip(b" "))
+                    with self._cond:
+                        pending.prompted = True
+                        self._cond.notify_all()
+                    continue
+
+            end = self._buffer.find(b"\n")
+            if end < 0:
+                return
+
+            line = self._buffer[:end].decode('utf-8', errors='ignore').strip()
+            del self._buffer[:end + 1]
+            if line or self._expects_text():
+                self._handle_line(line)
+
+    def _expects_text(self):
+        """True if the next line is the text of a listed or read SMS."""
+        pending = self._pending
+        return bool(pending and not pending.done and pending.lines
+                    and pending.lines[-1].startswith(self.MESSAGE_HEADERS))
+
+    def _handle_line(self, line):
+        with self._cond:
+            if self._expects_text():
+                self._pending.lines.append(line)
+                return
+
+        if self._urc_header is not None:
+            header, self._urc_header = self._urc_header, None
+            self._dispatch(header, line)
+            return
+
+        is_urc = line.startswith(self.URC_PREFIXES)
+
+        with self._cond:
+            pending = self._pending
+            if pending and not pending.done:
+                if line == pending.command:
+                    return  # command echo (ATE1)
+
+                if pending.expect_prompt and not pending.prompted and line == pending.prompt:
+                    pending.prompted = True
+                    self._cond.notify_all()
+                    return
+
+                if line == "OK" or line.startswith(self.FINAL_ERRORS):
+                    pending.final = line
+                    pending.done = True
+                    self._cond.notify_all()
+                    return
+
+                if not is_urc or (pending.prefix and line.startswith(pending.prefix)):
+                    pending.lines.append(line)
+                    return
+
+        if line.startswith(self.TWO_LINE_URCS):
+            self._urc_header = line
+        else:
+            self._dispatch(line)
+
+    def _record(self, pending, start):
+        """Observe a finished command's round-trip in the metrics."""
+        if self.metrics is not None:
+            self.metrics.observe("at_command", time.perf_counter() - start)
+            if pending.final is None:
+                self.metrics.increment("at_timeouts")
+
+    def _wait(self, predicate, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: predicate() or not self._running, timeout)
+
+    def command(self, command, timeout=5):
+        """
+        Send one AT command and wait for its final result code.
+
+        Args:
+            command: AT command string
+            timeout: Seconds to wait for OK/ERROR
+
+        Returns:
+            ATResponse (final is None on timeout)
+        """
+        with self._command_lock:
+            pending = _PendingCommand(command, self._response_prefix(command))
+            with self._cond:
+                self._pending = pending
+            start = time.perf_counter()
+            try:
+                self.port.write((command + '\r\n').encode())
+                self._wait(lambda: pending.done, timeout)
+            finally:
+                with self._cond:
+                    self._pending = None
+                self._record(pending, start)
+
+            return ATResponse(command, pending.lines, pending.final)
+
+    def send_prompted(self, command, payload, timeout=60, prompt_timeout=5):
+        """
+        Send a command that answers with "> " and takes a Ctrl+Z-terminated payload.
+
+        Args:
+            command: AT command, e.g. AT+CMGS="+91..."
+            payload: Text to send after the prompt
+            timeout: Seconds to wait for the final result after the payload
+            prompt_timeout: Seconds to wait for the prompt
+
+        Returns:
+            ATResponse (final is None on timeout)
+        """
+        with self._command_lock:
+            pending = _PendingCommand(command, self._response_prefix(command), expect_prompt=True)
+            with self._cond:
+                self._pending = pending
+            start = time.perf_counter()
+            try:
+                self.port.write((command + '\r').encode())
+                self._wait(lambda: pending.prompted or pending.done, prompt_timeout)
+
+                if pending.prompted:
+                    self.port.write(payload.encode() + self.CTRL_Z)
+                    self._wait(lambda: pending.done, timeout)
+                elif not pending.done:
+                    # No prompt: cancel so the modem does not swallow the next command
+                    self.port.write(self.ESC)
+            finally:
+                with self._cond:
+                    self._pending = None
+                self._record(pending, start)
+
+            return ATResponse(command, pending.lines, pending.final)
+
+    def send_data(self, command, data, timeout=10, prompt_timeout=5):
+        """
+        Send a command that answers DOWNLOAD and then takes exactly len(data) bytes.
+
+        Args:
+            command: AT command, e.g. AT+HTTPDATA=<length>,<ms>
+            data: Bytes to send after the prompt (binary safe, no terminator)
+            timeout: Seconds to wait for the final result after the data
+            prompt_timeout: Seconds to wait for DOWNLOAD
+
+        Returns:
+            ATResponse (final is None on timeout)
+        """
+        with self._command_lock:
+            pending = _PendingCommand(command, self._response_prefix(command), expect_prompt=True, prompt="DOWNLOAD")
+            with self._cond:
+                self._pending = pending
+            start = time.perf_counter()
+            try:
+                self.port.write((command + '\r\n').encode())
+                self._wait(lambda: pending.prompted or pending.done, prompt_timeout)
+
+                if pending.prompted:
+                    self.port.write(data)
+                    self._wait(lambda: pending.done, timeout)
+            finally:
+                with self._cond:
+                    self._pending = None
+                self._record(pending, start)
+
+            return ATResponse(command, pending.lines, pending.final)
+
+    def close(self):
+        """Stop the reader thread."""
+        self._running = False
+        self._thread.join(timeout=1.0)
 
 
 class SIM800L:
     """Driver for SIM800L/SIM7600G GSM module."""
 
-    def __init__(self, port='/dev/ttyUSB0', baudrate=9600, timeout=5):
+    # AT+CMGD=<index>,<delflag> bulk delete flags
+    DELETE_READ = 1
+    DELETE_READ_SENT = 2
+    DELETE_READ_SENT_UNSENT = 3
+    DELETE_ALL = 4
+
+    # Deletes chained per command line (SIM800 line buffer is 556 chars)
+    DELETE_BATCH = 20
+
+    def __init__(self, port='/dev/ttyUSB0', baudrate=9600, timeout=5, event_driven=False, metrics=None):
         """
         Initialize SIM800L module.
 
@@ -30,26 +350,47 @@ class SIM800L:
             port: Serial port (default /dev/ttyUSB0)
             baudrate: Baud rate (default 9600)
             timeout: Command timeout in seconds
+            event_driven: Use a background reader (ATChannel) instead of
+                          sleep-polling; enables URC callbacks via on_urc()
+            metrics: metrics.Metrics that times AT round-trips and counts
+                     timeouts, or None
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
         self.serial_port = None
+        self.channel = None
+        self.metrics = metrics
         self.is_available = SERIAL_AVAILABLE
+        # Random start so consecutive processes do not reuse a reference
+        self._concat_reference = random.randrange(256)
+        self._http_action = None
+        self._http_event = threading.Event()
 
         if self.is_available:
             try:
                 self.serial_port = serial.Serial(
                     port=self.port,
                     baudrate=self.baudrate,
-                    timeout=self.timeout
+                    timeout=0.1 if event_driven else self.timeout
                 )
+                if event_driven:
+                    self.channel = ATChannel(self.serial_port, metrics)
                 time.sleep(1)
                 self.initialize()
-                print(f"SIM800L: Initialized on {port} @ {baudrate} baud")
+                print(f"SIM800L: Initialized on {port} @ {baudrate} baud", file=sys.stderr)
             except Exception as e:
-                print(f"SIM800L: Failed to initialize - {e}")
+                print(f"SIM800L: Failed to initialize - {e}", file=sys.stderr)
                 self.is_available = False
+                # Release the reader thread and the port so a later open succeeds
+                if self.channel:
+                    self.channel.close()
+                    self.channel = None
+                if self.serial_port:
+                    try:
+                        self.serial_port.close()
+                    except Exception:
+                        pass
                 self.serial_port = None
 
     def send_at_command(self, command, wait_response=True, timeout=5):
@@ -65,9 +406,15 @@ class SIM800L:
             Response string or None
         """
         if not self.serial_port:
-            print(f"SIM800L (simulated): {command}")
+            print(f"SIM800L (simulated): {command}", file=sys.stderr)
             return "OK" if wait_response else None
 
+        if self.channel:
+            if not wait_response:
+                self.serial_port.write((command + '\r\n').encode())
+                return None
+            return self.channel.command(command, timeout=timeout).text
+
         try:
             # Clear input buffer
             self.serial_port.reset_input_buffer()
@@ -81,21 +428,34 @@ class SIM800L:
 
             # Wait for response
             start_time = time.time()
+            start = time.perf_counter()
             response = ""
 
             while (time.time() - start_time) < timeout:
                 if self.serial_port.in_waiting > 0:
                     response += self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
 
-                    if 'OK' in response or 'ERROR' in response:
+                    # Stop at a final result code on its own line, so message
+                    # text such as "ALL OK" does not end the response early;
+                    # the line after a +CMGL:/+CMGR: header is SMS text even
+                    # when it reads "OK"
+                    lines = response.rstrip().rsplit('\n', 2)
+                    last_line = lines[-1].strip()
+                    is_text = len(lines) > 1 and lines[-2].strip().startswith(ATChannel.MESSAGE_HEADERS)
+                    if not is_text and (last_line == 'OK' or 'ERROR' in last_line):
                         break
 
                 time.sleep(0.1)
+            else:
+                if self.metrics is not None:
+                    self.metrics.increment("at_timeouts")
 
+            if self.metrics is not None:
+                self.metrics.observe("at_command", time.perf_counter() - start)
             return response.strip()
 
         except Exception as e:
-            print(f"SIM800L: Error sending command '{command}' - {e}")
+            print(f"SIM800L: Error sending command '{command}' - {e}", file=sys.stderr)
             return None
 
     def initialize(self):
@@ -114,7 +474,7 @@ class SIM800L:
         # Check SIM card status
         response = self.send_at_command('AT+CPIN?')
         if not response or 'READY' not in response:
-            print("SIM800L: Warning - SIM card not ready")
+            print("SIM800L: Warning - SIM card not ready", file=sys.stderr)
 
         # Check network registration
         self.check_network()
@@ -124,10 +484,10 @@ class SIM800L:
         response = self.send_at_command('AT+CREG?')
 
         if response and ('0,1' in response or '0,5' in response):
-            print("SIM800L: Registered on network")
+            print("SIM800L: Registered on network", file=sys.stderr)
             return True
         else:
-            print("SIM800L: Not registered on network")
+            print("SIM800L: Not registered on network", file=sys.stderr)
             return False
 
     def get_signal_strength(self):
@@ -156,65 +516,142 @@ class SIM800L:
 
         return None
 
+    def _submit(self, command, payload, timeout=30):
+        """
+        Send AT+CMGS and its payload once the modem shows the "> " prompt.
+
+        Args:
+            command: AT+CMGS command (text or PDU mode)
+            payload: Message text or PDU hex
+            timeout: Seconds to wait for +CMGS after the payload
+
+        Returns:
+            Tuple of (success, response text)
+        """
+        if self.channel:
+            response = self.channel.send_prompted(command, payload, timeout=timeout)
+            success = response.ok and any(line.startswith('+CMGS:') for line in response.lines)
+            return success, response.text or 'timeout'
+
+        self.serial_port.write((command + '\r\n').encode())
+        time.sleep(0.5)
+
+        # Send payload, then Ctrl+Z to finish
+        self.serial_port.write(payload.encode())
+        time.sleep(0.5)
+        self.serial_port.write(bytes([26]))
+
+        # Wait for response
+        start_time = time.time()
+        response = ""
+
+        while (time.time() - start_time) < timeout:
+            if self.serial_port.in_waiting > 0:
+                response += self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
+
+                if '+CMGS:' in response:
+                    return True, response.strip()
+
+                if 'ERROR' in response:
+                    return False, response.strip()
+
+            time.sleep(0.1)
+
+        if self.metrics is not None:
+            self.metrics.increment("at_timeouts")
+        return False, 'timeout'
+
+    def _next_reference(self):
+        """Concatenation reference for the next multi-part message."""
+        self._concat_reference = (self._concat_reference + 1) % 256
+        return self._concat_reference
+
     def send_sms(self, phone_number, message):
         """
         Send SMS message.
 
+        Messages that do not fit one GSM 7-bit SMS (over 160 characters, or
+        characters outside the GSM alphabet) are sent with send_long_sms().
+
         Args:
             phone_number: Recipient phone number (with country code)
-            message: Message text (max 160 characters)
+            message: Message text
 
         Returns:
             True if sent successfully, False otherwise
         """
         if not self.is_available:
-            print(f"SIM800L (simulated): Sending SMS to {phone_number}: {message}")
+            print(f"SIM800L (simulated): Sending SMS to {phone_number}: {message}", file=sys.stderr)
             return True
 
+        if not sms_pdu.fits_single_text_sms(message):
+            return self.send_long_sms(phone_number, message)
+
         try:
             # Set SMS text mode
             response = self.send_at_command('AT+CMGF=1')
             if not response or 'OK' not in response:
-                print("SIM800L: Failed to set text mode")
+                print("SIM800L: Failed to set text mode", file=sys.stderr)
                 return False
 
-            # Set recipient
-            cmd = f'AT+CMGS="{phone_number}"'
-            self.serial_port.write((cmd + '\r\n').encode())
-            time.sleep(0.5)
+            success, detail = self._submit(f'AT+CMGS="{phone_number}"', message)
+            if success:
+                print(f"SIM800L: SMS sent to {phone_number}", file=sys.stderr)
+            else:
+                print(f"SIM800L: Failed to send SMS - {detail}", file=sys.stderr)
+            return success
 
-            # Send message
-            self.serial_port.write(message.encode())
-            time.sleep(0.5)
+        except Exception as e:
+            print(f"SIM800L: Error sending SMS - {e}", file=sys.stderr)
+            return False
 
-            # Send Ctrl+Z to finish
-            self.serial_port.write(bytes([26]))
+    def send_long_sms(self, phone_number, message):
+        """
+        Send a message as concatenated SMS in PDU mode.
 
-            # Wait for response
-            start_time = time.time()
-            response = ""
+        Every part carries a User Data Header with a shared reference, so the
+        recipient's phone shows one message instead of truncated text.
 
-            while (time.time() - start_time) < 30:
-                if self.serial_port.in_waiting > 0:
-                    response += self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
+        Args:
+            phone_number: Recipient phone number (with country code)
+            message: Message text of any length (UCS-2 if not GSM 7-bit)
 
-                    if '+CMGS:' in response:
-                        print(f"SIM800L: SMS sent to {phone_number}")
-                        return True
+        Returns:
+            True if every part was sent, False otherwise
+        """
+        if not self.is_available:
+            print(f"SIM800L (simulated): Sending SMS to {phone_number}: {message}", file=sys.stderr)
+            return True
 
-                    if 'ERROR' in response:
-                        print(f"SIM800L: Failed to send SMS - {response}")
-                        return False
+        try:
+            pdus = sms_pdu.encode_submit(phone_number, message, self._next_reference())
+        except ValueError as e:
+            print(f"SIM800L: Cannot encode SMS - {e}", file=sys.stderr)
+            return False
 
-                time.sleep(0.1)
+        try:
+            response = self.send_at_command('AT+CMGF=0')
+            if not response or 'OK' not in response:
+                print("SIM800L: Failed to set PDU mode", file=sys.stderr)
+                return False
 
-            print("SIM800L: SMS send timeout")
-            return False
+            for part, (pdu, length) in enumerate(pdus, start=1):
+                success, detail = self._submit(f'AT+CMGS={length}', pdu, timeout=60)
+                if not success:
+                    print(f"SIM800L: Failed to send part {part}/{len(pdus)} to {phone_number} - {detail}", file=sys.stderr)
+                    return False
+
+            print(f"SIM800L: SMS sent to {phone_number} ({len(pdus)} parts)", file=sys.stderr)
+            return True
 
         except Exception as e:
-            print(f"SIM800L: Error sending SMS - {e}")
+            print(f"SIM800L: Error sending SMS - {e}", file=sys.stderr)
             return False
 
+        finally:
+            # The rest of the driver expects text mode
+            self.send_at_command('AT+CMGF=1')
+
     def read_sms(self, index=1):
         """
         Read SMS at given index.
@@ -255,23 +692,267 @@ class SIM800L:
                 }
 
         except Exception as e:
-            print(f"SIM800L: Error reading SMS - {e}")
+            print(f"SIM800L: Error reading SMS - {e}", file=sys.stderr)
 
         return None
 
+    def on_urc(self, prefix, callback):
+        """
+        Register a callback for unsolicited result codes (event-driven mode).
+
+        Args:
+            prefix: URC prefix, e.g. "+CMTI:"
+            callback: Called as callback(line, body) on the reader thread
+        """
+        if not self.channel:
+            print("SIM800L: URC callbacks need event_driven=True", file=sys.stderr)
+            return
+        self.channel.on_urc(prefix, callback)
+
+    def on_sms_received(self, callback):
+        """
+        Call callback(index) as soon as a new SMS is stored (+CMTI URC).
+
+        Args:
+            callback: Receives the storage index of the new message
+        """
+        def handle_cmti(line, body):
+            # +CMTI: "SM",3
+            try:
+                callback(int(line.rsplit(',', 1)[1]))
+            except (IndexError, ValueError):
+                print(f"SIM800L: Malformed +CMTI - {line}", file=sys.stderr)
+
+        self.on_urc('+CMTI:', handle_cmti)
+
+    @staticmethod
+    def parse_message_list(response):
+        """
+        Parse an AT+CMGL text-mode response.
+
+        Args:
+            response: Raw response text
+
+        Returns:
+            List of dictionaries with index, status, sender, timestamp, message
+        """
+        messages = []
+        current = None
+        body = []
+        expect_text = False
+
+        for line in response.splitlines():
+            stripped = line.strip()
+
+            if expect_text:
+                # The line after the header is the text, even if it reads "OK"
+                expect_text = False
+                body.append(stripped)
+                current['message'] = stripped
+            elif stripped.startswith('+CMGL:'):
+                # +CMGL: 1,"REC UNREAD","+919876543210","","23/10/05,12:34:56+22"
+                fields = next(csv.reader([stripped[len('+CMGL:'):].strip()]))
+                current = None
+                if len(fields) < 3:
+                    continue
+                body = []
+                current = {
+                    'index': int(fields[0]),
+                    'status': fields[1],
+                    'sender': fields[2],
+                    'timestamp': fields[4] if len(fields) > 4 else '',
+                    'message': ''
+                }
+                messages.append(current)
+                expect_text = True
+            elif stripped == 'OK' or stripped.startswith('+CMS ERROR'):
+                current = None
+            elif current is not None:
+                # Message text may span several lines
+                body.append(stripped)
+                current['message'] = '\n'.join(body).strip()
+
+        return messages
+
+    def list_sms(self, status='REC UNREAD', timeout=20):
+        """
+        Read every message with the given status in one AT+CMGL call.
+
+        Args:
+            status: "REC UNREAD", "REC READ", "STO UNSENT", "STO SENT" or "ALL"
+            timeout: Response timeout in seconds
+
+        Returns:
+            List of message dictionaries (see parse_message_list), or None on error
+        """
+        if not self.is_available:
+            return []
+
+        response = self.send_at_command(f'AT+CMGL="{status}"', timeout=timeout)
+        if not response or 'OK' not in response.splitlines()[-1]:
+            print(f"SIM800L: Failed to list messages - {response}", file=sys.stderr)
+            return None
+
+        return self.parse_message_list(response)
+
+    def delete_messages(self, indices=None, flag=None):
+        """
+        Delete many messages with as few commands as possible.
+
+        Either pass a delete flag (e.g. DELETE_READ removes every read
+        message in one command) or a list of indices, which are chained
+        DELETE_BATCH per command line (AT+CMGD=1;+CMGD=2;...).
+
+        Args:
+            indices: Storage indices to delete
+            flag: AT+CMGD delete flag (DELETE_READ ... DELETE_ALL)
+
+        Returns:
+            True if every command returned OK
+        """
+        if flag is not None:
+            response = self.send_at_command(f'AT+CMGD=1,{flag}', timeout=25)
+            return bool(response) and 'OK' in response
+
+        indices = list(indices or [])
+        success = True
+        for start in range(0, len(indices), self.DELETE_BATCH):
+            batch = indices[start:start + self.DELETE_BATCH]
+            cmd = 'AT' + ';'.join(f'+CMGD={index}' for index in batch)
+            response = self.send_at_command(cmd, timeout=5 + len(batch))
+            if not response or 'OK' not in response:
+                print(f"SIM800L: Failed to delete messages {batch} - {response}", file=sys.stderr)
+                success = False
+
+        return success
+
     def delete_sms(self, index=1):
         """Delete SMS at given index."""
         cmd = f'AT+CMGD={index}'
         self.send_at_command(cmd)
 
+    def _gprs_command(self, command, timeout=10):
+        """Run a GPRS/HTTP command on the event-driven channel, raising on failure."""
+        if not self.channel:
+            raise RuntimeError("GPRS needs an open modem with event_driven=True")
+        response = self.channel.command(command, timeout=timeout)
+        if not response.ok:
+            raise RuntimeError(f"{command} failed - {response.text or 'timeout'}")
+        return response
+
+    def bearer_open(self):
+        """True if GPRS bearer profile 1 is connected (AT+SAPBR=2,1)."""
+        response = self._gprs_command('AT+SAPBR=2,1')
+        for line in response.lines:
+            if line.startswith('+SAPBR:'):
+                fields = line.split(':', 1)[1].split(',')
+                return len(fields) > 1 and fields[1].strip() == '1'
+        return False
+
+    def open_bearer(self, apn, user=None, password=None, timeout=85):
+        """
+        Connect GPRS bearer profile 1 (AT+SAPBR), reusing an open one.
+
+        Args:
+            apn: Access point name of the SIM's operator
+            user: APN user name, if the operator needs one
+            password: APN password, if the operator needs one
+            timeout: Seconds to wait for the PDP context (up to 85 s per the manual)
+
+        Raises:
+            RuntimeError: If the bearer cannot be opened
+        """
+        if self.bearer_open():
+            return
+
+        self._gprs_command('AT+SAPBR=3,1,"Contype","GPRS"')
+        self._gprs_command(f'AT+SAPBR=3,1,"APN","{apn}"')
+        if user:
+            self._gprs_command(f'AT+SAPBR=3,1,"USER","{user}"')
+        if password:
+            self._gprs_command(f'AT+SAPBR=3,1,"PWD","{password}"')
+        self._gprs_command('AT+SAPBR=1,1', timeout=timeout)
+        print(f"SIM800L: GPRS bearer open (APN {apn})", file=sys.stderr)
+
+    def close_bearer(self, timeout=65):
+        """Disconnect GPRS bearer profile 1; failures are only logged."""
+        try:
+            self._gprs_command('AT+SAPBR=0,1', timeout=timeout)
+        except RuntimeError as e:
+            print(f"SIM800L: {e}", file=sys.stderr)
+
+    def _on_http_action(self, line, body):
+        self._http_action = line
+        self._http_event.set()
+
+    def http_post(self, url, data, content_type="application/octet-stream", timeout=60):
+        """
+        POST bytes over the open GPRS bearer (AT+HTTPINIT ... AT+HTTPTERM).
+
+        Args:
+            url: http:// URL (the SIM800L HTTP stack has no TLS without AT+HTTPSSL)
+            data: Request body bytes
+            content_type: Content-Type header
+            timeout: Seconds to wait for the server's response
+
+        Returns:
+            Tuple of (HTTP status code, response body text)
+
+        Raises:
+            RuntimeError: If an AT command fails or the response times out
+        """
+        if not self.channel:
+            raise RuntimeError("GPRS needs an open modem with event_driven=True")
+        if self._http_action is None:
+            self._http_action = ""
+            self.channel.on_urc("+HTTPACTION:", self._on_http_action)
+
+        if not self.channel.command('AT+HTTPINIT').ok:
+            # A session left open by an interrupted POST
+            self.channel.command('AT+HTTPTERM')
+            self._gprs_command('AT+HTTPINIT')
+
+        try:
+            self._gprs_command('AT+HTTPPARA="CID",1')
+            self._gprs_command(f'AT+HTTPPARA="URL","{url}"')
+            self._gprs_command(f'AT+HTTPPARA="CONTENT","{content_type}"')
+
+            upload_ms = 10000 + len(data) // 10
+            response = self.channel.send_data(f'AT+HTTPDATA={len(data)},{upload_ms}', data,
+                                              timeout=upload_ms / 1000.0 + 5)
+            if not response.ok:
+                raise RuntimeError(f"AT+HTTPDATA failed - {response.text or 'timeout'}")
+
+            self._http_event.clear()
+            response = self._gprs_command('AT+HTTPACTION=1')
+            # +HTTPACTION: <method>,<status>,<length>, normally as a URC after OK
+            action = next((line for line in response.lines if line.startswith('+HTTPACTION:')), None)
+            if action is None:
+                if not self._http_event.wait(timeout):
+                    raise RuntimeError("No +HTTPACTION response")
+                action = self._http_action
+
+            _, status, length = (field.strip() for field in action.split(':', 1)[1].split(','))
+            body = ""
+            if int(length) > 0:
+                response = self._gprs_command('AT+HTTPREAD', timeout=timeout)
+                body = "\n".join(line for line in response.lines if not line.startswith('+HTTPREAD:'))
+            return int(status), body
+        finally:
+            self.channel.command('AT+HTTPTERM')
+
     def close(self):
         """Close serial connection."""
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+
         if self.serial_port:
             try:
                 self.serial_port.close()
-                print("SIM800L: Serial port closed")
+                print("SIM800L: Serial port closed", file=sys.stderr)
             except Exception as e:
-                print(f"SIM800L: Error closing port - {e}")
+                print(f"SIM800L: Error closing port - {e}", file=sys.stderr)
 
 
 """
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/sensor_drivers/simulated_hardware.py
+PHASE: PRODUCTION - Test and Benchmark Support
+LOCATION: varuna_ui/python/lib/sensor_drivers/simulated_hardware.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Simulated hardware backends for CI and benchmarks.
+
+FakeSMBus is a drop-in for smbus2.SMBus (pass it as MPU6050(smbus=...))
+backed by an MPU6050 register model: data registers follow a configurable
+arm angle, the FIFO fills at the configured sample rate and overflows
+like the real chip, and every transaction can cost a fixed latency.
+
+FakeSIM800L answers AT commands on a pseudo-terminal, so the unmodified
+SIM800L driver (polling or event-driven) can open it like a serial port.
+Its GPRS bearer and HTTP stack (AT+SAPBR, AT+HTTP*) forward POSTs to a
+real URL, e.g. a local HTTP stand-in, and count bearer time and bytes.
+"""
+
+import os
+import math
+import time
+import random
+import select
+import struct
+import threading
+import urllib.error
+import urllib.request
+
+
+class MPU6050RegisterModel:
+    """Register file of an MPU6050 holding a float arm at a given pitch."""
+
+    SMPLRT_DIV = 0x19
+    CONFIG = 0x1A
+    FIFO_EN = 0x23
+    INT_STATUS = 0x3A
+    ACCEL_XOUT_H = 0x3B
+    USER_CTRL = 0x6A
+    PWR_MGMT_1 = 0x6B
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
+    WHO_AM_I = 0x75
+
+    FIFO_SIZE = 1024
+    INT_FIFO_OFLOW = 0x10
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+
+    # FIFO_EN bit -> bytes per frame, in the chip's FIFO order
+    FIFO_SOURCES = (
+        (0x08, "accel", 6),
+        (0x80, "temp", 2),
+        (0x40, "gyro_x", 2),
+        (0x20, "gyro_y", 2),
+        (0x10, "gyro_z", 2),
+    )
+
+    def __init__(self, angle=10.0, gyro_rate=0.0, temperature=28.0, noise=0.0, seed=None):
+        """
+        Args:
+            angle: Arm pitch in degrees
+            gyro_rate: Gyro X rate in deg/s
+            temperature: Die temperature in Celsius
+            noise: Standard deviation of accelerometer noise in g
+            seed: Random seed for reproducible noise
+        """
+        self.registers = bytearray(256)
+        self.registers[self.PWR_MGMT_1] = 0x40      # Sleeping after power-up
+        self.registers[self.WHO_AM_I] = 0x68
+        self.angle = angle
+        self.gyro_rate = gyro_rate
+        self.temperature = temperature
+        self.noise = noise
+        self.rng = random.Random(seed)
+
+        self._fifo_started = None
+        self._fifo_consumed = 0
+        self._fifo_overflow = False
+
+    # --- Physical state -> raw words ---
+
+    def sample_words(self):
+        """One sample as (ax, ay, az, temp, gx, gy, gz) raw signed words."""
+        theta = math.radians(self.angle)
+        noise = (lambda: self.rng.gauss(0.0, self.noise)) if self.noise else (lambda: 0.0)
+
+        def clamp(value):
+            return max(-32768, min(32767, int(round(value))))
+
+        return (
+            clamp(noise() * 16384.0),
+            clamp((math.sin(theta) + noise()) * 16384.0),
+            clamp((math.cos(theta) + noise()) * 16384.0),
+            clamp((self.temperature - 36.53) * 340.0),
+            clamp(self.gyro_rate * 131.0),
+            0,
+            0,
+        )
+
+    def _frame(self):
+        ax, ay, az, temp, gx, gy, gz = self.sample_words()
+        values = {"accel": (ax, ay, az), "temp": (temp,), "gyro_x": (gx,), "gyro_y": (gy,), "gyro_z": (gz,)}
+        enabled = self.registers[self.FIFO_EN]
+        frame = b''
+        for bit, name, _ in self.FIFO_SOURCES:
+            if enabled & bit:
+                frame += struct.pack(f'>{len(values[name])}h', *values[name])
+        return frame
+
+    # --- FIFO timing ---
+
+    def frame_length(self):
+        enabled = self.registers[self.FIFO_EN]
+        return sum(length for bit, _, length in self.FIFO_SOURCES if enabled & bit)
+
+    def sample_rate(self):
+        dlpf = self.registers[self.CONFIG] & 0x07
+        output_rate = 8000.0 if dlpf in (0, 7) else 1000.0
+        return output_rate / (1 + self.registers[self.SMPLRT_DIV])
+
+    def fifo_pending(self):
+        """Whole frames waiting in the FIFO."""
+        if self._fifo_started is None or self.frame_length() == 0:
+            return 0
+        produced = int((time.monotonic() - self._fifo_started) * self.sample_rate())
+        pending = produced - self._fifo_consumed
+        capacity = self.FIFO_SIZE // self.frame_length()
+        if pending > capacity:
+            # The real FIFO keeps overwriting; model it as full and flag it
+            self._fifo_overflow = True
+            self._fifo_consumed = produced - capacity
+            pending = capacity
+        return pending
+
+    # --- Register access ---
+
+    def write(self, register, value):
+        self.registers[register] = value & 0xFF
+        if register == self.USER_CTRL:
+            if value & self.USER_CTRL_FIFO_RESET:
+                self._fifo_started = None
+                self._fifo_overflow = False
+            if value & self.USER_CTRL_FIFO_EN:
+                if self._fifo_started is None:
+                    self._fifo_started = time.monotonic()
+                    self._fifo_consumed = 0
+            else:
+                self._fifo_started = None
+
+    def read(self, register, length):
+        if register == self.INT_STATUS and length == 1:
+            self.fifo_pending()
+            status = self.INT_FIFO_OFLOW if self._fifo_overflow else 0
+            self._fifo_overflow = False   # Cleared on read
+            return [status]
+
+        if register == self.FIFO_COUNTH:
+            count = self.fifo_pending() * self.frame_length()
+            return list(struct.pack('>H', count))[:length]
+
+        if register == self.FIFO_R_W:
+            frame_length = self.frame_length()
+            frames = min(length // frame_length, self.fifo_pending()) if frame_length else 0
+            self._fifo_consumed += frames
+            data = b''.join(self._frame() for _ in range(frames))
+            return list(data.ljust(length, b'\x00'))
+
+        if self.ACCEL_XOUT_H <= register < self.ACCEL_XOUT_H + 14:
+            self.registers[self.ACCEL_XOUT_H:self.ACCEL_XOUT_H + 14] = struct.pack('>7h', *self.sample_words())
+
+        return list(self.registers[register:register + length])
+
+
+class FakeSMBus:
+    """smbus2.SMBus stand-in backed by an MPU6050RegisterModel."""
+
+    def __init__(self, bus=1, model=None, latency=0.0, address=0x68):
+        """
+        Args:
+            bus: Bus number (informational)
+            model: MPU6050RegisterModel (default: a fresh one at 10 degrees)
+            latency: Seconds each transaction takes (100 kHz I2C block read
+                     of 14 bytes is about 0.0017)
+            address: Device address that acknowledges
+        """
+        self.bus = bus
+        self.model = model if model is not None else MPU6050RegisterModel()
+        self.latency = latency
+        self.address = address
+        self.transactions = 0
+        self.bytes_read = 0
+
+    def _transaction(self, address):
+        self.transactions += 1
+        if self.latency:
+            # Busy-wait: time.sleep() overshoots sub-millisecond delays
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+        if address != self.address:
+            raise OSError(121, "Remote I/O error")
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes_read = 0
+
+    def write_byte_data(self, address, register, value):
+        self._transaction(address)
+        self.model.write(register, value)
+
+    def read_byte_data(self, address, register):
+        self._transaction(address)
+        self.bytes_read += 1
+        return self.model.read(register, 1)[0]
+
+    def read_i2c_block_data(self, address, register, length):
+        self._transaction(address)
+        self.bytes_read += length
+        return self.model.read(register, length)
+
+    def close(self):
+        pass
+
+
+class FakeSIM800L:
+    """SIM800L answering AT commands on a pseudo-terminal."""
+
+    CTRL_Z = b'\x1a'
+    ESC = b'\x1b'
+
+    # SMS texts that read like result codes or URCs; an AT+CMGL listing of
+    # them must come back whole (a body of "OK" once ended the listing)
+    AMBIGUOUS_TEXTS = ("OK", "STATUS", "INTERVAL 30", "ERROR", "RING", "+CMTI: \"SM\",9", "")
+
+    def __init__(self, response_delay=0.0, send_delay=0.0, signal=20, bearer_delay=0.0, network=True):
+        """
+        Args:
+            response_delay: Seconds before answering each command
+            send_delay: Extra seconds before answering AT+CMGS (network time)
+            signal: RSSI value reported by AT+CSQ
+            bearer_delay: Seconds AT+SAPBR=1,1 takes to attach GPRS
+            network: False makes bearer attach fail (no GPRS coverage)
+        """
+        import pty
+        import tty
+
+        self.response_delay = response_delay
+        self.send_delay = send_delay
+        self.signal = signal
+        self.commands = []
+        self.sent = []
+        self.inbox = {}
+        self._next_index = 1
+
+        self.bearer_delay = bearer_delay
+        self.network = network
+        self.bearer_seconds = 0.0
+        self.http_posts = []       # (url, content type, body bytes)
+        self._bearer_since = None
+        self._http = None          # HTTP session parameters after AT+HTTPINIT
+
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="fake-sim800l", daemon=True)
+        self._thread.start()
+
+    def _write(self, text):
+        try:
+            os.write(self._master, text.encode())
+        except OSError:
+            pass
+
+    def inject_sms(self, sender, text, timestamp="24/10/17,10:00:00+22"):
+        """Store a received message and announce it with +CMTI."""
+        index = self._next_index
+        self._next_index += 1
+        self.inbox[index] = ["REC UNREAD", sender, timestamp, text]
+        self._write(f'\r\n+CMTI: "SM",{index}\r\n')
+        return index
+
+    def _answer(self, command):
+        upper = command.upper()
+        if upper in ("AT", "ATE0", "ATE1") or upper.startswith("AT+CMGF") or upper.startswith("AT+CNMI"):
+            return "OK"
+        if upper == "AT+CPIN?":
+            return "+CPIN: READY\r\n\r\nOK"
+        if upper == "AT+CREG?":
+            return "+CREG: 0,1\r\n\r\nOK"
+        if upper == "AT+CSQ":
+            return f"+CSQ: {self.signal},0\r\n\r\nOK"
+        if upper.startswith("AT+CMGL"):
+            wanted = command.split('=', 1)[1].strip('"') if '=' in command else "ALL"
+            lines = []
+            for index, (status, sender, stamp, text) in sorted(self.inbox.items()):
+                if wanted in ("ALL", status):
+                    lines.append(f'+CMGL: {index},"{status}","{sender}","","{stamp}"\r\n{text}')
+                    self.inbox[index][0] = "REC READ" if status == "REC UNREAD" else status
+            return "\r\n".join(lines + ["", "OK"]) if lines else "OK"
+        if upper.startswith("AT+CMGR="):
+            index = int(command.split('=', 1)[1])
+            if index not in self.inbox:
+                return "ERROR"
+            status, sender, stamp, text = self.inbox[index]
+            self.inbox[index][0] = "REC READ"
+            return f'+CMGR: "{status}","{sender}","","{stamp}"\r\n{text}\r\n\r\nOK'
+        if upper.startswith("AT+SAPBR="):
+            return self._bearer(command.split('=', 1)[1].split(','))
+        if upper == "AT+HTTPINIT":
+            if self._http is not None:
+                return "ERROR"
+            self._http = {"params": {}, "data": b"", "status": None, "response": b""}
+            return "OK"
+        if upper == "AT+HTTPTERM":
+            if self._http is None:
+                return "ERROR"
+            self._http = None
+            return "OK"
+        if upper.startswith("AT+HTTPPARA="):
+            if self._http is None:
+                return "ERROR"
+            name, value = (part.strip().strip('"') for part in command.split('=', 1)[1].split(',', 1))
+            self._http["params"][name.upper()] = value
+            return "OK"
+        if upper == "AT+HTTPREAD":
+            if self._http is None or self._http["status"] is None:
+                return "ERROR"
+            body = self._http["response"].decode(errors='replace')
+            return f"+HTTPREAD: {len(self._http['response'])}\r\n{body}\r\nOK"
+        if upper.startswith("AT+CMGD="):
+            for part in command[2:].split(';'):
+                arguments = part.split('=', 1)[1].split(',')
+                if len(arguments) > 1 and int(arguments[1]) == 4:
+                    self.inbox.clear()
+                else:
+                    self.inbox.pop(int(arguments[0]), None)
+            return "OK"
+        return "ERROR"
+
+    def _bearer(self, arguments):
+        operation = int(arguments[0])
+        if operation == 3:
+            return "OK"
+        if operation == 2:
+            if self._bearer_since is None:
+                return '+SAPBR: 1,3,"0.0.0.0"\r\n\r\nOK'
+            return '+SAPBR: 1,1,"10.64.0.2"\r\n\r\nOK'
+        if operation == 1:
+            time.sleep(self.bearer_delay)
+            if self._bearer_since is not None or not self.network:
+                return "ERROR"
+            self._bearer_since = time.monotonic()
+            return "OK"
+        if operation == 0:
+            if self._bearer_since is None:
+                return "ERROR"
+            self.bearer_seconds += time.monotonic() - self._bearer_since
+            self._bearer_since = None
+            return "OK"
+        return "ERROR"
+
+    def _http_action(self):
+        """Perform the POST of AT+HTTPACTION=1; returns the +HTTPACTION URC."""
+        http = self._http
+        url = http["params"].get("URL", "")
+        content_type = http["params"].get("CONTENT", "application/octet-stream")
+        self.http_posts.append((url, content_type, http["data"]))
+
+        if self._bearer_since is None:
+            status, body = 601, b""       # SIM800 "network error"
+        else:
+            request = urllib.request.Request(url, data=http["data"], method="POST",
+                                             headers={"Content-Type": content_type})
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    status, body = response.status, response.read()
+            except urllib.error.HTTPError as e:
+                status, body = e.code, e.read()
+            except (urllib.error.URLError, OSError, ValueError):
+                status, body = 601, b""
+
+        http["status"], http["response"] = status, body
+        return f"+HTTPACTION: 1,{status},{len(body)}"
+
+    def _serve(self):
+        buffer = b''
+        payload_command = None
+        download = 0
+
+        while self._running:
+            try:
+                # Poll so close() does not wait on a blocked read
+                if not select.select([self._master], [], [], 0.1)[0]:
+                    continue
+                data = os.read(self._master, 1024)
+            except (OSError, ValueError):
+                return
+            buffer += data
+
+            while True:
+                if download:
+                    # AT+HTTPDATA: exactly the announced number of raw bytes
+                    chunk = buffer[:download]
+                    buffer = buffer[len(chunk):]
+                    self._http["data"] += chunk
+                    download -= len(chunk)
+                    if download:
+                        break
+                    self._write("\r\nOK\r\n")
+                    continue
+
+                if payload_command is not None:
+                    if self.ESC in buffer:
+                        buffer = buffer[buffer.index(self.ESC) + 1:]
+                        payload_command = None
+                        continue
+                    if self.CTRL_Z not in buffer:
+                        break
+                    end = buffer.index(self.CTRL_Z)
+                    self.sent.append((payload_command, buffer[:end].decode(errors='replace')))
+                    buffer = buffer[end + 1:]
+                    payload_command = None
+                    time.sleep(self.response_delay + self.send_delay)
+                    self._write(f"\r\n+CMGS: {len(self.sent) % 256}\r\n\r\nOK\r\n")
+                    continue
+
+                end = buffer.find(b'\r')
+                if end < 0:
+                    break
+                command = buffer[:end].decode(errors='replace').strip()
+                buffer = buffer[end + 1:]
+                # One LF after the CR; AT+HTTPDATA bytes may start with LF themselves
+                if buffer.startswith(b'\n'):
+                    buffer = buffer[1:]
+                if not command:
+                    continue
+
+                self.commands.append(command)
+                if command.upper().startswith("AT+CMGS"):
+                    payload_command = command
+                    self._write("\r\n> ")
+                    continue
+
+                if command.upper().startswith("AT+HTTPDATA=") and self._http is not None:
+                    download = int(command.split('=', 1)[1].split(',')[0])
+                    self._http["data"] = b""
+                    self._write("\r\nDOWNLOAD\r\n")
+                    if not download:
+                        self._write("\r\nOK\r\n")
+                    continue
+
+                if command.upper() == "AT+HTTPACTION=1" and self._http is not None:
+                    time.sleep(self.response_delay)
+                    self._write("\r\nOK\r\n")
+                    self._write(f"\r\n{self._http_action()}\r\n")
+                    continue
+
+                time.sleep(self.response_delay)
+                self._write(f"\r\n{self._answer(command)}\r\n")
+
+    def close(self):
+        """Stop answering and release the pseudo-terminal."""
+        self._running = False
+        self._thread.join(timeout=1.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/sensor_drivers/simulated_hardware.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/sensor_drivers/sms_pdu.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/lib/sensor_drivers/sms_pdu.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+SMS-SUBMIT PDU encoding (3GPP TS 23.040 / 23.038).
+
+Text mode (AT+CMGF=1) can only send one part of at most 160 GSM 7-bit
+characters. Longer alerts, or text outside the GSM alphabet (Hindi
+place names), are sent in PDU mode (AT+CMGF=0) as concatenated parts
+carrying a User Data Header, which the phone joins back into one message.
+"""
+
+# GSM 03.38 default alphabet, indexed by septet value
+GSM7_BASIC = (
+    "@£$¥èéùìòÇ\nØø\rÅå"
+    "Δ_ΦΓΛΩΠΨΣΘΞ\x1bÆæßÉ"
+    " !\"#¤%&'()*+,-./"
+    "0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNO"
+    "PQRSTUVWXYZÄÖÑÜ§"
+    "¿abcdefghijklmno"
+    "pqrstuvwxyzäöñüà"
+)
+
+# Extension table, reached through the 0x1B escape septet
+GSM7_EXTENSION = {
+    '\f': 0x0A, '^': 0x14, '{': 0x28, '}': 0x29, '\\': 0x2F,
+    '[': 0x3C, '~': 0x3D, ']': 0x3E, '|': 0x40, '€': 0x65,
+}
+
+GSM7_ESCAPE = 0x1B
+_GSM7_LOOKUP = {char: index for index, char in enumerate(GSM7_BASIC) if index != GSM7_ESCAPE}
+
+# Capacity of one message: 140 octets of user data
+GSM7_SINGLE = 160
+GSM7_PART = 153      # 160 septets minus the 6-octet concatenation header (7 septets)
+UCS2_SINGLE = 70
+UCS2_PART = 67       # 16-bit units: (140 - 6) / 2
+
+DCS_GSM7 = 0x00
+DCS_UCS2 = 0x08
+
+MAX_PARTS = 255
+
+# TP-VP relative validity: 0xA7 = 24 hours
+VALIDITY_24H = 0xA7
+
+
+def gsm7_septets(char):
+    """
+    Septets for one character, or None if it is not in the GSM alphabet.
+
+    Args:
+        char: Single character
+
+    Returns:
+        List of one septet, or two for extension characters
+    """
+    if char in _GSM7_LOOKUP:
+        return [_GSM7_LOOKUP[char]]
+    if char in GSM7_EXTENSION:
+        return [GSM7_ESCAPE, GSM7_EXTENSION[char]]
+    return None
+
+
+def is_gsm7(text):
+    """True if every character of text can be sent in the GSM 7-bit alphabet."""
+    return all(gsm7_septets(char) is not None for char in text)
+
+
+def fits_single_text_sms(text):
+    """True if text can go out as one plain text-mode SMS."""
+    return is_gsm7(text) and sum(len(gsm7_septets(char)) for char in text) <= GSM7_SINGLE
+
+
+def split_message(text):
+    """
+    Split text into the units of each SMS part.
+
+    GSM 7-bit parts are lists of septets (an escape pair is never split);
+    UCS-2 parts are bytes in UTF-16BE (a surrogate pair is never split).
+
+    Args:
+        text: Message text
+
+    Returns:
+        Tuple of (data coding scheme, list of parts)
+    """
+    if is_gsm7(text):
+        dcs, single, limit = DCS_GSM7, GSM7_SINGLE, GSM7_PART
+        units = [gsm7_septets(char) for char in text]
+    else:
+        dcs, single, limit = DCS_UCS2, UCS2_SINGLE, UCS2_PART
+        units = []
+        for char in text:
+            encoded = char.encode('utf-16-be')
+            units.append([encoded[i:i + 2] for i in range(0, len(encoded), 2)])
+
+    if sum(len(unit) for unit in units) <= single:
+        parts = [[item for unit in units for item in unit]]
+    else:
+        parts = [[]]
+        for unit in units:
+            if len(parts[-1]) + len(unit) > limit:
+                parts.append([])
+            parts[-1].extend(unit)
+
+    if len(parts) > MAX_PARTS:
+        raise ValueError(f"Message needs {len(parts)} parts (max {MAX_PARTS})")
+
+    if dcs == DCS_UCS2:
+        parts = [b''.join(part) for part in parts]
+    return dcs, parts
+
+
+def pack_septets(septets, fill_bits=0):
+    """
+    Pack septets into octets, least significant bit first.
+
+    Args:
+        septets: Septet values (0-127)
+        fill_bits: Zero bits to insert first, aligning text after a UDH
+
+    Returns:
+        Packed bytes
+    """
+    packed = bytearray()
+    accumulator = 0
+    bits = fill_bits
+    for septet in septets:
+        accumulator |= septet << bits
+        bits += 7
+        while bits >= 8:
+            packed.append(accumulator & 0xFF)
+            accumulator >>= 8
+            bits -= 8
+    if bits:
+        packed.append(accumulator & 0xFF)
+    return bytes(packed)
+
+
+def encode_address(number):
+    """
+    Encode a destination address (TP-DA).
+
+    Args:
+        number: Phone number, "+" prefix for international format
+
+    Returns:
+        Encoded address bytes
+    """
+    international = number.strip().startswith('+')
+    digits = ''.join(c for c in number if c.isdigit())
+    if not digits:
+        raise ValueError(f"Invalid phone number '{number}'")
+
+    padded = digits + ('F' if len(digits) % 2 else '')
+    swapped = ''.join(padded[i + 1] + padded[i] for i in range(0, len(padded), 2))
+    return bytes([len(digits), 0x91 if international else 0x81]) + bytes.fromhex(swapped)
+
+
+def encode_submit(number, text, reference=0):
+    """
+    Encode a message as one or more SMS-SUBMIT PDUs.
+
+    Args:
+        number: Destination phone number
+        text: Message text (any length up to MAX_PARTS parts)
+        reference: Concatenation reference (0-255), shared by all parts
+                   and different for consecutive long messages
+
+    Returns:
+        List of (pdu_hex, tpdu_length) tuples; tpdu_length is the value for
+        AT+CMGS=<length> (the PDU without the leading SMSC octet)
+    """
+    dcs, parts = split_message(text)
+    concatenated = len(parts) > 1
+    address = encode_address(number)
+
+    pdus = []
+    for sequence, part in enumerate(parts, start=1):
+        if concatenated:
+            # IEI 0x00: concatenated short message, 8-bit reference
+            udh = bytes([5, 0x00, 3, reference & 0xFF, len(parts), sequence])
+        else:
+            udh = b''
+
+        if dcs == DCS_GSM7:
+            fill_bits = (7 - (len(udh) * 8) % 7) % 7
+            user_data = udh + pack_septets(part, fill_bits)
+            user_data_length = (len(udh) * 8 + fill_bits) // 7 + len(part)
+        else:
+            user_data = udh + part
+            user_data_length = len(user_data)
+
+        # SMS-SUBMIT, relative validity period present, UDHI when concatenated
+        first_octet = 0x01 | 0x10 | (0x40 if concatenated else 0x00)
+        tpdu = (bytes([first_octet, 0x00]) + address +
+                bytes([0x00, dcs, VALIDITY_24H, user_data_length]) + user_data)
+
+        # Leading 00: use the SMSC stored on the SIM
+        pdus.append(('00' + tpdu.hex().upper(), len(tpdu)))
+
+    return pdus
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/sensor_drivers/sms_pdu.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/__init__.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/__init__.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Station services (history, estimation, messaging) for the Varuna
+water level monitoring system. Hardware access lives in sensor_drivers.
+"""
+
+__version__ = "1.0.0"
+__all__ = ["history", "rate_estimator", "sms_outbox", "sms_commands", "config_manager", "alert_broadcast", "acquisition", "binary_frames", "consensus", "scheduler", "aggregation", "uplink", "alert_engine"]
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/__init__.py
+═══════════════════════════════════════════════════════════════
+"""
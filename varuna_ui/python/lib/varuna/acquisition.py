@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/acquisition.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/acquisition.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Concurrent sensor acquisition.
+
+Slow sensors (DHT22, and later ultrasonic and pressure) are read on
+worker threads while the caller runs the MPU6050 sampling loop. Each
+sensor has a deadline measured from the start of the record; one that
+misses it reports its last good value flagged STALE instead of holding
+the record back, so a record takes as long as the slowest deadline
+rather than the sum of every sensor's worst case.
+"""
+
+import sys
+import time
+import threading
+
+
+class _Job:
+    """One read running on a worker thread."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ConcurrentAcquisition:
+    """Reads registered sensors in parallel with a primary sampling loop."""
+
+    def __init__(self):
+        self.sensors = {}      # name -> (read, deadline in seconds, fallback)
+        self._jobs = {}        # name -> _Job still owned by the sensor
+        self._last_good = {}   # name -> (data, monotonic time)
+
+    def register(self, name, read, deadline, fallback):
+        """
+        Add a sensor to every acquisition.
+
+        Args:
+            name: Key of the sensor in the results, e.g. "dht22"
+            read: Callable returning the sensor's data dictionary
+            deadline: Seconds from the start of acquire() the sensor may take
+            fallback: Data dictionary reported if no good reading exists yet
+        """
+        self.sensors[name] = (read, deadline, fallback)
+
+    def _run(self, name, job):
+        try:
+            job.result = self.sensors[name][0]()
+        except Exception as e:
+            job.error = e
+        finally:
+            job.done.set()
+
+    def _start(self, name):
+        """
+        Start a read, unless the previous one is still running.
+
+        A read that overran its deadline keeps its worker; its result is
+        used once it arrives instead of piling up a second read on a
+        sensor that is already stuck.
+        """
+        job = self._jobs.get(name)
+        if job is not None:
+            if not job.done.is_set():
+                return job
+            # Finished after the last deadline: keep it as the last good value
+            self._complete(name, job)
+
+        job = _Job()
+        self._jobs[name] = job
+        # Daemon threads: a hung sensor must not keep the process alive
+        threading.Thread(target=self._run, args=(name, job), name=f"acquire-{name}", daemon=True).start()
+        return job
+
+    def _complete(self, name, job):
+        """Consume a finished job and return the sensor's data."""
+        del self._jobs[name]
+        fallback = self.sensors[name][2]
+
+        if job.error is not None:
+            print(f"WARNING: {name} read failed - {job.error}", file=sys.stderr)
+            return dict(fallback, status="FAULT")
+
+        data = job.result
+        if data.get("status") == "OK":
+            self._last_good[name] = (data, time.monotonic())
+        return data
+
+    def _stale(self, name):
+        """Last good value of a sensor that missed its deadline."""
+        deadline = self.sensors[name][1]
+        print(f"WARNING: {name} missed its {deadline * 1000:.0f} ms deadline", file=sys.stderr)
+
+        if name not in self._last_good:
+            return dict(self.sensors[name][2], status="STALE")
+
+        data, taken = self._last_good[name]
+        return dict(data, status="STALE", age_s=round(time.monotonic() - taken, 1))
+
+    def acquire(self, primary=None):
+        """
+        Read every registered sensor while running primary on this thread.
+
+        Args:
+            primary: Optional callable run on the calling thread (the MPU6050
+                     sampling loop); its return value is passed through
+
+        Returns:
+            Tuple of (primary result, dictionary of sensor name -> data)
+        """
+        started = time.monotonic()
+        jobs = {name: self._start(name) for name in self.sensors}
+
+        primary_result = primary() if primary is not None else None
+
+        results = {}
+        for name, job in jobs.items():
+            remaining = started + self.sensors[name][1] - time.monotonic()
+            if job.done.wait(max(0.0, remaining)):
+                results[name] = self._complete(name, job)
+            else:
+                results[name] = self._stale(name)
+
+        return primary_result, results
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/acquisition.py
+═══════════════════════════════════════════════════════════════
+"""
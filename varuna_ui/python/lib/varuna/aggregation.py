@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/aggregation.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/aggregation.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Control room aggregation of many stations' readings.
+
+Stations send read_sensors.py records in one of three ways:
+
+    JSON port    TCP, one JSON record per line (read_sensors.py --daemon output)
+    binary port  TCP, binary_frames stream (read_sensors.py --format binary)
+    UDP port     one or more JSON lines per datagram; dropped when the
+                 server is saturated, where TCP senders are slowed down
+
+Records are indexed as they arrive: the latest reading per device_id
+and the set of stations at or above their warning and danger levels are
+updated in O(1), so "which stations are above warning" never scans the
+fleet. A writer task drains the ingest queue in batches and appends each
+station's rows to its own ReadingHistory ring (store_dir/<device_id>.ring)
+with one extend() per station per batch.
+
+Lines on the JSON port that are not records are queries, answered with
+one JSON line: ABOVE_WARNING, ABOVE_DANGER, LATEST <device_id>,
+STATIONS, STATS and RESET (clears the latency window).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+from collections import deque
+from datetime import datetime
+
+from .history import ReadingHistory, reading_row
+from .binary_frames import FrameDecoder, FRAME_READING, STATIC_KEYS
+
+# Ingest latencies kept for the STATS percentiles
+LATENCY_WINDOW = 100000
+
+# Pending connections per listener; a fleet reconnects at once after an outage
+BACKLOG = 1024
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def record_level(record):
+    """Consensus level of a record, falling back to the MPU6050 level."""
+    level = record.get("consensus_level_cm")
+    if level is None:
+        level = record.get("mpu6050", {}).get("water_level_cm")
+    return level
+
+
+def record_from_frame(meta, reading):
+    """
+    Rebuild a reader record from a decoded binary frame.
+
+    Args:
+        meta: Last META dictionary of the stream
+        reading: READING content from FrameDecoder.feed
+
+    Returns:
+        Record dictionary in the JSON schema (fields that were never sent
+        are missing)
+    """
+    record = {key: (meta or {}).get(key) for key in STATIC_KEYS}
+    record["timestamp"] = datetime.fromtimestamp(reading["timestamp"]).isoformat()
+    for name, value in reading["values"].items():
+        *parents, leaf = name.split(".")
+        target = record
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = value
+    return record
+
+
+class StationIndex:
+    """Latest reading per station and the stations above each threshold."""
+
+    def __init__(self, warning_cm=200.0, danger_cm=250.0, station_thresholds=None):
+        """
+        Initialize an empty index.
+
+        Args:
+            warning_cm: Default warning level in cm
+            danger_cm: Default danger level in cm
+            station_thresholds: {device_id: {"warning_level_cm": ...,
+                                "danger_level_cm": ...}} overrides
+        """
+        self.warning_cm = warning_cm
+        self.danger_cm = danger_cm
+        self.station_thresholds = dict(station_thresholds or {})
+
+        self.latest = {}               # device_id -> summary of the newest reading
+        self._above_warning = set()
+        self._above_danger = set()
+
+    def thresholds(self, device_id):
+        """(warning, danger) in cm for one station."""
+        own = self.station_thresholds.get(device_id, {})
+        return (own.get("warning_level_cm", self.warning_cm),
+                own.get("danger_level_cm", self.danger_cm))
+
+    def update(self, device_id, timestamp, level, status, location=None):
+        """
+        Index one reading; older readings than the latest are ignored.
+
+        Args:
+            device_id: Station id
+            timestamp: Unix time of the reading
+            level: Level in cm, or None if the station has no usable level
+            status: Consensus (or MPU6050) status
+            location: Station location from its config.json
+
+        Returns:
+            True if the reading became the station's latest
+        """
+        previous = self.latest.get(device_id)
+        if previous is not None and timestamp < previous["timestamp"]:
+            return False
+
+        self.latest[device_id] = {
+            "timestamp": timestamp,
+            "level_cm": level,
+            "status": status,
+            "location": location if location is not None else (previous or {}).get("location")
+        }
+
+        warning, danger = self.thresholds(device_id)
+        for members, threshold in ((self._above_warning, warning), (self._above_danger, danger)):
+            if level is not None and level >= threshold:
+                members.add(device_id)
+            else:
+                members.discard(device_id)
+        return True
+
+    def above_warning(self):
+        """Stations whose latest level is at or above their warning level."""
+        return list(self._above_warning)
+
+    def above_danger(self):
+        """Stations whose latest level is at or above their danger level."""
+        return list(self._above_danger)
+
+
+class StationStore:
+    """One ReadingHistory ring per station, opened on first use."""
+
+    def __init__(self, directory, capacity=10080):
+        """
+        Initialize an empty store.
+
+        Args:
+            directory: Directory for the ring files
+            capacity: Records per new station ring (default: one week at
+                      one reading per minute)
+        """
+        self.directory = str(directory)
+        self.capacity = capacity
+        self._rings = {}
+
+    def ring(self, device_id):
+        """ReadingHistory of one station."""
+        history = self._rings.get(device_id)
+        if history is None:
+            path = os.path.join(self.directory, _UNSAFE.sub("_", device_id) + ".ring")
+            # Syncing is done for all stations at once by flush()
+            history = ReadingHistory(path, capacity=self.capacity, sync_every=0)
+            self._rings[device_id] = history
+        return history
+
+    def extend(self, device_id, rows):
+        """Append a batch of history rows for one station."""
+        self.ring(device_id).extend(rows)
+
+    def flush(self):
+        """msync every open ring."""
+        for history in list(self._rings.values()):
+            history.flush()
+
+    def close(self):
+        for history in self._rings.values():
+            history.close()
+        self._rings = {}
+
+
+class _DatagramIngest(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        self.server._datagram(data)
+
+
+class AggregationServer:
+    """asyncio ingest server feeding a StationIndex and a StationStore."""
+
+    def __init__(self, store, index, batch_size=500, flush_interval=0.005, sync_interval=5.0,
+                 queue_size=2000):
+        """
+        Initialize the server (nothing is bound until start()).
+
+        Args:
+            store: StationStore for the time series
+            index: StationIndex for queries
+            batch_size: Largest number of records per store batch
+            flush_interval: Seconds the writer lingers after the first
+                            record of a batch for more to arrive
+            sync_interval: Seconds between msyncs of all rings
+            queue_size: Records waiting for the writer before TCP
+                        connections stop being read and UDP records are
+                        dropped
+        """
+        self.store = store
+        self.index = index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sync_interval = sync_interval
+
+        self.queue_size = queue_size
+        self.queue = asyncio.Queue()
+        self._room = asyncio.Event()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)    # receive -> stored, seconds
+        self.counters = {"received": 0, "stored": 0, "invalid": 0, "dropped": 0, "batches": 0}
+        self.ports = {}
+        self.started = time.time()
+
+        self._servers = []
+        self._transport = None
+        self._writer_task = None
+
+    # ---- ingest ----
+
+    def _accept(self, record, received):
+        """Validate and index one record; returns the queue item or None."""
+        device_id = record.get("device_id") if isinstance(record, dict) else None
+        try:
+            if not isinstance(device_id, str) or not device_id:
+                raise ValueError("no device_id")
+            row = reading_row(record)
+        except (KeyError, TypeError, ValueError):
+            self.counters["invalid"] += 1
+            return None
+
+        level = record_level(record)
+        status = record.get("consensus", {}).get("status") or record.get("mpu6050", {}).get("status", "UNKNOWN")
+        self.index.update(device_id, row[0], level, status, record.get("location"))
+        self.counters["received"] += 1
+        return device_id, row, received
+
+    async def wait_for_room(self):
+        """
+        Wait until the queue is below queue_size.
+
+        TCP handlers call this before reading, so a saturated server slows
+        senders down through their socket buffers instead of holding
+        records it has already received.
+        """
+        while self.queue.qsize() >= self.queue_size:
+            self._room.clear()
+            await self._room.wait()
+
+    def ingest(self, record, received=None):
+        """
+        Index a record and queue it for the store.
+
+        Args:
+            record: Reader record dictionary
+            received: perf_counter() time the record arrived (default: now)
+
+        Returns:
+            True if the record was queued
+        """
+        item = self._accept(record, time.perf_counter() if received is None else received)
+        if item is None:
+            return False
+        self.queue.put_nowait(item)
+        return True
+
+    def ingest_nowait(self, record, received=None):
+        """Like ingest(), but drop the record when the queue is full (UDP)."""
+        if self.queue.qsize() >= self.queue_size:
+            self.counters["dropped"] += 1
+            return False
+        return self.ingest(record, received)
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        next_sync = time.monotonic() + self.sync_interval
+        syncing = None
+
+        while True:
+            batch = [await self.queue.get()]
+            # Linger once so records arriving together share a batch, then
+            # take whatever is queued without waiting per record
+            if self.flush_interval > 0 and self.queue.qsize() < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self._room.set()
+
+            self._store(batch)
+
+            # msync in a worker thread; batches keep going into the mappings
+            if time.monotonic() >= next_sync and (syncing is None or syncing.done()):
+                next_sync = time.monotonic() + self.sync_interval
+                syncing = loop.run_in_executor(None, self.store.flush)
+
+    def _store(self, batch):
+        rows = {}
+        for device_id, row, _ in batch:
+            rows.setdefault(device_id, []).append(row)
+        for device_id, station_rows in rows.items():
+            try:
+                self.store.extend(device_id, station_rows)
+            except (OSError, ValueError) as e:
+                print(f"Aggregator: store failed for {device_id} - {e}", file=sys.stderr)
+
+        done = time.perf_counter()
+        self.latencies.extend(done - received for _, _, received in batch)
+        self.counters["stored"] += len(batch)
+        self.counters["batches"] += 1
+
+    # ---- protocols ----
+
+    def query(self, line):
+        """
+        Answer a query line from the JSON port.
+
+        Returns:
+            Reply dictionary
+        """
+        command, _, argument = line.strip().partition(" ")
+        command = command.upper()
+
+        if command == "ABOVE_WARNING":
+            return {"stations": self.index.above_warning()}
+        if command == "ABOVE_DANGER":
+            return {"stations": self.index.above_danger()}
+        if command == "LATEST":
+            return {"device_id": argument, "latest": self.index.latest.get(argument)}
+        if command == "STATIONS":
+            return {"stations": sorted(self.index.latest)}
+        if command == "STATS":
+            return self.stats()
+        if command == "RESET":
+            self.latencies.clear()
+            return {"reset": True}
+        return {"error": f"Unknown query '{command}'"}
+
+    def stats(self):
+        """Counters, queue depth and ingest latency percentiles (ms)."""
+        latency = None
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            latency = {
+                "p50": round(percentile(ordered, 0.50) * 1000.0, 3),
+                "p99": round(percentile(ordered, 0.99) * 1000.0, 3),
+                "max": round(ordered[-1] * 1000.0, 3),
+                "n": len(ordered)
+            }
+        return dict(
+            self.counters,
+            stations=len(self.index.latest),
+            queued=self.queue.qsize(),
+            uptime_s=round(time.time() - self.started, 1),
+            ingest_latency_ms=latency
+        )
+
+    async def _handle_json(self, reader, writer):
+        try:
+            while True:
+                await self.wait_for_room()
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                if line.lstrip().startswith(b"{"):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        self.counters["invalid"] += 1
+                        continue
+                    self.ingest(record, received)
+                elif line.strip():
+                    writer.write(json.dumps(self.query(line.decode(errors="replace"))).encode() + b"\n")
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            print(f"Aggregator: JSON client dropped - {e}", file=sys.stderr)
+        finally:
+            writer.close()
+
+    async def _handle_binary(self, reader, writer):
+        decoder = FrameDecoder()
+        try:
+            while True:
+                await self.wait_for_room()
+                data = await reader.read(65536)
+                if not data:
+                    break
+                received = time.perf_counter()
+                for frame_type, content in decoder.feed(data):
+                    if frame_type == FRAME_READING:
+                        self.ingest(record_from_frame(decoder.meta, content), received)
+        except (ConnectionError, ValueError) as e:
+            print(f"Aggregator: binary client dropped - {e}", file=sys.stderr)
+        finally:
+            writer.close()
+
+    def _datagram(self, data):
+        received = time.perf_counter()
+        for line in data.splitlines():
+            try:
+                self.ingest_nowait(json.loads(line), received)
+            except ValueError:
+                self.counters["invalid"] += 1
+
+    # ---- lifecycle ----
+
+    async def start(self, host="127.0.0.1", json_port=8470, binary_port=8471, udp_port=8470):
+        """
+        Bind the listeners (a port of None disables it, 0 picks a free one)
+        and start the writer. Bound ports are in self.ports.
+        """
+        loop = asyncio.get_running_loop()
+        self._writer_task = asyncio.create_task(self._writer())
+
+        if json_port is not None:
+            server = await asyncio.start_server(self._handle_json, host, json_port, limit=1 << 20, backlog=BACKLOG)
+            self._servers.append(server)
+            self.ports["json"] = server.sockets[0].getsockname()[1]
+        if binary_port is not None:
+            server = await asyncio.start_server(self._handle_binary, host, binary_port, backlog=BACKLOG)
+            self._servers.append(server)
+            self.ports["binary"] = server.sockets[0].getsockname()[1]
+        if udp_port is not None:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramIngest(self), local_addr=(host, udp_port))
+            self.ports["udp"] = self._transport.get_extra_info("sockname")[1]
+
+        print(f"Aggregator: Listening on {host} {self.ports}", file=sys.stderr)
+
+    async def stop(self):
+        """Close the listeners, store what is queued and sync the rings."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._transport is not None:
+            self._transport.close()
+
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        if pending:
+            self._store(pending)
+        self.store.flush()
+
+
+def create_server(config, store_dir):
+    """
+    Build an AggregationServer from config.json.
+
+    Args:
+        config: Parsed configuration dictionary ("aggregation" and
+                "thresholds" sections)
+        store_dir: Directory for the station rings
+
+    Returns:
+        AggregationServer (not started)
+    """
+    section = config.get("aggregation", {})
+    thresholds = config.get("thresholds", {})
+
+    index = StationIndex(
+        warning_cm=thresholds.get("warning_level_cm", 200.0),
+        danger_cm=thresholds.get("danger_level_cm", 250.0),
+        station_thresholds=section.get("stations")
+    )
+    store = StationStore(store_dir, capacity=section.get("capacity", 10080))
+    return AggregationServer(
+        store,
+        index,
+        batch_size=section.get("batch_size", 500),
+        flush_interval=section.get("flush_interval_ms", 5) / 1000.0,
+        sync_interval=section.get("sync_interval_s", 5.0),
+        queue_size=section.get("queue_size", 2000)
+    )
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/aggregation.py
+═══════════════════════════════════════════════════════════════
+"""
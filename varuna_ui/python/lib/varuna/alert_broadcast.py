@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/alert_broadcast.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/lib/varuna/alert_broadcast.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Alert fan-out to many recipients.
+
+One alert goes to every recipient over a single modem session (long
+text is sent as concatenated SMS by the driver). A small SQLite log of
+(alert key, recipient, time) suppresses repeats of the same condition
+within a window, and the caller gets a per-recipient delivery report.
+"""
+
+import os
+import time
+import sqlite3
+
+from .sms_commands import normalize_number
+
+
+SENT = "SENT"
+FAILED = "FAILED"
+QUEUED = "QUEUED"
+SUPPRESSED = "SUPPRESSED"
+DUPLICATE = "DUPLICATE"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_log (
+    alert_key TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    sent REAL NOT NULL,
+    PRIMARY KEY (alert_key, recipient)
+);
+"""
+
+
+class AlertLog:
+    """When each recipient last received each alert."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: SQLite database path
+        """
+        self.path = str(path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def last_sent(self, alert_key, recipient):
+        """Unix time the alert last reached this recipient, or None."""
+        row = self.db.execute(
+            "SELECT sent FROM alert_log WHERE alert_key = ? AND recipient = ?",
+            (alert_key, normalize_number(recipient))
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, alert_key, recipient, when=None):
+        """Remember that the alert reached this recipient."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO alert_log (alert_key, recipient, sent) VALUES (?, ?, ?)",
+            (alert_key, normalize_number(recipient), time.time() if when is None else when)
+        )
+
+    def prune(self, keep_seconds=7 * 86400):
+        """Forget entries older than keep_seconds."""
+        self.db.execute("DELETE FROM alert_log WHERE sent < ?", (time.time() - keep_seconds,))
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
+
+
+class AlertBroadcaster:
+    """Sends one alert to many recipients with repeat suppression."""
+
+    def __init__(self, send, log=None, dedup_window=1800.0, queued=False):
+        """
+        Args:
+            send: Callable(phone, message) returning True on success, e.g.
+                  SIM800L.send_sms or an outbox enqueue wrapper
+            log: AlertLog for repeat suppression (None disables it)
+            dedup_window: Seconds during which a repeat of the same alert
+                          to the same recipient is suppressed
+            queued: send only queues the message (report status QUEUED)
+        """
+        self.send = send
+        self.log = log
+        self.dedup_window = dedup_window
+        self.queued = queued
+
+    def broadcast(self, recipients, message, alert_key=None):
+        """
+        Send an alert to every recipient.
+
+        Args:
+            recipients: Phone numbers, in notification order
+            message: Alert text (any length)
+            alert_key: Condition identifier for repeat suppression, e.g.
+                       "DANGER"; defaults to the message text
+
+        Returns:
+            Delivery report dictionary with totals and one result per recipient
+        """
+        alert_key = alert_key or message
+        started = time.monotonic()
+        now = time.time()
+
+        results = []
+        seen = set()
+        for recipient in recipients:
+            result = {"recipient": recipient}
+            number = normalize_number(recipient)
+
+            if number in seen:
+                result["status"] = DUPLICATE
+                results.append(result)
+                continue
+            seen.add(number)
+
+            last = self.log.last_sent(alert_key, recipient) if self.log else None
+            if last is not None and now - last < self.dedup_window:
+                result["status"] = SUPPRESSED
+                result["last_sent"] = last
+                results.append(result)
+                continue
+
+            try:
+                success = self.send(recipient, message)
+                error = None if success else "send failed"
+            except Exception as e:
+                success, error = False, str(e)
+
+            if success:
+                result["status"] = QUEUED if self.queued else SENT
+                if self.log:
+                    self.log.record(alert_key, recipient)
+            else:
+                result["status"] = FAILED
+                result["error"] = error
+
+            # Time from the start of the broadcast until this recipient was reached
+            result["elapsed_s"] = round(time.monotonic() - started, 3)
+            results.append(result)
+
+        totals = {status: sum(1 for r in results if r["status"] == status)
+                  for status in (SENT, QUEUED, FAILED, SUPPRESSED, DUPLICATE)}
+
+        return {
+            "alert_key": alert_key,
+            "recipients": len(results),
+            **{status.lower(): count for status, count in totals.items()},
+            "elapsed_s": round(time.monotonic() - started, 3),
+            "results": results,
+        }
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/alert_broadcast.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/alert_engine.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/alert_engine.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+On-device threshold alerts.
+
+AlertEngine evaluates every reading against thresholds.warning_level_cm
+and danger_level_cm from config.json and a rate-of-rise rule, so alerts
+no longer depend on the UI being up. Each rule latches:
+
+    RAISE   the condition held for confirm_readings consecutive readings
+    REPEAT  still active repeat_interval_s after the last alert
+    CLEAR   the level stayed hysteresis_cm below the threshold (the rate
+            below rise_rate - rate_hysteresis) for holdoff_s
+
+DANGER supersedes WARNING: a reading that raises both only sends DANGER,
+and WARNING repeats are dropped while DANGER is active.
+
+AlertNotifier sends the events from a background thread, straight
+through a SIM800L session (falling back to the SMS outbox when the modem
+cannot be opened or a recipient fails), and measures the latency from
+the reading that detected the crossing to the modem accepting the SMS.
+"""
+
+import sys
+import time
+import queue
+import threading
+from datetime import datetime
+
+from .alert_broadcast import AlertBroadcaster, FAILED
+from .sms_outbox import SMSOutbox
+
+RAISE = "RAISE"
+REPEAT = "REPEAT"
+CLEAR = "CLEAR"
+
+# Rules in severity order; the first one in an event batch is sent first
+RULES = ("DANGER", "WARNING", "RISING")
+
+
+class AlertEngine:
+    """Latches threshold and rate alerts with hysteresis and hold-off timers."""
+
+    def __init__(self, warning_cm=200.0, danger_cm=250.0, hysteresis_cm=5.0, rise_rate=10.0,
+                 rate_hysteresis=5.0, min_confidence=0.5, confirm_readings=1, holdoff_s=600.0,
+                 repeat_interval_s=3600.0, notify_clear=True, device_id="VARUNA", state=None):
+        """
+        Args:
+            warning_cm: thresholds.warning_level_cm
+            danger_cm: thresholds.danger_level_cm
+            hysteresis_cm: Margin below a threshold before a level alert can clear
+            rise_rate: Rate of rise in cm/hour that raises RISING (0 disables it)
+            rate_hysteresis: Margin below rise_rate before RISING can clear
+            min_confidence: Rate confidence needed to act on the slope
+            confirm_readings: Consecutive readings over a threshold needed to
+                              raise (1 alerts on the first one)
+            holdoff_s: Seconds the clear condition must hold before an alert
+                       clears, so a level hovering at a threshold does not
+                       send an alert with every wave
+            repeat_interval_s: Resend an active alert this often (0 = never)
+            notify_clear: Send a message when an alert clears
+            device_id: Station name used in the messages
+            state: Saved state from state() (one-shot readings), or None
+        """
+        self.thresholds = {"WARNING": warning_cm, "DANGER": danger_cm}
+        self.hysteresis_cm = hysteresis_cm
+        self.rise_rate = rise_rate
+        self.rate_hysteresis = rate_hysteresis
+        self.min_confidence = min_confidence
+        self.confirm_readings = max(1, int(confirm_readings))
+        self.holdoff_s = holdoff_s
+        self.repeat_interval_s = repeat_interval_s
+        self.notify_clear = notify_clear
+        self.device_id = device_id
+
+        self.rules = {key: {"active": False, "pending": 0, "since": None, "last_alert": None,
+                            "clear_since": None} for key in RULES}
+        for key, saved in (state or {}).items():
+            if key in self.rules and isinstance(saved, dict):
+                self.rules[key].update((k, v) for k, v in saved.items() if k in self.rules[key])
+
+    def _step(self, key, raised, cleared, now):
+        """Advance one rule; returns RAISE, REPEAT, CLEAR or None."""
+        rule = self.rules[key]
+
+        if not rule["active"]:
+            if not raised:
+                rule["pending"] = 0
+                return None
+            rule["pending"] += 1
+            if rule["pending"] < self.confirm_readings:
+                return None
+            rule.update(active=True, pending=0, since=now, last_alert=now, clear_since=None)
+            return RAISE
+
+        if cleared:
+            if rule["clear_since"] is None:
+                rule["clear_since"] = now
+            if now - rule["clear_since"] >= self.holdoff_s:
+                rule.update(active=False, pending=0, clear_since=None)
+                return CLEAR
+            return None
+
+        rule["clear_since"] = None
+        if self.repeat_interval_s and now - rule["last_alert"] >= self.repeat_interval_s:
+            rule["last_alert"] = now
+            return REPEAT
+        return None
+
+    def _message(self, key, kind, level, rate, now):
+        taken = datetime.fromtimestamp(now).strftime("%d-%m %H:%M")
+        if kind == CLEAR:
+            if key == "RISING":
+                return f"{self.device_id} {taken}: rapid rise ended, level {level:.1f}cm, rate {rate:+.1f}cm/h"
+            return f"{self.device_id} {taken}: {key} cleared, level {level:.1f}cm"
+        prefix = "STILL " if kind == REPEAT else ""
+        if key == "RISING":
+            return (f"{self.device_id} {taken}: {prefix}RISING FAST {rate:+.1f}cm/h, "
+                    f"level {level:.1f}cm")
+        return (f"{self.device_id} {taken}: {prefix}{key} level {level:.1f}cm "
+                f"(limit {self.thresholds[key]:.0f}cm), rate {rate:+.1f}cm/h")
+
+    def evaluate(self, level, rate=None, confidence=0.0, status="OK", now=None):
+        """
+        Evaluate one reading.
+
+        Args:
+            level: Consensus level in cm, or None if no sensor was usable
+            rate: Rate of change in cm/hour, or None
+            confidence: Rate confidence (0-1); low-confidence slopes are ignored
+            status: Consensus status; FAULT readings change no rule
+            now: Reading time (defaults to time.time())
+
+        Returns:
+            List of event dictionaries (key, kind, message, level_cm,
+            rate_cm_per_hour, time, detected), most severe first; "detected"
+            is time.monotonic() for latency measurement
+        """
+        now = time.time() if now is None else now
+        if level is None or status == "FAULT":
+            return []
+
+        usable_rate = rate if rate is not None and confidence >= self.min_confidence else None
+        kinds = {}
+        for key in ("DANGER", "WARNING"):
+            threshold = self.thresholds[key]
+            kinds[key] = self._step(key, level >= threshold, level < threshold - self.hysteresis_cm, now)
+        if self.rise_rate > 0:
+            kinds["RISING"] = self._step(
+                "RISING",
+                usable_rate is not None and usable_rate >= self.rise_rate,
+                usable_rate is None or usable_rate < self.rise_rate - self.rate_hysteresis,
+                now
+            )
+
+        # DANGER supersedes WARNING
+        if kinds["DANGER"] in (RAISE, REPEAT) or (self.rules["DANGER"]["active"] and kinds["WARNING"] == REPEAT):
+            if kinds["WARNING"] in (RAISE, REPEAT):
+                kinds["WARNING"] = None
+
+        detected = time.monotonic()
+        events = []
+        for key in RULES:
+            kind = kinds.get(key)
+            if kind is None or (kind == CLEAR and not self.notify_clear):
+                continue
+            events.append({
+                "key": key,
+                "kind": kind,
+                "message": self._message(key, kind, level, rate or 0.0, now),
+                "level_cm": round(level, 2),
+                "rate_cm_per_hour": None if rate is None else round(rate, 2),
+                "time": now,
+                "detected": detected
+            })
+            print(f"Alerts: {key} {kind} (level {level:.1f} cm, rate {rate} cm/h)", file=sys.stderr)
+        return events
+
+    def active(self):
+        """Keys of the alerts currently latched, most severe first."""
+        return [key for key in RULES if self.rules[key]["active"]]
+
+    def state(self):
+        """Serializable rule state (restored for one-shot readings)."""
+        return {key: dict(rule) for key, rule in self.rules.items()}
+
+
+class AlertNotifier:
+    """Delivers engine events on a background thread."""
+
+    def __init__(self, recipients, open_modem=None, outbox=None, max_latency_s=30.0,
+                 idle_close_s=60.0, metrics=None):
+        """
+        Args:
+            recipients: Phone numbers, in notification order
+            open_modem: Callable returning an initialized SIM800L, or None
+                        when the modem is unavailable (None = outbox only)
+            outbox: SMSOutbox that takes CRITICAL messages when the modem
+                    cannot be used, or None; closed by close()
+            max_latency_s: Detection-to-sent time above which a warning is logged
+            idle_close_s: Keep the modem session open this long after the
+                          last alert, so escalations skip the modem start-up
+            metrics: metrics.Metrics that records the "alert_latency" stage, or None
+        """
+        self.recipients = list(recipients)
+        self.open_modem = open_modem
+        self.outbox = outbox
+        self.max_latency_s = max_latency_s
+        self.idle_close_s = idle_close_s
+        self.metrics = metrics
+
+        self.reports = []       # one per delivered event, most recent last
+        self._queue = queue.Queue()
+        self._modem = None
+        self._thread = threading.Thread(target=self._run, name="alert-notifier", daemon=True)
+        self._thread.start()
+
+    def submit(self, events):
+        """Queue events from AlertEngine.evaluate (returns at once)."""
+        for event in events:
+            self._queue.put(event)
+
+    def _queue_alert(self, phone, message):
+        return self.outbox.enqueue(phone, message, priority="CRITICAL") is not None
+
+    def _close_modem(self):
+        if self._modem is not None:
+            self._modem.close()
+            self._modem = None
+
+    def _deliver(self, event):
+        if self._modem is None and self.open_modem is not None:
+            try:
+                self._modem = self.open_modem()
+            except Exception as e:
+                print(f"Alerts: Cannot open modem - {e}", file=sys.stderr)
+
+        if self._modem is not None:
+            report = AlertBroadcaster(self._modem.send_sms).broadcast(self.recipients, event["message"], event["key"])
+            failed = [r["recipient"] for r in report["results"] if r["status"] == FAILED]
+            if report["failed"] and report["sent"] == 0:
+                # A session that cannot send anything is reopened next time
+                self._close_modem()
+        else:
+            report = None
+            failed = self.recipients
+
+        if failed and self.outbox is not None:
+            print(f"Alerts: Queueing {event['key']} for {len(failed)} recipient(s) in the outbox", file=sys.stderr)
+            queued = AlertBroadcaster(self._queue_alert, queued=True).broadcast(failed, event["message"], event["key"])
+            if report is None:
+                report = queued
+            else:
+                report["queued"] = queued["queued"]
+                report["failed"] = queued["failed"]
+
+        if report is None:
+            print(f"ERROR: {event['key']} alert not delivered (no modem and no outbox)", file=sys.stderr)
+            return
+
+        latency = time.monotonic() - event["detected"]
+        report.update(kind=event["kind"], latency_s=round(latency, 3))
+        self.reports.append(report)
+        del self.reports[:-100]
+        if self.metrics is not None:
+            self.metrics.observe("alert_latency", latency)
+
+        print(f"Alerts: {event['key']} {event['kind']} sent to {report['sent']}, queued for "
+              f"{report['queued']}, failed for {report['failed']} in {latency:.2f}s", file=sys.stderr)
+        if latency > self.max_latency_s:
+            print(f"WARNING: {event['key']} alert took {latency:.1f}s, limit is {self.max_latency_s:.0f}s",
+                  file=sys.stderr)
+
+    def _run(self):
+        while True:
+            try:
+                event = self._queue.get(timeout=self.idle_close_s if self._modem is not None else None)
+            except queue.Empty:
+                self._close_modem()
+                continue
+            if event is None:
+                break
+            try:
+                self._deliver(event)
+            except Exception as e:
+                print(f"ERROR: Alert delivery failed - {e}", file=sys.stderr)
+        self._close_modem()
+
+    def close(self, timeout=None):
+        """
+        Deliver what is queued, then stop.
+
+        Args:
+            timeout: Seconds to wait for pending deliveries (None = no limit)
+
+        Returns:
+            True if everything was delivered within the timeout
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+        done = not self._thread.is_alive()
+        if done and self.outbox is not None:
+            self.outbox.close()
+        return done
+
+
+def create_alert_engine(config, state=None):
+    """
+    Build an AlertEngine from config.json.
+
+    Args:
+        config: Parsed configuration dictionary ("alert_engine" and
+                "thresholds" sections)
+        state: Saved state from AlertEngine.state(), or None
+
+    Returns:
+        AlertEngine, or None if "alert_engine" is missing or disabled
+    """
+    section = config.get("alert_engine")
+    if not section or not section.get("enabled", False):
+        return None
+
+    thresholds = config.get("thresholds", {})
+    return AlertEngine(
+        warning_cm=thresholds.get("warning_level_cm", 200.0),
+        danger_cm=thresholds.get("danger_level_cm", 250.0),
+        hysteresis_cm=section.get("hysteresis_cm", 5.0),
+        rise_rate=section.get("rise_rate_cm_per_hour", 10.0),
+        rate_hysteresis=section.get("rate_hysteresis_cm_per_hour", 5.0),
+        min_confidence=section.get("min_rate_confidence", 0.5),
+        confirm_readings=section.get("confirm_readings", 1),
+        holdoff_s=section.get("holdoff_s", 600.0),
+        repeat_interval_s=section.get("repeat_interval_s", 3600.0),
+        notify_clear=section.get("notify_clear", True),
+        device_id=config.get("device_id", "VARUNA"),
+        state=state
+    )
+
+
+def create_notifier(config, base_dir, open_modem=None, metrics=None):
+    """
+    Build the AlertNotifier for alerts.recipients.
+
+    With "alert_engine.delivery": "direct" (default) alerts go straight
+    through open_modem and the outbox is the fallback; with "outbox" they
+    are only queued, for stations where sms_outbox_service.py holds the
+    modem.
+
+    Args:
+        config: Parsed configuration dictionary
+        base_dir: Directory the sms_outbox.path is relative to
+        open_modem: Callable returning an initialized SIM800L, or None
+        metrics: metrics.Metrics for the alert latency, or None
+
+    Returns:
+        AlertNotifier, or None if there are no recipients
+    """
+    section = config.get("alert_engine", {})
+    recipients = config.get("alerts", {}).get("recipients", [])
+    if not recipients:
+        print("WARNING: alert_engine is enabled but alerts.recipients is empty", file=sys.stderr)
+        return None
+
+    outbox_config = config.get("sms_outbox", {})
+    outbox = SMSOutbox(
+        base_dir / outbox_config.get("path", "data/sms_outbox.db"),
+        max_attempts=outbox_config.get("max_attempts", 5),
+        retry_base=outbox_config.get("retry_base_s", 10.0),
+        retry_max=outbox_config.get("retry_max_s", 600.0)
+    )
+    return AlertNotifier(
+        recipients,
+        open_modem=open_modem if section.get("delivery", "direct") == "direct" else None,
+        outbox=outbox,
+        max_latency_s=section.get("max_latency_s", 30.0),
+        idle_close_s=section.get("idle_close_s", 60.0),
+        metrics=metrics
+    )
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/alert_engine.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/binary_frames.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/binary_frames.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Length-prefixed binary frames for high-rate reader output.
+
+JSON lines stay the default reader output. In binary mode every frame is
+
+    [u32 body length][u8 schema version][u8 frame type][payload]
+
+little-endian, with two frame types:
+
+    META     UTF-8 JSON with device_id, location, calibration, the field
+             list and the status code table. Sent first in a session and
+             again only when one of them changes.
+    READING  [f64 unix timestamp][u16 field mask][values]
+             One value per set mask bit, in FIELDS order: f32 for numbers,
+             u8 status code for statuses. A field is sent when it moved
+             more than its epsilon since the value last sent (the same
+             thresholds Backend::parseJsonData applies before emitting a
+             change), so a receiver that keeps the last value of every
+             field always holds the sender's view.
+"""
+
+import json
+import struct
+from datetime import datetime
+
+SCHEMA_VERSION = 1
+
+FRAME_META = 1
+FRAME_READING = 2
+
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<BB")
+_READING = struct.Struct("<dH")
+_FLOAT32 = struct.Struct("<f")
+
+# (record path, struct format); bit n of the mask is FIELDS[n]
+FIELDS = [
+    (("mpu6050", "pitch_angle"), "f"),
+    (("mpu6050", "water_level_cm"), "f"),
+    (("mpu6050", "raw_angle"), "f"),
+    (("mpu6050", "status"), "B"),
+    (("dht22", "temperature"), "f"),
+    (("dht22", "humidity"), "f"),
+    (("dht22", "status"), "B"),
+    (("consensus_level_cm",), "f"),
+    (("rate_of_change_cm_per_hour",), "f"),
+    (("rate_confidence",), "f"),
+]
+
+# Change thresholds, keyed by the last element of the field path
+DEFAULT_EPSILON = {
+    "pitch_angle": 0.01,
+    "water_level_cm": 0.01,
+    "raw_angle": 0.01,
+    "temperature": 0.1,
+    "humidity": 0.1,
+    "consensus_level_cm": 0.01,
+    "rate_of_change_cm_per_hour": 0.01,
+    "rate_confidence": 0.001,
+}
+
+# Same codes as the reading history ring, plus DISABLED
+STATUS_CODES = {
+    "OK": 0,
+    "FAULT": 1,
+    "SIMULATED": 2,
+    "NOT_INSTALLED": 3,
+    "STALE": 4,
+    "DISABLED": 5,
+    "UNKNOWN": 255,
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Record keys carried by META instead of every reading
+STATIC_KEYS = ("device_id", "location", "calibration")
+
+
+def field_name(path):
+    """Dotted name of a field path, e.g. "mpu6050.pitch_angle"."""
+    return ".".join(path)
+
+
+def _lookup(record, path):
+    value = record
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _frame(frame_type, payload):
+    body = _HEADER.pack(SCHEMA_VERSION, frame_type) + payload
+    return _LENGTH.pack(len(body)) + body
+
+
+class FrameEncoder:
+    """Turns reader records into frames for one session (one receiver)."""
+
+    def __init__(self, epsilon=None):
+        """
+        Start a session: the first record sends META and every field.
+
+        Args:
+            epsilon: {field: threshold} overriding DEFAULT_EPSILON, keyed
+                     like DEFAULT_EPSILON (config.json "reader.epsilon")
+        """
+        thresholds = dict(DEFAULT_EPSILON)
+        thresholds.update(epsilon or {})
+        self.epsilon = [thresholds.get(path[-1], 0.0) for path, _ in FIELDS]
+
+        self._meta = None
+        self._sent = [None] * len(FIELDS)
+
+    def _changed(self, index, value):
+        previous = self._sent[index]
+        if previous is None:
+            return True
+        if FIELDS[index][1] == "B":
+            return value != previous
+        return abs(value - previous) > self.epsilon[index]
+
+    def encode(self, record):
+        """
+        Encode one record.
+
+        Args:
+            record: Output record dictionary (the JSON schema)
+
+        Returns:
+            Bytes holding a META frame if the static fields changed, then
+            one READING frame
+        """
+        frames = b""
+
+        meta = {key: record.get(key) for key in STATIC_KEYS}
+        if meta != self._meta:
+            self._meta = meta
+            frames += _frame(FRAME_META, json.dumps(dict(
+                meta,
+                fields=[field_name(path) for path, _ in FIELDS],
+                status_codes=STATUS_CODES
+            )).encode())
+
+        mask = 0
+        formats = "<"
+        values = []
+        for index, (path, fmt) in enumerate(FIELDS):
+            value = _lookup(record, path)
+            if value is None:
+                continue
+            if fmt == "B":
+                value = STATUS_CODES.get(value, STATUS_CODES["UNKNOWN"])
+            else:
+                # Compare in float32, the precision the receiver holds
+                value = _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+            if self._changed(index, value):
+                self._sent[index] = value
+                mask |= 1 << index
+                formats += fmt
+                values.append(value)
+
+        timestamp = datetime.fromisoformat(record["timestamp"]).timestamp()
+        payload = _READING.pack(timestamp, mask) + struct.pack(formats, *values)
+        return frames + _frame(FRAME_READING, payload)
+
+
+class FrameDecoder:
+    """Reassembles frames from a byte stream and keeps the receiver state."""
+
+    def __init__(self):
+        self.meta = None
+        self.values = {}       # dotted field name -> last value
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Add bytes from the stream.
+
+        Args:
+            data: Bytes read from the pipe or socket (any chunking)
+
+        Returns:
+            List of (frame type, content) for every complete frame: the
+            META dictionary, or a READING dictionary with "timestamp",
+            "changed" (field names in this frame) and "values" (the full
+            receiver state after applying it)
+
+        Raises:
+            ValueError: On an unknown schema version or frame type
+        """
+        self._buffer += data
+        frames = []
+
+        while len(self._buffer) >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(self._buffer)
+            end = _LENGTH.size + length
+            if len(self._buffer) < end:
+                break
+            body = bytes(self._buffer[_LENGTH.size:end])
+            del self._buffer[:end]
+            frames.append(self._decode(body))
+
+        return frames
+
+    def _decode(self, body):
+        version, frame_type = _HEADER.unpack_from(body)
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported frame schema version {version}")
+
+        payload = body[_HEADER.size:]
+        if frame_type == FRAME_META:
+            self.meta = json.loads(payload.decode())
+            return frame_type, self.meta
+
+        if frame_type != FRAME_READING:
+            raise ValueError(f"Unknown frame type {frame_type}")
+
+        timestamp, mask = _READING.unpack_from(payload)
+        offset = _READING.size
+        changed = []
+        for index, (path, fmt) in enumerate(FIELDS):
+            if not mask & (1 << index):
+                continue
+            (value,) = struct.unpack_from("<" + fmt, payload, offset)
+            offset += struct.calcsize("<" + fmt)
+            if fmt == "B":
+                value = STATUS_NAMES.get(value, "UNKNOWN")
+            name = field_name(path)
+            self.values[name] = value
+            changed.append(name)
+
+        return frame_type, {"timestamp": timestamp, "changed": changed, "values": dict(self.values)}
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/binary_frames.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/config_manager.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/config_manager.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Reading and safely updating config.json.
+
+Updates are written to a temporary file in the same directory and moved
+over the original with os.replace(), so a reader (or a power cut) sees
+either the old or the new file, never a half-written one.
+
+ConfigManager keeps the parsed configuration in memory and re-parses it
+only when the file's inode, mtime or size changes, so a long-running
+reader picks up a new calibration without restarting and without
+parsing the file for every reading.
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import tempfile
+import threading
+from datetime import datetime
+
+
+class ConfigError(ValueError):
+    """Configuration that fails validation."""
+
+
+def _number(section, key, errors, minimum=None, maximum=None, required=True):
+    value = section.get(key)
+    if value is None:
+        if required:
+            errors.append(f"missing {key}")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        errors.append(f"{key} must be a number")
+        return None
+    if minimum is not None and value < minimum:
+        errors.append(f"{key} must be >= {minimum}")
+    if maximum is not None and value > maximum:
+        errors.append(f"{key} must be <= {maximum}")
+    return value
+
+
+def validate_config(config):
+    """
+    Check the calibration and threshold sections.
+
+    Args:
+        config: Parsed configuration dictionary
+
+    Returns:
+        List of problems (empty if the configuration is usable)
+    """
+    errors = []
+
+    calibration = config.get("calibration")
+    if not isinstance(calibration, dict):
+        errors.append("calibration: section missing")
+    else:
+        calibration_errors = []
+        l_arm = _number(calibration, "L_arm", calibration_errors, minimum=0.01)
+        _number(calibration, "H_pivot", calibration_errors, minimum=0.0)
+        r_float = _number(calibration, "R_float", calibration_errors, minimum=0.0)
+        _number(calibration, "mpu6050_offset", calibration_errors, minimum=-90.0, maximum=90.0)
+        if l_arm is not None and r_float is not None and r_float >= l_arm:
+            calibration_errors.append("R_float must be smaller than L_arm")
+        gyro_bias = calibration.get("gyro_bias_dps")
+        if gyro_bias is not None and not (
+                isinstance(gyro_bias, list) and len(gyro_bias) == 3
+                and all(isinstance(b, (int, float)) and not isinstance(b, bool) and abs(b) <= 250.0
+                        for b in gyro_bias)):
+            calibration_errors.append("gyro_bias_dps must be 3 numbers within +/-250")
+        errors += [f"calibration: {e}" for e in calibration_errors]
+
+    thresholds = config.get("thresholds")
+    if thresholds is not None:
+        if not isinstance(thresholds, dict):
+            errors.append("thresholds: must be an object")
+        else:
+            threshold_errors = []
+            warning = _number(thresholds, "warning_level_cm", threshold_errors, minimum=0.0, required=False)
+            danger = _number(thresholds, "danger_level_cm", threshold_errors, minimum=0.0, required=False)
+            maximum = _number(thresholds, "max_level_cm", threshold_errors, minimum=0.0, required=False)
+            if warning is not None and danger is not None and warning >= danger:
+                threshold_errors.append("warning_level_cm must be below danger_level_cm")
+            if danger is not None and maximum is not None and danger > maximum:
+                threshold_errors.append("danger_level_cm must not exceed max_level_cm")
+            errors += [f"thresholds: {e}" for e in threshold_errors]
+
+    return errors
+
+
+def read_config(path):
+    """
+    Load a JSON configuration file.
+
+    Args:
+        path: config.json path
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def merge_config(base, updates):
+    """
+    Recursively merge updates into a copy of base.
+
+    Args:
+        base: Existing configuration dictionary
+        updates: Nested dictionary of values to set
+
+    Returns:
+        New merged dictionary
+    """
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def write_config_atomic(path, config):
+    """
+    Replace a configuration file atomically.
+
+    Args:
+        path: config.json path
+        config: Configuration dictionary to write
+    """
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+
+    # mkstemp creates the file 0600; keep the mode of the file it replaces
+    # so the UI and other service accounts can still read it
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.config-', suffix='.json', dir=directory)
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(config, f, indent=2)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def update_config(path, updates):
+    """
+    Merge updates into config.json and write it back atomically.
+
+    Args:
+        path: config.json path
+        updates: Nested dictionary of values to set
+
+    Returns:
+        The new configuration dictionary
+
+    Raises:
+        ConfigError: If the merged configuration fails validation (the
+                     file is left unchanged)
+    """
+    config = merge_config(read_config(path), updates)
+    errors = validate_config(config)
+    if errors:
+        raise ConfigError("; ".join(errors))
+    write_config_atomic(path, config)
+    return config
+
+
+def save_calibration(path, result):
+    """
+    Write an MPU6050 calibration result into config.json atomically.
+
+    Args:
+        path: config.json path
+        result: Dictionary from MPU6050.calibrate_static
+
+    Returns:
+        The new configuration dictionary
+
+    Raises:
+        ConfigError: If the result fails validation (the file is left unchanged)
+    """
+    return update_config(path, {"calibration": {
+        "mpu6050_offset": round(result["offset_deg"], 4),
+        "gyro_bias_dps": [round(b, 4) for b in result["gyro_bias_dps"]],
+        "calibrated_at": datetime.now().isoformat(timespec="seconds")
+    }})
+
+
+class ConfigManager:
+    """Cached config.json that reloads when the file changes."""
+
+    def __init__(self, path, defaults=None, check_interval=1.0):
+        """
+        Args:
+            path: config.json path
+            defaults: Configuration used while the file does not exist
+            check_interval: Minimum seconds between stat() checks
+        """
+        self.path = str(path)
+        self.defaults = defaults
+        self.check_interval = check_interval
+        self.version = 0
+
+        self._config = None
+        self._signature = None
+        self._last_check = float("-inf")
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        """(inode, mtime, size): changes on in-place edits and atomic renames."""
+        st = os.stat(self.path)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def on_change(self, callback):
+        """
+        Register callback(old_config, new_config), called after a reload.
+
+        Callbacks run on the thread that triggered the reload.
+        """
+        self._listeners.append(callback)
+
+    def get(self):
+        """
+        Current configuration, reloaded first if the file changed.
+
+        The returned dictionary is never modified in place: a reload swaps
+        in a new one, so a caller holding it sees one consistent version.
+        """
+        self.reload_if_changed()
+        return self._config
+
+    def reload_if_changed(self, force=False):
+        """
+        Re-parse the file if its signature changed.
+
+        An invalid file is reported and ignored; the previous configuration
+        stays active until the file is fixed.
+
+        Args:
+            force: Skip the check_interval rate limit
+
+        Returns:
+            True if a new configuration was applied
+
+        Raises:
+            ConfigError: If there is no usable configuration at all
+        """
+        now = time.monotonic()
+        if not force and self._config is not None and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            try:
+                signature = self._file_signature()
+            except FileNotFoundError:
+                if self._config is None:
+                    if self.defaults is None:
+                        raise ConfigError(f"{self.path} not found")
+                    print("WARNING: Config file not found, using defaults", file=sys.stderr)
+                    self._config = self.defaults
+                return False
+
+            if signature == self._signature:
+                return False
+            self._signature = signature
+
+            try:
+                config = read_config(self.path)
+                errors = validate_config(config)
+            except (OSError, ValueError) as e:
+                errors = [str(e)]
+
+            if errors:
+                message = "; ".join(errors)
+                if self._config is None:
+                    raise ConfigError(message)
+                print(f"WARNING: Ignoring invalid config.json (keeping version {self.version}) - {message}",
+                      file=sys.stderr)
+                return False
+
+            old, self._config = self._config, config
+            self.version += 1
+
+        if old is not None:
+            print(f"Config: Reloaded {self.path} (version {self.version})", file=sys.stderr)
+            for callback in self._listeners:
+                callback(old, config)
+        return True
+
+    def update(self, updates):
+        """
+        Merge updates into the file atomically and apply them at once.
+
+        Args:
+            updates: Nested dictionary of values to set
+
+        Returns:
+            The new configuration dictionary
+        """
+        update_config(self.path, updates)
+        self.reload_if_changed(force=True)
+        return self._config
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/config_manager.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/consensus.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/consensus.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Robust water level consensus across redundant level sensors.
+
+Every source (MPU6050 float arm, ultrasonic, pressure, ...) reports a
+level, a status and optionally its own noise estimate. Unhealthy sources
+are skipped; the rest are combined as follows:
+
+    1. m     = weighted median of the levels
+    2. MAD   = weighted median of |level - m|
+    3. A source is an outlier if |level - m| > k * max(1.4826 * MAD, sigma)
+    4. Level = inverse-variance weighted mean of the remaining sources
+
+Median weights are votes (1, or 0.5 for a STALE source), not noise: a
+quiet sensor is not a more trustworthy one, and a sensor holding most of
+the weight could never be outvoted when it fails. Noise only weights the
+final mean of the sources that agree.
+
+A single broken float arm among three or more sensors moves the median
+by at most one rank, so it is rejected instead of dragging the published
+level. With two sources there is no majority; a disagreement is reported
+but nothing is rejected.
+
+Per-source state is a few floats (an exponentially weighted residual
+variance that adapts the weights), so memory stays constant per reading.
+"""
+
+import math
+
+# Sources with these statuses take part in the consensus; STALE ones
+# (last good value from a sensor that missed its deadline) get half a
+# vote and doubled noise
+USABLE_STATUSES = ("OK", "SIMULATED", "STALE")
+STALE_VOTE = 0.5
+STALE_NOISE_FACTOR = 2.0
+
+# 1.4826 * MAD estimates the standard deviation of normal data
+MAD_TO_SIGMA = 1.4826
+
+
+def weighted_median(pairs):
+    """
+    Weighted median of (value, weight) pairs.
+
+    When the cumulative weight reaches exactly half between two values
+    their midpoint is returned, so two equal-weight values give their mean.
+
+    Args:
+        pairs: List of (value, weight) with positive weights
+
+    Returns:
+        Weighted median value
+    """
+    ordered = sorted(pairs)
+    half = sum(weight for _, weight in ordered) / 2.0
+
+    cumulative = 0.0
+    for index, (value, weight) in enumerate(ordered):
+        cumulative += weight
+        if math.isclose(cumulative, half) and index + 1 < len(ordered):
+            return (value + ordered[index + 1][0]) / 2.0
+        if cumulative > half:
+            return value
+    return ordered[-1][0]
+
+
+class LevelConsensus:
+    """Combines level sources into one robust consensus level."""
+
+    def __init__(self, noise_cm=None, default_noise_cm=1.0, reject_k=3.5, adapt=0.05):
+        """
+        Initialize the consensus stage.
+
+        Args:
+            noise_cm: {source name: typical noise in cm} used until a
+                      source reports its own "noise_cm"
+            default_noise_cm: Noise for sources not listed in noise_cm
+            reject_k: Outlier threshold in robust standard deviations
+            adapt: Weight of each inlier residual in the running noise
+                   estimate (0 disables adaptation)
+        """
+        self.noise_cm = dict(noise_cm or {})
+        self.default_noise_cm = default_noise_cm
+        self.reject_k = reject_k
+        self.adapt = adapt
+
+        self._variance = {}     # source -> running residual variance (cm^2)
+        self.last_level = None
+
+    def _sigma(self, name, data):
+        configured = data.get("noise_cm") or self.noise_cm.get(name, self.default_noise_cm)
+        # Adapted noise never drops below the configured floor
+        sigma = max(configured, math.sqrt(self._variance.get(name, 0.0)))
+        if data.get("status") == "STALE":
+            sigma *= STALE_NOISE_FACTOR
+        return sigma
+
+    def update(self, sources):
+        """
+        Compute the consensus for one reading.
+
+        Args:
+            sources: {name: data} where data has "water_level_cm" and
+                     "status", and optionally "noise_cm"
+
+        Returns:
+            Dictionary with "level_cm" (None if no source is usable),
+            "status" (OK, DEGRADED or FAULT), "used", "rejected"
+            ({name: reason}), "spread_cm" and "disagreement"
+        """
+        rejected = {}
+        candidates = []     # (name, level, sigma, vote)
+
+        for name, data in sources.items():
+            status = data.get("status", "UNKNOWN")
+            level = data.get("water_level_cm")
+            if status not in USABLE_STATUSES or level is None:
+                rejected[name] = status
+                continue
+            vote = STALE_VOTE if status == "STALE" else 1.0
+            candidates.append((name, float(level), self._sigma(name, data), vote))
+
+        if not candidates:
+            return {
+                "level_cm": None,
+                "status": "FAULT",
+                "used": [],
+                "rejected": rejected,
+                "spread_cm": None,
+                "disagreement": False
+            }
+
+        median = weighted_median([(level, vote) for _, level, _, vote in candidates])
+        mad = weighted_median([(abs(level - median), vote) for _, level, _, vote in candidates])
+        spread = MAD_TO_SIGMA * mad
+
+        inliers = []
+        for name, level, sigma, _ in candidates:
+            if len(candidates) >= 3 and abs(level - median) > self.reject_k * max(spread, sigma):
+                rejected[name] = "OUTLIER"
+            else:
+                inliers.append((name, level, sigma))
+
+        total = sum(1.0 / (sigma * sigma) for _, _, sigma in inliers)
+        level = sum(level / (sigma * sigma) for _, level, sigma in inliers) / total
+
+        # Two sources: flag a disagreement beyond their combined noise
+        disagreement = False
+        if len(inliers) == 2:
+            (_, a, sigma_a), (_, b, sigma_b) = inliers
+            disagreement = abs(a - b) > self.reject_k * math.hypot(sigma_a, sigma_b)
+
+        if self.adapt > 0:
+            for name, value, _ in inliers:
+                residual = (value - level) ** 2
+                previous = self._variance.get(name, residual)
+                self._variance[name] = (1.0 - self.adapt) * previous + self.adapt * residual
+
+        self.last_level = level
+        return {
+            "level_cm": level,
+            "status": "DEGRADED" if rejected or disagreement else "OK",
+            "used": [name for name, _, _ in inliers],
+            "rejected": rejected,
+            "spread_cm": spread,
+            "disagreement": disagreement
+        }
+
+
+def create_consensus(config=None):
+    """
+    Build a LevelConsensus from the "consensus" section of config.json.
+
+    Args:
+        config: Section dictionary, e.g. {"reject_k": 3.5, "noise_cm":
+                {"mpu6050": 0.5, "ultrasonic": 1.0}}, or None for defaults
+
+    Returns:
+        LevelConsensus instance
+    """
+    config = config or {}
+    return LevelConsensus(
+        noise_cm=config.get("noise_cm"),
+        default_noise_cm=config.get("default_noise_cm", 1.0),
+        reject_k=config.get("reject_k", 3.5),
+        adapt=config.get("adapt", 0.05)
+    )
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/consensus.py
+═══════════════════════════════════════════════════════════════
+"""
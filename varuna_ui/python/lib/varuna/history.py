@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/history.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/history.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+On-device water level history in a fixed-size memory-mapped ring file.
+
+File layout:
+
+    [64-byte header][capacity x 32-byte records]
+
+The file is allocated once at its final size, so SD card usage never
+grows. Appends overwrite the oldest record in O(1) and the header keeps
+the total number of records ever written, which survives restarts.
+"""
+
+import os
+import sys
+import mmap
+import struct
+from datetime import datetime
+
+import numpy as np
+
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),     # Unix time, seconds
+    ("pitch", "<f4"),         # Calibrated pitch angle, degrees
+    ("level", "<f4"),         # Water level, cm
+    ("temperature", "<f4"),   # °C
+    ("humidity", "<f4"),      # %RH
+    ("status", "u1"),         # STATUS_CODES value
+    ("reserved", "u1", 7),
+])
+
+STATUS_CODES = {
+    "OK": 0,
+    "FAULT": 1,
+    "SIMULATED": 2,
+    "NOT_INSTALLED": 3,
+    "STALE": 4,
+    "UNKNOWN": 255,
+}
+
+# magic, version, record size, capacity, records written
+HEADER_FORMAT = struct.Struct("<8sIIQQ")
+HEADER_SIZE = 64
+MAGIC = b"VARUNAHS"
+VERSION = 1
+WRITTEN_OFFSET = 24
+
+
+def reading_row(output):
+    """
+    History row for a read_sensors.py output record.
+
+    Args:
+        output: Record dictionary with mpu6050, dht22 and timestamp fields
+
+    Returns:
+        (timestamp, pitch, level, temperature, humidity, status) tuple
+    """
+    mpu = output.get("mpu6050", {})
+    dht = output.get("dht22", {})
+
+    return (
+        datetime.fromisoformat(output["timestamp"]).timestamp(),
+        mpu.get("pitch_angle", 0.0),
+        output.get("consensus_level_cm", mpu.get("water_level_cm", 0.0)),
+        dht.get("temperature", 0.0),
+        dht.get("humidity", 0.0),
+        mpu.get("status", "UNKNOWN")
+    )
+
+
+class ReadingHistory:
+    """Fixed-capacity ring of readings backed by a memory-mapped file."""
+
+    def __init__(self, path, capacity=525600, sync_every=10):
+        """
+        Open the ring file, creating it at full size if it does not exist.
+
+        Args:
+            path: Ring file path
+            capacity: Number of records for a new file (default: one year at
+                      one per minute); an existing file keeps its own capacity
+            sync_every: msync the mapping after this many appends (0 = only on close)
+        """
+        self.path = str(path)
+        self.sync_every = sync_every
+        self._unsynced = 0
+
+        size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        exists = os.path.exists(self.path)
+
+        if not exists:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            if not exists or os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER_FORMAT.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, capacity, 0), 0)
+                print(f"History: Created {self.path} ({capacity} records, {size} bytes)", file=sys.stderr)
+
+            self._mm = mmap.mmap(self._fd, 0)
+            magic, version, record_size, file_capacity, _ = HEADER_FORMAT.unpack_from(self._mm, 0)
+
+            if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+                raise ValueError(f"{self.path} is not a version {VERSION} history file")
+            if len(self._mm) != HEADER_SIZE + file_capacity * record_size:
+                raise ValueError(f"{self.path} is truncated")
+        except Exception:
+            os.close(self._fd)
+            raise
+
+        self.capacity = file_capacity
+        self.records = np.ndarray((self.capacity,), dtype=RECORD_DTYPE, buffer=self._mm, offset=HEADER_SIZE)
+
+    @property
+    def written(self):
+        """Total number of records appended since the file was created."""
+        return struct.unpack_from("<Q", self._mm, WRITTEN_OFFSET)[0]
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, timestamp, pitch, level, temperature, humidity, status="OK"):
+        """
+        Append one record, overwriting the oldest when the ring is full.
+
+        Args:
+            timestamp: Unix time in seconds
+            pitch: Pitch angle in degrees
+            level: Water level in cm
+            temperature: Temperature in °C
+            humidity: Relative humidity in %
+            status: Status string (see STATUS_CODES) or code
+        """
+        written = self.written
+        if isinstance(status, str):
+            status = STATUS_CODES.get(status, STATUS_CODES["UNKNOWN"])
+
+        # Record first, then the counter that publishes it
+        self.records[written % self.capacity] = (timestamp, pitch, level, temperature, humidity, status, 0)
+        struct.pack_into("<Q", self._mm, WRITTEN_OFFSET, written + 1)
+
+        self._unsynced += 1
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.flush()
+
+    def append_reading(self, output):
+        """
+        Append a read_sensors.py output record.
+
+        Args:
+            output: Record dictionary with mpu6050, dht22 and timestamp fields
+        """
+        self.append(*reading_row(output))
+
+    def extend(self, rows):
+        """
+        Append many records with one copy per ring segment and one counter update.
+
+        Args:
+            rows: Sequence of (timestamp, pitch, level, temperature,
+                  humidity, status) tuples, oldest first (see reading_row)
+        """
+        if not rows:
+            return
+
+        batch = np.zeros(len(rows), dtype=RECORD_DTYPE)
+        timestamps, pitches, levels, temperatures, humidities, statuses = zip(*rows)
+        batch["timestamp"] = timestamps
+        batch["pitch"] = pitches
+        batch["level"] = levels
+        batch["temperature"] = temperatures
+        batch["humidity"] = humidities
+        batch["status"] = [STATUS_CODES.get(s, STATUS_CODES["UNKNOWN"]) if isinstance(s, str) else s
+                           for s in statuses]
+
+        # Only the newest capacity records can survive the batch
+        written = self.written + len(batch) - min(len(batch), self.capacity)
+        batch = batch[-self.capacity:]
+
+        first = written % self.capacity
+        head = min(len(batch), self.capacity - first)
+        self.records[first:first + head] = batch[:head]
+        self.records[:len(batch) - head] = batch[head:]
+        struct.pack_into("<Q", self._mm, WRITTEN_OFFSET, written + len(batch))
+
+        self._unsynced += len(batch)
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.flush()
+
+    def segments(self, start=0, stop=None):
+        """
+        Zero-copy views of a chronological range.
+
+        Indices count from the oldest record still in the ring. A range that
+        crosses the physical end of the file comes back as two views.
+
+        Args:
+            start: First record (0 = oldest; negative counts from the newest)
+            stop: End record, exclusive (None = newest)
+
+        Returns:
+            List of one or two structured NumPy views, oldest first
+        """
+        count = len(self)
+        start, stop, _ = slice(start, stop).indices(count)
+        if stop <= start:
+            return []
+
+        oldest = (self.written - count) % self.capacity
+        first = (oldest + start) % self.capacity
+        last = (oldest + stop - 1) % self.capacity
+
+        if first <= last:
+            return [self.records[first:last + 1]]
+        return [self.records[first:], self.records[:last + 1]]
+
+    def range(self, start=0, stop=None):
+        """
+        Chronological range as one array: a view, or a copy if it wraps.
+
+        Args:
+            start: First record (0 = oldest; negative counts from the newest)
+            stop: End record, exclusive (None = newest)
+
+        Returns:
+            Structured NumPy array of records
+        """
+        parts = self.segments(start, stop)
+        if not parts:
+            return self.records[:0]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def latest(self, n):
+        """Return the newest n records, oldest first."""
+        return self.range(-n) if n > 0 else self.records[:0]
+
+    def since(self, timestamp):
+        """
+        Return every record at or after a Unix timestamp, oldest first.
+
+        Args:
+            timestamp: Unix time in seconds
+
+        Returns:
+            Structured NumPy array of records
+        """
+        offset = 0
+        for part in self.segments():
+            index = int(np.searchsorted(part["timestamp"], timestamp, side="left"))
+            if index < len(part):
+                return self.range(offset + index)
+            offset += len(part)
+        return self.records[:0]
+
+    def flush(self):
+        """Write dirty pages of the mapping to the card."""
+        self._mm.flush()
+        self._unsynced = 0
+
+    def close(self):
+        """Sync and unmap the ring file."""
+        if self._mm is None:
+            return
+
+        self.flush()
+        self.records = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Caller still holds views; the mapping is released with them
+            pass
+        os.close(self._fd)
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/history.py
+═══════════════════════════════════════════════════════════════
+"""
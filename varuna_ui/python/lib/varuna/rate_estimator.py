@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/rate_estimator.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/rate_estimator.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Streaming rate-of-change estimate for the water level.
+
+A least-squares line is fitted to every reading in the last N minutes.
+The fit is kept as running sums that are updated when a reading enters
+or leaves the window, so each update costs O(1) instead of a refit.
+"""
+
+import math
+from collections import deque
+
+
+class SlidingWindowRate:
+    """O(1) sliding-window linear regression of level (cm) against time."""
+
+    def __init__(self, window_minutes=15.0, min_samples=3, noise_reference=1.0):
+        """
+        Args:
+            window_minutes: Regression window length
+            min_samples: Readings needed before a slope is reported
+            noise_reference: Slope standard error (cm/hour) that maps to
+                             confidence 0.5; smaller errors approach 1.0
+        """
+        self.window = window_minutes * 60.0
+        self.min_samples = max(3, min_samples)
+        self.noise_reference = noise_reference
+        self.points = deque()
+        self._anchor = None
+        self._clear_sums()
+
+    def _clear_sums(self):
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    def _rebase(self, anchor_t, anchor_y):
+        """
+        Recompute the sums relative to a new origin.
+
+        Coordinates are stored relative to an anchor so the sums stay small.
+        Rebasing is O(window) but only happens once the newest reading is
+        several windows past the anchor, which keeps updates amortized O(1)
+        and also clears accumulated add/subtract rounding error.
+        """
+        self._anchor = (anchor_t, anchor_y)
+        self._clear_sums()
+        for t, y in self.points:
+            self._accumulate(t, y, 1)
+
+    def _accumulate(self, t, y, sign):
+        anchor_t, anchor_y = self._anchor
+        x = (t - anchor_t) / 3600.0   # hours
+        y = y - anchor_y              # cm
+        self.n += sign
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.sxy += sign * x * y
+        self.syy += sign * y * y
+
+    def reset(self):
+        """Drop every reading."""
+        self.points.clear()
+        self._anchor = None
+        self._clear_sums()
+
+    def add(self, timestamp, level_cm):
+        """
+        Add a reading and evict readings that fell out of the window.
+
+        Args:
+            timestamp: Unix time in seconds
+            level_cm: Water level in cm
+        """
+        if self.points and timestamp <= self.points[-1][0]:
+            # Clock stepped backwards (NTP/GSM time sync): start over
+            if timestamp < self.points[-1][0]:
+                self.reset()
+            else:
+                return
+
+        if self._anchor is None:
+            self._anchor = (timestamp, level_cm)
+
+        self.points.append((timestamp, level_cm))
+        self._accumulate(timestamp, level_cm, 1)
+
+        while self.points[0][0] < timestamp - self.window:
+            self._accumulate(*self.points.popleft(), -1)
+
+        if timestamp - self._anchor[0] > 4 * self.window:
+            self._rebase(*self.points[0])
+
+    def estimate(self):
+        """
+        Current slope and its confidence.
+
+        Returns:
+            Tuple of (slope in cm/hour, confidence 0-1, slope standard error
+            in cm/hour or None)
+        """
+        n = self.n
+        if n < self.min_samples:
+            return 0.0, 0.0, None
+
+        sxx = self.sxx - self.sx * self.sx / n
+        if sxx <= 0.0:
+            return 0.0, 0.0, None
+
+        sxy = self.sxy - self.sx * self.sy / n
+        syy = self.syy - self.sy * self.sy / n
+        slope = sxy / sxx
+
+        residual = max(0.0, syy - slope * sxy) / (n - 2)
+        std_error = math.sqrt(residual / sxx)
+        confidence = 1.0 / (1.0 + std_error / self.noise_reference)
+
+        return slope, confidence, std_error
+
+
+def create_estimator(estimator_config=None):
+    """
+    Build an estimator from the "rate_estimator" section of config.json.
+
+    Args:
+        estimator_config: Dictionary with window_minutes, min_samples and
+                          noise_reference_cm_per_hour
+
+    Returns:
+        SlidingWindowRate instance
+    """
+    estimator_config = estimator_config or {}
+    return SlidingWindowRate(
+        window_minutes=estimator_config.get("window_minutes", 15.0),
+        min_samples=estimator_config.get("min_samples", 3),
+        noise_reference=estimator_config.get("noise_reference_cm_per_hour", 1.0)
+    )
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/rate_estimator.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/scheduler.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/lib/varuna/scheduler.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Mode-adaptive sampling schedule.
+
+The operating mode is chosen from the consensus level relative to the
+warning/danger thresholds, the rate of change and, when a battery gauge
+is available, the battery charge. The modes and their order follow
+Backend::updateOperatingMode:
+
+    CRITICAL   level >= danger
+    FLOOD      level >= warning, or |rate| >= flood_rate (confident slope)
+    LOW_POWER  battery below low_battery_percent (only when nothing above applies)
+    NORMAL     otherwise
+
+Each mode has a profile: reporting interval, samples per reading and
+MPU6050 sample rate. Escalation is immediate. Leaving a mode needs the
+level hysteresis_cm below its threshold (and the rate below half of
+flood_rate) for min_hold_s, so a level hovering at a threshold does not
+flap between profiles.
+"""
+
+import os
+import sys
+import time
+import json
+
+from .config_manager import write_config_atomic
+
+MODES = ("NORMAL", "FLOOD", "CRITICAL", "LOW_POWER")
+
+# Higher rank wins; LOW_POWER only replaces NORMAL
+_RANK = {"LOW_POWER": 0, "NORMAL": 1, "FLOOD": 2, "CRITICAL": 3}
+
+DEFAULT_PROFILES = {
+    "NORMAL": {"interval_ms": 60000, "num_samples": 10, "sample_rate_hz": 50},
+    "FLOOD": {"interval_ms": 10000, "num_samples": 25, "sample_rate_hz": 50},
+    "CRITICAL": {"interval_ms": 5000, "num_samples": 50, "sample_rate_hz": 100},
+    "LOW_POWER": {"interval_ms": 300000, "num_samples": 5, "sample_rate_hz": 25},
+}
+
+
+def read_battery_percent(path):
+    """
+    Read a battery gauge (e.g. /sys/class/power_supply/<name>/capacity).
+
+    Args:
+        path: File holding the charge in percent, or None
+
+    Returns:
+        Charge in percent, or None if there is no readable gauge
+    """
+    if not path:
+        return None
+    try:
+        with open(path, 'r') as f:
+            return float(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+class AdaptiveScheduler:
+    """Picks the sampling profile for the next reading."""
+
+    def __init__(self, warning_cm=200.0, danger_cm=250.0, flood_rate=5.0, hysteresis_cm=5.0,
+                 min_hold_s=300.0, min_confidence=0.5, low_battery_percent=20.0,
+                 battery_hysteresis=5.0, profiles=None, mode="NORMAL", since=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            warning_cm: thresholds.warning_level_cm
+            danger_cm: thresholds.danger_level_cm
+            flood_rate: |Rate| in cm/hour that alone means FLOOD
+            hysteresis_cm: Margin below a threshold before a mode is left
+            min_hold_s: Minimum time in a mode before stepping down
+            min_confidence: Rate confidence needed to act on the slope
+            low_battery_percent: Charge below which NORMAL becomes LOW_POWER
+            battery_hysteresis: Charge above the limit needed to leave LOW_POWER
+            profiles: {mode: profile} overriding DEFAULT_PROFILES per key
+            mode: Starting mode (restored state for one-shot readings)
+            since: Last time the conditions of the starting mode held
+                   (defaults to now)
+        """
+        self.warning_cm = warning_cm
+        self.danger_cm = danger_cm
+        self.flood_rate = flood_rate
+        self.hysteresis_cm = hysteresis_cm
+        self.min_hold_s = min_hold_s
+        self.min_confidence = min_confidence
+        self.low_battery_percent = low_battery_percent
+        self.battery_hysteresis = battery_hysteresis
+
+        self.profiles = {}
+        for name in MODES:
+            profile = dict(DEFAULT_PROFILES[name])
+            profile.update((profiles or {}).get(name, {}))
+            self.profiles[name] = profile
+
+        self.mode = mode if mode in MODES else "NORMAL"
+        self.since = time.time() if since is None else since
+
+    @property
+    def profile(self):
+        """Profile of the current mode."""
+        return self.profiles[self.mode]
+
+    def _target(self, level, rate, battery):
+        """Mode for this reading before hysteresis is applied."""
+        current = self.mode
+
+        # Thresholds are lowered by the hysteresis margin while at or above them
+        danger = self.danger_cm - (self.hysteresis_cm if current == "CRITICAL" else 0.0)
+        warning = self.warning_cm - (self.hysteresis_cm if _RANK[current] >= _RANK["FLOOD"] else 0.0)
+        flood_rate = self.flood_rate * (0.5 if _RANK[current] >= _RANK["FLOOD"] else 1.0)
+
+        if level is not None and level >= danger:
+            return "CRITICAL"
+        if (level is not None and level >= warning) or (rate is not None and abs(rate) >= flood_rate):
+            return "FLOOD"
+
+        if battery is not None:
+            limit = self.low_battery_percent
+            if current == "LOW_POWER":
+                limit += self.battery_hysteresis
+            if battery < limit:
+                return "LOW_POWER"
+        return "NORMAL"
+
+    def update(self, level, rate=None, confidence=1.0, battery=None, now=None):
+        """
+        Feed one reading and choose the mode for the next one.
+
+        Args:
+            level: Consensus level in cm, or None if no sensor was usable
+            rate: Rate of change in cm/hour, or None
+            confidence: Rate confidence (0-1); low-confidence slopes are ignored
+            battery: Battery charge in percent, or None without a gauge
+            now: Current time (defaults to time.time())
+
+        Returns:
+            True if the mode changed (never for a reading without a level)
+        """
+        now = time.time() if now is None else now
+        if level is None:
+            # A sensor fault is not a receding flood: keep the mode, and do
+            # not count blind time towards leaving FLOOD/CRITICAL
+            if _RANK[self.mode] >= _RANK["FLOOD"]:
+                self.since = now
+            return False
+
+        if rate is not None and confidence < self.min_confidence:
+            rate = None
+
+        target = self._target(level, rate, battery)
+        elevated = _RANK[self.mode] >= _RANK["FLOOD"]
+        if target == self.mode:
+            if elevated:
+                self.since = now
+            return False
+
+        # Step up at once (a flood, or a battery that is running out);
+        # leave FLOOD/CRITICAL only once its conditions have been clear
+        # for min_hold_s
+        if elevated and _RANK[target] < _RANK[self.mode] and now - self.since < self.min_hold_s:
+            return False
+
+        print(f"Scheduler: {self.mode} -> {target} (level {level} cm, rate {rate} cm/h, battery {battery})",
+              file=sys.stderr)
+        self.mode = target
+        self.since = now
+        return True
+
+    def state(self):
+        """Serializable state (restored by create_scheduler for one-shot readings)."""
+        return {"mode": self.mode, "since": self.since}
+
+
+def load_state(path):
+    """Scheduler state saved by a previous reading, or {} if there is none."""
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    """Atomically write the scheduler state."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_config_atomic(path, state)
+
+
+def create_scheduler(config, state=None):
+    """
+    Build an AdaptiveScheduler from config.json.
+
+    Args:
+        config: Parsed configuration dictionary ("scheduler" and
+                "thresholds" sections)
+        state: Saved state from load_state, or None
+
+    Returns:
+        AdaptiveScheduler, or None if "scheduler" is missing or disabled
+    """
+    section = config.get("scheduler")
+    if not section or not section.get("enabled", True):
+        return None
+
+    thresholds = config.get("thresholds", {})
+    state = state or {}
+    return AdaptiveScheduler(
+        warning_cm=thresholds.get("warning_level_cm", 200.0),
+        danger_cm=thresholds.get("danger_level_cm", 250.0),
+        flood_rate=section.get("flood_rate_cm_per_hour", 5.0),
+        hysteresis_cm=section.get("hysteresis_cm", 5.0),
+        min_hold_s=section.get("min_hold_s", 300.0),
+        min_confidence=section.get("min_rate_confidence", 0.5),
+        low_battery_percent=section.get("low_battery_percent", 20.0),
+        battery_hysteresis=section.get("battery_hysteresis_percent", 5.0),
+        profiles=section.get("profiles"),
+        mode=state.get("mode", "NORMAL"),
+        since=state.get("since")
+    )
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/scheduler.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/sms_commands.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/lib/varuna/sms_commands.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Remote commands by SMS.
+
+Field officers text a keyword (STATUS, INTERVAL 30, CALIBRATE, ...) to
+the station. The whole unread inbox is fetched with one AT+CMGL, each
+message from an authorized sender is mapped to a handler, replies are
+handed to a reply callback, and processed messages are deleted in
+batched AT+CMGD commands.
+"""
+
+import sys
+
+
+def normalize_number(number):
+    """Compare phone numbers by their last 10 digits (ignores +91, 0, spaces)."""
+    digits = ''.join(c for c in number if c.isdigit())
+    return digits[-10:]
+
+
+class CommandDispatcher:
+    """Maps SMS keywords from authorized senders to handlers."""
+
+    def __init__(self, authorized_senders):
+        """
+        Args:
+            authorized_senders: Phone numbers allowed to send commands
+        """
+        self.authorized = {normalize_number(number) for number in authorized_senders}
+        self.handlers = {}
+        self.register("HELP", self._help, "HELP")
+
+    def register(self, keyword, handler, usage=None):
+        """
+        Register a command.
+
+        Args:
+            keyword: First word of the SMS (case-insensitive)
+            handler: Called as handler(args, sender); returns the reply text.
+                     Raise ValueError for bad arguments.
+            usage: Short usage string for HELP
+        """
+        self.handlers[keyword.upper()] = (handler, usage or keyword.upper())
+
+    def _help(self, args, sender):
+        return "Commands: " + ", ".join(usage for _, usage in self.handlers.values())
+
+    def is_authorized(self, sender):
+        return normalize_number(sender) in self.authorized
+
+    def dispatch(self, sender, text):
+        """
+        Run the command in one message.
+
+        Args:
+            sender: Sender phone number
+            text: Message text
+
+        Returns:
+            Reply text, or None if the sender is not authorized
+        """
+        if not self.is_authorized(sender):
+            print(f"Commands: Ignoring message from unauthorized sender {sender}", file=sys.stderr)
+            return None
+
+        words = text.strip().split()
+        if not words:
+            return None
+
+        keyword, args = words[0].upper(), words[1:]
+        if keyword not in self.handlers:
+            return f"Unknown command {keyword}. Send HELP for the list."
+
+        handler, usage = self.handlers[keyword]
+        print(f"Commands: {keyword} {' '.join(args)} from {sender}", file=sys.stderr)
+
+        try:
+            return handler(args, sender)
+        except ValueError as e:
+            return f"{keyword} failed: {e}. Usage: {usage}"
+        except Exception as e:
+            print(f"Commands: {keyword} handler error - {e}", file=sys.stderr)
+            return f"{keyword} failed: internal error"
+
+    def process_inbox(self, modem, reply):
+        """
+        Fetch, dispatch and delete every unread message.
+
+        Args:
+            modem: SIM800L instance
+            reply: Called as reply(sender, text) for each reply
+
+        Returns:
+            Number of messages processed
+        """
+        messages = modem.list_sms('REC UNREAD')
+        if not messages:
+            return 0
+
+        for message in messages:
+            response = self.dispatch(message['sender'], message['message'])
+            if response:
+                reply(message['sender'], response)
+
+        modem.delete_messages([message['index'] for message in messages])
+        return len(messages)
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/sms_commands.py
+═══════════════════════════════════════════════════════════════
+"""
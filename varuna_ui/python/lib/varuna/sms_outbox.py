@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/sms_outbox.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/lib/varuna/sms_outbox.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Durable SMS outbox.
+
+Producers (send_sms_command.py, alert logic) only insert rows into an
+SQLite queue and return. A single long-lived OutboxService owns the
+modem session, sends the most urgent due message first, paces sends to
+the modem's throughput and retries failures with exponential backoff.
+While no SMS is due it also forwards telemetry batches (varuna.uplink).
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+
+
+PRIORITIES = {
+    "CRITICAL": 0,
+    "HIGH": 1,
+    "NORMAL": 2,
+    "LOW": 3,
+}
+
+PENDING = "PENDING"
+SENDING = "SENDING"
+SENT = "SENT"
+FAILED = "FAILED"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    phone TEXT NOT NULL,
+    message TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    next_attempt REAL NOT NULL,
+    sent REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, priority, next_attempt, id);
+"""
+
+
+class SMSOutbox:
+    """SQLite-backed queue of outgoing SMS with priorities and retry state."""
+
+    def __init__(self, path, max_attempts=5, retry_base=10.0, retry_max=600.0):
+        """
+        Open (or create) the outbox database.
+
+        Args:
+            path: SQLite database path
+            max_attempts: Attempts before a message is marked FAILED
+            retry_base: First retry delay in seconds (doubles per attempt)
+            retry_max: Upper bound of the retry delay in seconds
+        """
+        self.path = str(path)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # The service may run on its own thread; the lock serializes access
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def _execute(self, sql, params=()):
+        """Run one statement and return (rows, rowcount, lastrowid)."""
+        with self._lock:
+            cursor = self.db.execute(sql, params)
+            return cursor.fetchall(), cursor.rowcount, cursor.lastrowid
+
+    def enqueue(self, phone, message, priority="NORMAL"):
+        """
+        Queue a message for sending.
+
+        Args:
+            phone: Recipient phone number (with country code)
+            message: Message text
+            priority: CRITICAL, HIGH, NORMAL or LOW
+
+        Returns:
+            Message id
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (choose from {', '.join(PRIORITIES)})")
+
+        now = time.time()
+        _, _, lastrowid = self._execute(
+            "INSERT INTO outbox (phone, message, priority, status, created, next_attempt) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (phone, message, PRIORITIES[priority], PENDING, now, now)
+        )
+        return lastrowid
+
+    def next_due(self, now=None):
+        """
+        Most urgent message whose retry time has come.
+
+        Returns:
+            Dictionary with id, phone, message, priority and attempts, or None
+        """
+        rows, _, _ = self._execute(
+            "SELECT id, phone, message, priority, attempts FROM outbox "
+            "WHERE status = ? AND next_attempt <= ? ORDER BY priority, id LIMIT 1",
+            (PENDING, time.time() if now is None else now)
+        )
+
+        if not rows:
+            return None
+        return dict(zip(("id", "phone", "message", "priority", "attempts"), rows[0]))
+
+    def mark_sending(self, message_id):
+        """Record that a send attempt is in progress."""
+        self._execute(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1 WHERE id = ?",
+            (SENDING, message_id)
+        )
+
+    def mark_sent(self, message_id):
+        """Record a successful send."""
+        self._execute(
+            "UPDATE outbox SET status = ?, sent = ?, last_error = NULL WHERE id = ?",
+            (SENT, time.time(), message_id)
+        )
+
+    def mark_failed(self, message_id, error):
+        """
+        Schedule a retry with exponential backoff, or give up.
+
+        Returns:
+            True if a retry was scheduled, False if the message is now FAILED
+        """
+        rows, _, _ = self._execute("SELECT attempts FROM outbox WHERE id = ?", (message_id,))
+        attempts = rows[0][0] if rows else self.max_attempts
+
+        if attempts >= self.max_attempts:
+            self._execute(
+                "UPDATE outbox SET status = ?, last_error = ? WHERE id = ?",
+                (FAILED, error, message_id)
+            )
+            return False
+
+        delay = min(self.retry_max, self.retry_base * (2 ** (attempts - 1)))
+        self._execute(
+            "UPDATE outbox SET status = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+            (PENDING, time.time() + delay, error, message_id)
+        )
+        return True
+
+    def recover(self):
+        """
+        Requeue messages left SENDING by a crash.
+
+        The modem may or may not have sent them, so this favours a possible
+        duplicate over a lost alert.
+
+        Returns:
+            Number of messages requeued
+        """
+        _, rowcount, _ = self._execute("UPDATE outbox SET status = ? WHERE status = ?", (PENDING, SENDING))
+        return rowcount
+
+    def prune(self, keep_seconds=7 * 86400):
+        """Delete SENT and FAILED messages older than keep_seconds."""
+        self._execute(
+            "DELETE FROM outbox WHERE status IN (?, ?) AND created < ?",
+            (SENT, FAILED, time.time() - keep_seconds)
+        )
+
+    def counts(self):
+        """Number of messages per status."""
+        rows, _, _ = self._execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+        return dict(rows)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self.db.close()
+
+
+class OutboxService:
+    """Drains an SMSOutbox through one long-lived modem session."""
+
+    def __init__(self, outbox, modem_factory, min_send_interval=3.0, poll_interval=0.5,
+                 reconnect_after=3, reconnect_delay=30.0, inbox_handler=None, inbox_interval=60.0,
+                 uplink=None, uplink_interval=10.0):
+        """
+        Args:
+            outbox: SMSOutbox instance
+            modem_factory: Callable returning an initialized SIM800L, or None if
+                           the modem is unavailable
+            min_send_interval: Minimum seconds between sends (modem throughput)
+            poll_interval: Seconds between queue polls when idle
+            reconnect_after: Consecutive failures before the session is reopened
+            reconnect_delay: Seconds to wait before retrying an unavailable modem
+            inbox_handler: Optional callable(modem) that processes received SMS;
+                           run on +CMTI notifications and every inbox_interval
+            inbox_interval: Seconds between inbox sweeps without a notification
+            uplink: Optional UplinkSender; its due batches are sent while
+                    no SMS is due
+            uplink_interval: Seconds between checks for due batches
+        """
+        self.outbox = outbox
+        self.modem_factory = modem_factory
+        self.min_send_interval = min_send_interval
+        self.poll_interval = poll_interval
+        self.reconnect_after = reconnect_after
+        self.reconnect_delay = reconnect_delay
+        self.inbox_handler = inbox_handler
+        self.inbox_interval = inbox_interval
+        self.uplink = uplink
+        self.uplink_interval = uplink_interval
+
+        self.modem = None
+        self.running = False
+        self._last_send = 0.0
+        self._consecutive_failures = 0
+        self._inbox_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._last_inbox_check = float("-inf")
+        self._last_uplink_check = float("-inf")
+
+    def _ensure_modem(self):
+        if self.modem is None:
+            self.modem = self.modem_factory()
+            self._consecutive_failures = 0
+            if self.modem is not None and self.inbox_handler is not None:
+                self.modem.on_sms_received(lambda index: self._inbox_event.set())
+                # Messages may have arrived while no session was open
+                self._inbox_event.set()
+        return self.modem
+
+    def check_inbox(self):
+        """
+        Run the inbox handler if a message was announced or the sweep is due.
+
+        Returns:
+            True if the inbox was checked
+        """
+        if self.inbox_handler is None:
+            return False
+
+        due = time.monotonic() - self._last_inbox_check >= self.inbox_interval
+        if not (self._inbox_event.is_set() or due):
+            return False
+
+        self._last_inbox_check = time.monotonic()
+        modem = self._ensure_modem()
+        # Cleared after connecting, which sets it; the handler reads every unread message anyway
+        self._inbox_event.clear()
+        if modem is None:
+            return False
+
+        try:
+            self.inbox_handler(self.modem)
+        except Exception as e:
+            print(f"Outbox: Inbox processing failed - {e}", file=sys.stderr)
+        return True
+
+    def _drop_modem(self):
+        if self.modem is not None:
+            self.modem.close()
+            self.modem = None
+
+    def process_one(self):
+        """
+        Send the next due message, if any.
+
+        Returns:
+            True if a message was attempted, False if the queue had nothing due
+            or the modem is unavailable
+        """
+        message = self.outbox.next_due()
+        if message is None:
+            return False
+
+        if self._ensure_modem() is None:
+            print(f"Outbox: Modem unavailable, retrying in {self.reconnect_delay:.0f}s", file=sys.stderr)
+            # stop() cuts the wait short
+            self._stop_event.wait(self.reconnect_delay)
+            return False
+
+        # Pace sends to what the modem and network can absorb
+        wait = self._last_send + self.min_send_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        self.outbox.mark_sending(message["id"])
+        try:
+            success = self.modem.send_sms(message["phone"], message["message"])
+            error = None if success else "ERROR or timeout"
+        except Exception as e:
+            success, error = False, str(e)
+        self._last_send = time.monotonic()
+
+        if success:
+            self.outbox.mark_sent(message["id"])
+            self._consecutive_failures = 0
+            return True
+
+        retrying = self.outbox.mark_failed(message["id"], error)
+        print(f"Outbox: Message {message['id']} to {message['phone']} failed - {error}"
+              f"{' (will retry)' if retrying else ' (giving up)'}", file=sys.stderr)
+
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.reconnect_after:
+            print("Outbox: Repeated failures, reopening modem session", file=sys.stderr)
+            self._drop_modem()
+        return True
+
+    def process_uplink(self):
+        """
+        Send due telemetry batches in one GPRS session.
+
+        Returns:
+            True if a session was attempted
+        """
+        if self.uplink is None or time.monotonic() - self._last_uplink_check < self.uplink_interval:
+            return False
+        self._last_uplink_check = time.monotonic()
+
+        if not self.uplink.ready() or self._ensure_modem() is None:
+            return False
+
+        try:
+            self.uplink.process(self.modem)
+        except Exception as e:
+            print(f"Outbox: Uplink session failed - {e}", file=sys.stderr)
+        return True
+
+    def run(self, prune_interval=3600.0):
+        """Process the queue until stop() is called."""
+        self.running = True
+        self._stop_event.clear()
+        requeued = self.outbox.recover()
+        if requeued:
+            print(f"Outbox: Requeued {requeued} interrupted message(s)", file=sys.stderr)
+
+        last_prune = 0.0
+        try:
+            while self.running:
+                if time.monotonic() - last_prune > prune_interval:
+                    self.outbox.prune()
+                    last_prune = time.monotonic()
+
+                self.check_inbox()
+
+                if not self.process_one() and not self.process_uplink():
+                    # A +CMTI notification cuts the idle wait short
+                    self._inbox_event.wait(self.poll_interval)
+        finally:
+            self._drop_modem()
+
+    def stop(self):
+        """Ask run() to return after the current message."""
+        self.running = False
+        self._stop_event.set()
+
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/sms_outbox.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/lib/varuna/uplink.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/lib/varuna/uplink.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Store-and-forward telemetry uplink over SIM800L GPRS.
+
+The reader adds every record to an SQLite buffer and returns. Once
+batch_size readings are waiting (or the oldest is max_age_s old) they are
+sealed into one zlib-compressed batch, in the same transaction that
+removes them from the reading table, so a reading is always in exactly
+one place. The modem owner (OutboxService) then opens one GPRS bearer,
+POSTs the due batches and closes it again. A batch is deleted only when
+the server answers 200 with {"ack": <batch id>}; otherwise it is retried
+with exponential backoff. The database runs with synchronous=FULL, so
+sealed and unsent batches survive a power cut.
+
+Batch payload (Content-Type application/x-varuna-batch):
+
+    zlib(JSON {"device_id": ..., "batch": <id>, "records": [record, ...]})
+
+Batch ids are never reused (AUTOINCREMENT), so the receiver can drop a
+batch it has already stored when only the acknowledgement was lost.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CONTENT_TYPE = "application/x-varuna-batch"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    record TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload BLOB NOT NULL,
+    records INTEGER NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS batches_due ON batches (next_attempt, id);
+"""
+
+
+def encode_batch(device_id, batch_id, records):
+    """
+    Build a batch payload.
+
+    Args:
+        device_id: Station id
+        batch_id: Batch id from the buffer
+        records: List of record JSON strings
+
+    Returns:
+        Tuple of (compressed payload, uncompressed size in bytes)
+    """
+    raw = ('{"device_id":%s,"batch":%d,"records":[%s]}'
+           % (json.dumps(device_id), batch_id, ",".join(records))).encode()
+    return zlib.compress(raw, 9), len(raw)
+
+
+def decode_batch(payload):
+    """
+    Unpack a batch payload.
+
+    Returns:
+        Dictionary with device_id, batch and records
+
+    Raises:
+        ValueError: If the payload is not a valid batch
+    """
+    try:
+        batch = json.loads(zlib.decompress(payload))
+    except zlib.error as e:
+        raise ValueError(f"Not a zlib batch - {e}")
+    if not isinstance(batch, dict) or not {"device_id", "batch", "records"} <= batch.keys():
+        raise ValueError("Batch without device_id, batch and records")
+    return batch
+
+
+class UplinkBuffer:
+    """SQLite buffer of readings and sealed, unacknowledged batches."""
+
+    def __init__(self, path, device_id, retry_base=30.0, retry_max=1800.0, max_batches=5000):
+        """
+        Open (or create) the buffer database.
+
+        Args:
+            path: SQLite database path
+            device_id: Station id written into every batch
+            retry_base: First retry delay in seconds (doubles per attempt)
+            retry_max: Upper bound of the retry delay in seconds
+            max_batches: Unsent batches kept before the oldest are dropped
+        """
+        self.path = str(path)
+        self.device_id = device_id
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_batches = max_batches
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # Unlike the SMS outbox, a committed batch must outlive a power cut
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.executescript(SCHEMA)
+
+    def _execute(self, sql, params=()):
+        """Run one statement and return (rows, rowcount, lastrowid)."""
+        with self._lock:
+            cursor = self.db.execute(sql, params)
+            return cursor.fetchall(), cursor.rowcount, cursor.lastrowid
+
+    def add(self, record):
+        """
+        Buffer one reader record.
+
+        Args:
+            record: Record dictionary (the JSON output schema)
+        """
+        self._execute("INSERT INTO readings (record, created) VALUES (?, ?)",
+                      (json.dumps(record, separators=(",", ":")), time.time()))
+
+    def pending(self):
+        """
+        Readings not yet sealed into a batch.
+
+        Returns:
+            Tuple of (count, creation time of the oldest or None)
+        """
+        rows, _, _ = self._execute("SELECT COUNT(*), MIN(created) FROM readings")
+        return rows[0]
+
+    def seal(self, max_records):
+        """
+        Move up to max_records of the oldest readings into a new batch.
+
+        Returns:
+            Batch id, or None if there were no readings
+        """
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.db.execute("SELECT id, record FROM readings ORDER BY id LIMIT ?",
+                                       (max_records,)).fetchall()
+                if not rows:
+                    self.db.execute("ROLLBACK")
+                    return None
+
+                now = time.time()
+                batch_id = self.db.execute(
+                    "INSERT INTO batches (payload, records, raw_bytes, created, next_attempt) VALUES (?, ?, 0, ?, ?)",
+                    (b"", len(rows), now, now)
+                ).lastrowid
+                payload, raw_bytes = encode_batch(self.device_id, batch_id, [record for _, record in rows])
+                self.db.execute("UPDATE batches SET payload = ?, raw_bytes = ? WHERE id = ?",
+                                (payload, raw_bytes, batch_id))
+                self.db.execute("DELETE FROM readings WHERE id <= ?", (rows[-1][0],))
+
+                # Bound the card usage during a long outage: oldest batches go first
+                dropped = self.db.execute(
+                    "DELETE FROM batches WHERE id IN (SELECT id FROM batches ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                    (self.max_batches,)
+                ).rowcount
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+        if dropped > 0:
+            print(f"Uplink: Buffer full, dropped {dropped} oldest batch(es)", file=sys.stderr)
+        return batch_id
+
+    def due(self, limit, now=None):
+        """
+        Oldest batches whose retry time has come.
+
+        Returns:
+            List of dictionaries with id, payload, records, raw_bytes and attempts
+        """
+        rows, _, _ = self._execute(
+            "SELECT id, payload, records, raw_bytes, attempts FROM batches "
+            "WHERE next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time() if now is None else now, limit)
+        )
+        return [dict(zip(("id", "payload", "records", "raw_bytes", "attempts"), row)) for row in rows]
+
+    def ack(self, batch_id):
+        """Delete an acknowledged batch."""
+        self._execute("DELETE FROM batches WHERE id = ?", (batch_id,))
+
+    def mark_failed(self, batch_id, error):
+        """
+        Schedule a retry with exponential backoff (telemetry is never given up).
+
+        Returns:
+            Seconds until the next attempt
+        """
+        rows, _, _ = self._execute("SELECT attempts FROM batches WHERE id = ?", (batch_id,))
+        attempts = (rows[0][0] if rows else 0) + 1
+        delay = min(self.retry_max, self.retry_base * (2 ** (attempts - 1)))
+        self._execute(
+            "UPDATE batches SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+            (attempts, time.time() + delay, error, batch_id)
+        )
+        return delay
+
+    def counts(self):
+        """Number of buffered readings and unsent batches."""
+        readings, _ = self.pending()
+        rows, _, _ = self._execute("SELECT COUNT(*) FROM batches")
+        return {"readings": readings, "batches": rows[0][0]}
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self.db.close()
+
+
+class UplinkSender:
+    """Seals buffered readings and sends due batches in one GPRS session."""
+
+    def __init__(self, buffer, url, apn, user=None, password=None, batch_size=60, max_age_s=900.0,
+                 max_batches_per_session=20, http_timeout=60.0):
+        """
+        Args:
+            buffer: UplinkBuffer
+            url: http:// endpoint that answers {"ack": <batch id>}
+            apn: GPRS access point name
+            user: APN user name, or None
+            password: APN password, or None
+            batch_size: Readings per batch
+            max_age_s: Seal a partial batch once its oldest reading is this old
+            max_batches_per_session: Batches POSTed per bearer session
+            http_timeout: Seconds to wait for each HTTP response
+        """
+        self.buffer = buffer
+        self.url = url
+        self.apn = apn
+        self.user = user
+        self.password = password
+        self.batch_size = batch_size
+        self.max_age_s = max_age_s
+        self.max_batches_per_session = max_batches_per_session
+        self.http_timeout = http_timeout
+
+        self.stats = {"sessions": 0, "posts": 0, "acked": 0, "failed": 0, "records": 0,
+                      "bytes_sent": 0, "raw_bytes": 0, "bearer_s": 0.0}
+
+    def seal_ready(self, now=None):
+        """
+        Seal full batches, and a partial one whose oldest reading is max_age_s old.
+
+        Returns:
+            Number of batches sealed
+        """
+        now = time.time() if now is None else now
+        sealed = 0
+        while True:
+            count, oldest = self.buffer.pending()
+            if count == 0 or (count < self.batch_size and now - oldest < self.max_age_s):
+                return sealed
+            self.buffer.seal(self.batch_size)
+            sealed += 1
+
+    def ready(self, now=None):
+        """True if a batch is due, sealing what is ready first."""
+        self.seal_ready(now)
+        return bool(self.buffer.due(1, now))
+
+    def _send(self, modem, batch):
+        status, body = modem.http_post(self.url, batch["payload"], CONTENT_TYPE, timeout=self.http_timeout)
+        self.stats["posts"] += 1
+        self.stats["bytes_sent"] += len(batch["payload"])
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        try:
+            acked = json.loads(body).get("ack")
+        except (ValueError, AttributeError):
+            acked = None
+        if acked != batch["id"]:
+            raise RuntimeError(f"No acknowledgement for batch {batch['id']} (got {body[:60]!r})")
+
+    def process(self, modem, now=None):
+        """
+        Send due batches over one bearer session.
+
+        Args:
+            modem: Open SIM800L (event-driven)
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of batches acknowledged (0 if nothing was due or the
+            session failed; failed batches are rescheduled)
+        """
+        if not self.ready(now):
+            return 0
+
+        batches = self.buffer.due(self.max_batches_per_session, now)
+        acked = 0
+        start = time.monotonic()
+        try:
+            modem.open_bearer(self.apn, self.user, self.password)
+        except RuntimeError as e:
+            print(f"Uplink: Cannot open GPRS bearer - {e}", file=sys.stderr)
+            for batch in batches:
+                self.buffer.mark_failed(batch["id"], str(e))
+            self.stats["failed"] += len(batches)
+            return 0
+
+        self.stats["sessions"] += 1
+        try:
+            for index, batch in enumerate(batches):
+                try:
+                    self._send(modem, batch)
+                except RuntimeError as e:
+                    # The network is probably gone; the rest wait for the next session
+                    for failed in batches[index:]:
+                        delay = self.buffer.mark_failed(failed["id"], str(e))
+                    self.stats["failed"] += len(batches) - index
+                    print(f"Uplink: Batch {batch['id']} failed - {e} (retry in {delay:.0f}s)", file=sys.stderr)
+                    break
+
+                self.buffer.ack(batch["id"])
+                acked += 1
+                self.stats["acked"] += 1
+                self.stats["records"] += batch["records"]
+                self.stats["raw_bytes"] += batch["raw_bytes"]
+        finally:
+            modem.close_bearer()
+            self.stats["bearer_s"] += time.monotonic() - start
+
+        if acked:
+            print(f"Uplink: {acked} batch(es) acknowledged", file=sys.stderr)
+        return acked
+
+
+class UplinkReceiver:
+    """
+    Minimal HTTP endpoint for uplink batches (control room stand-in and tests).
+
+    Stores each batch once per (device_id, batch id) and acknowledges
+    duplicates without storing them again.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, on_batch=None):
+        """
+        Start serving on a background thread.
+
+        Args:
+            host: Address to listen on
+            port: TCP port (0 picks a free one; see self.url)
+            on_batch: Optional callable(batch dict) run for each new batch;
+                      an exception makes the request fail with HTTP 500
+        """
+        self.on_batch = on_batch
+        self.batches = {}      # (device_id, batch id) -> batch
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, reply = receiver.receive(body)
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_address[1]}/uplink"
+        self._thread = threading.Thread(target=self.server.serve_forever, name="uplink-receiver", daemon=True)
+        self._thread.start()
+
+    def receive(self, payload):
+        """
+        Handle one POSTed payload.
+
+        Returns:
+            Tuple of (HTTP status, reply dictionary)
+        """
+        with self._lock:
+            self.requests += 1
+            try:
+                batch = decode_batch(payload)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+
+            key = (batch["device_id"], batch["batch"])
+            duplicate = key in self.batches
+            if not duplicate:
+                try:
+                    if self.on_batch:
+                        self.on_batch(batch)
+                except Exception as e:
+                    return 500, {"error": str(e)}
+                self.batches[key] = batch
+            return 200, {"ack": batch["batch"], "duplicate": duplicate}
+
+    def records(self):
+        """Every stored record, in batch order."""
+        with self._lock:
+            return [record for key in sorted(self.batches) for record in self.batches[key]["records"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def open_uplink(config, base_dir):
+    """
+    Open the uplink buffer configured under "uplink".
+
+    Args:
+        config: Parsed configuration dictionary
+        base_dir: Directory relative buffer paths are resolved against
+
+    Returns:
+        UplinkBuffer, or None if the uplink is disabled
+    """
+    section = config.get("uplink")
+    if not section or not section.get("enabled", False):
+        return None
+    return UplinkBuffer(
+        os.path.join(str(base_dir), section.get("path", "data/uplink.db")),
+        config.get("device_id", "CWC-RJ-001"),
+        retry_base=section.get("retry_base_s", 30.0),
+        retry_max=section.get("retry_max_s", 1800.0),
+        max_batches=section.get("max_batches", 5000)
+    )
+
+
+def create_sender(config, buffer):
+    """Build an UplinkSender from the "uplink" section of config.json."""
+    section = config.get("uplink", {})
+    return UplinkSender(
+        buffer,
+        section.get("url", ""),
+        section.get("apn", "internet"),
+        user=section.get("apn_user"),
+        password=section.get("apn_password"),
+        batch_size=section.get("batch_size", 60),
+        max_age_s=section.get("max_age_s", 900.0),
+        max_batches_per_session=section.get("max_batches_per_session", 20),
+        http_timeout=section.get("http_timeout_s", 60.0)
+    )
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/lib/varuna/uplink.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/aggregation_loadgen.py
+PHASE: PRODUCTION - Test and Benchmark Support
+LOCATION: varuna_ui/python/scripts/aggregation_loadgen.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Load generator for aggregation_server.py.
+
+Starts the server as a subprocess on free localhost ports with a
+temporary store (or targets a running one with --json-port), then
+simulates many stations, each with its own connection and a random-walk
+water level. When every record is stored it reports sustained records/s,
+the server's p99 ingest latency (receive to stored) and whether the
+ABOVE_WARNING answer matches the levels that were sent.
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from varuna.binary_frames import FrameEncoder
+
+
+class Station:
+    """One simulated station producing reader records."""
+
+    def __init__(self, number, warning_cm, rng):
+        self.device_id = f"LOAD-{number:05d}"
+        self.location = {"name": f"Load station {number}", "latitude": 20.0 + number * 1e-3, "longitude": 78.0}
+        # Spread the starting levels so some stations end above warning
+        self.level = rng.uniform(0.5 * warning_cm, 1.2 * warning_cm)
+        self.rng = rng
+
+    def record(self):
+        self.level = max(0.0, self.level + self.rng.gauss(0.0, 0.5))
+        return {
+            "device_id": self.device_id,
+            "location": self.location,
+            "timestamp": datetime.now().isoformat(),
+            "mpu6050": {"pitch_angle": 10.0, "water_level_cm": round(self.level, 2), "status": "SIMULATED"},
+            "dht22": {"temperature": 25.0, "humidity": 60.0, "status": "SIMULATED"},
+            "consensus_level_cm": round(self.level, 2),
+            "rate_of_change_cm_per_hour": 0.0,
+            "rate_confidence": 0.0
+        }
+
+
+async def query(host, port, command):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(command.encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+
+async def run_station(station, args, target_port, records):
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+
+    if args.format == "udp":
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(args.host, target_port))
+        for _ in range(records):
+            transport.sendto(json.dumps(station.record()).encode())
+            await asyncio.sleep(interval)
+        transport.close()
+        return
+
+    reader, writer = await asyncio.open_connection(args.host, target_port)
+    encoder = FrameEncoder()
+    for _ in range(records):
+        record = station.record()
+        if args.format == "binary":
+            writer.write(encoder.encode(record))
+        else:
+            writer.write(json.dumps(record).encode() + b"\n")
+        await writer.drain()
+        await asyncio.sleep(interval)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def send(stations, args, ports, records):
+    """
+    Send records from every station and wait until the server stored them.
+
+    Returns:
+        (stored records, seconds, last STATS reply)
+    """
+    target_port = ports["udp" if args.format == "udp" else args.format]
+    before = (await query(args.host, ports["json"], "STATS"))["stored"]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_station(station, args, target_port, records) for station in stations))
+    sent_s = time.perf_counter() - start
+
+    # UDP may have dropped some; give up on them after 2 s
+    expected = len(stations) * records
+    while True:
+        stats = await query(args.host, ports["json"], "STATS")
+        stored = stats["stored"] - before
+        if stored >= expected or (args.format == "udp" and time.perf_counter() - start > sent_s + 2.0):
+            return stored, time.perf_counter() - start, stats
+        await asyncio.sleep(0.01)
+
+
+async def generate(args, ports):
+    rng = random.Random(args.seed)
+    stations = [Station(number, args.warning_cm, rng) for number in range(args.stations)]
+
+    # The first record of a station creates its ring file; keep that out
+    # of the sustained numbers
+    await send(stations, args, ports, 1)
+    await query(args.host, ports["json"], "RESET")
+
+    stored, elapsed, stats = await send(stations, args, ports, args.records)
+    expected = args.stations * args.records
+
+    query_start = time.perf_counter()
+    above = await query(args.host, ports["json"], "ABOVE_WARNING")
+    query_ms = (time.perf_counter() - query_start) * 1000.0
+
+    expected_above = {s.device_id for s in stations if round(s.level, 2) >= args.warning_cm}
+    return {
+        "format": args.format,
+        "stations": args.stations,
+        "records_sent": expected,
+        "records_stored": stored,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(stored / elapsed, 1),
+        "ingest_latency_ms": stats["ingest_latency_ms"],
+        "above_warning": len(above["stations"]),
+        "above_warning_matches": expected_above == set(above["stations"]),
+        "above_warning_query_ms": round(query_ms, 3),
+        "server": stats
+    }
+
+
+def start_server(args, store_dir):
+    """Run aggregation_server.py on free ports and return (process, ports)."""
+    process = subprocess.Popen(
+        [sys.executable, str(script_dir / "aggregation_server.py"),
+         "--host", args.host, "--json-port", "0", "--binary-port", "0", "--udp-port", "0",
+         "--store-dir", store_dir],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    line = process.stdout.readline()
+    if not line:
+        raise RuntimeError(f"aggregation_server.py exited with code {process.wait()}")
+    return process, json.loads(line)["ports"]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Load test the aggregation server')
+    parser.add_argument('--stations', type=int, default=200, help='Simulated stations')
+    parser.add_argument('--records', type=int, default=100, help='Records per station')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='Records/s per station (0 = as fast as the server accepts)')
+    parser.add_argument('--format', choices=['json', 'binary', 'udp'], default='json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--json-port', type=int,
+                        help='Target a running server (query port); its --binary-port and '
+                             '--udp-port are assumed to be json-port+1 and json-port')
+    parser.add_argument('--warning-cm', type=float, default=200.0,
+                        help='Warning level the server uses (to check ABOVE_WARNING)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory(prefix="varuna-agg-") as store_dir:
+        if args.json_port is None:
+            process, ports = start_server(args, store_dir)
+        else:
+            ports = {"json": args.json_port, "binary": args.json_port + 1, "udp": args.json_port}
+
+        try:
+            report = asyncio.run(generate(args, ports))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print(json.dumps(report, indent=2))
+    latency = report["ingest_latency_ms"] or {}
+    print(f"{report['records_per_s']:.0f} records/s sustained, p99 ingest latency "
+          f"{latency.get('p99')} ms, {report['above_warning']} stations above warning", file=sys.stderr)
+    return 0 if report["above_warning_matches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/aggregation_loadgen.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/aggregation_server.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/scripts/aggregation_server.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import json
+import signal
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from varuna.config_manager import read_config
+from varuna.aggregation import create_server
+
+config_path = script_dir.parent / "config" / "config.json"
+
+
+def load_config(path):
+    """Read config.json, or use defaults if it cannot be read."""
+    try:
+        return read_config(path)
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Failed to load config - {e}", file=sys.stderr)
+        return {}
+
+
+def port(value):
+    """Port argument: a number, or "off" to disable the listener."""
+    return None if value == "off" else int(value)
+
+
+async def serve(args, config):
+    server = create_server(config, args.store_dir)
+    await server.start(args.host, args.json_port, args.binary_port, args.udp_port)
+
+    # Bound ports on stdout, so a caller that asked for port 0 can connect
+    print(json.dumps({"ports": server.ports}), flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+    print("Aggregator: Stopping", file=sys.stderr)
+    await server.stop()
+    print(f"Aggregator: {json.dumps(server.stats())}", file=sys.stderr)
+    server.store.close()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Ingest readings from many stations')
+    parser.add_argument('--config', default=str(config_path), help='config.json path')
+    args, _ = parser.parse_known_args()
+    config = load_config(args.config)
+    section = config.get("aggregation", {})
+
+    parser.add_argument('--host', default=section.get("host", "127.0.0.1"), help='Address to listen on')
+    parser.add_argument('--json-port', type=port, default=section.get("json_port", 8470),
+                        help='TCP port for JSON lines and queries ("off" to disable, 0 for any)')
+    parser.add_argument('--binary-port', type=port, default=section.get("binary_port", 8471),
+                        help='TCP port for binary frames ("off" to disable, 0 for any)')
+    parser.add_argument('--udp-port', type=port, default=section.get("udp_port", 8470),
+                        help='UDP port for JSON datagrams ("off" to disable, 0 for any)')
+    parser.add_argument('--store-dir', default=str(script_dir.parent / section.get("store_dir", "data/stations")),
+                        help='Directory for the per-station rings')
+    args = parser.parse_args()
+
+    asyncio.run(serve(args, config))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/aggregation_server.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/benchmark_drivers.py
+PHASE: PRODUCTION - Test and Benchmark Support
+LOCATION: varuna_ui/python/scripts/benchmark_drivers.py
+═══════════════════════════════════════════════════════════════
+"""
+
+"""
+Driver stack benchmarks on simulated hardware.
+
+Runs the real MPU6050 and SIM800L drivers against simulated_hardware
+backends and the real read_sensors.py as a subprocess, then writes every
+metric to a JSON file (and appends it to a JSONL history) so results can
+be compared across releases.
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import platform
+import argparse
+import tempfile
+import statistics
+import contextlib
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+import sensor_drivers
+from sensor_drivers.mpu6050_driver import MPU6050
+from sensor_drivers.metrics import Metrics
+from sensor_drivers.simulated_hardware import FakeSMBus, FakeSIM800L
+from varuna.binary_frames import FrameEncoder, FrameDecoder
+
+
+def summarize(values_ms):
+    """Median, p95 and max of a list of milliseconds."""
+    ordered = sorted(values_ms)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(p95, 3),
+        "max": round(ordered[-1], 3),
+        "n": len(ordered)
+    }
+
+
+def metric(name, value, unit, **params):
+    return {"name": name, "value": value, "unit": unit, "params": params}
+
+
+def bench_mpu(i2c_latency, duration, readings):
+    """Raw sample throughput, and transactions and latency per reading."""
+    results = []
+    bus = FakeSMBus(latency=i2c_latency)
+    mpu = MPU6050(smbus=bus)
+
+    # Burst-read throughput
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        mpu.read_raw_sample()
+        count += 1
+    elapsed = time.perf_counter() - start
+    results.append(metric("mpu6050.raw_samples_per_s", round(count / elapsed, 1), "samples/s",
+                          i2c_latency_us=i2c_latency * 1e6))
+
+    # Polled read_sensor_data (10 samples, 20 ms apart)
+    bus.reset_counters()
+    latencies = []
+    for _ in range(readings):
+        start = time.perf_counter()
+        mpu.read_sensor_data(num_samples=10)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    results.append(metric("mpu6050.polled.i2c_transactions_per_reading",
+                          round(bus.transactions / readings, 2), "transactions", num_samples=10))
+    results.append(metric("mpu6050.polled.reading_latency_ms", summarize(latencies), "ms", num_samples=10))
+
+    # Hardware FIFO at 200 Hz
+    mpu.enable_fifo(sample_rate_hz=200)
+    time.sleep(0.1)
+    mpu.read_fifo()
+    bus.reset_counters()
+    latencies = []
+    for _ in range(readings):
+        start = time.perf_counter()
+        mpu.read_sensor_data(num_samples=10)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    results.append(metric("mpu6050.fifo.i2c_transactions_per_reading",
+                          round(bus.transactions / readings, 2), "transactions", num_samples=10, rate_hz=200))
+    results.append(metric("mpu6050.fifo.reading_latency_ms", summarize(latencies), "ms",
+                          num_samples=10, rate_hz=200))
+
+    mpu.close()
+    return results
+
+
+def bench_sampling(i2c_latency, samples, load_workers, rates=(50, 100, 200)):
+    """
+    Achieved polled sample rate, jitter and missed deadlines per target
+    rate, idle and with load_workers busy-looping processes.
+    """
+    results = []
+    mpu = MPU6050(smbus=FakeSMBus(latency=i2c_latency))
+
+    for load in sorted({0, load_workers}):
+        workers = [subprocess.Popen([sys.executable, "-c", "while True: pass"]) for _ in range(load)]
+        try:
+            for rate in rates:
+                sampling = mpu.read_sensor_data(num_samples=samples, sample_interval=1.0 / rate)["sampling"]
+                name = f"mpu6050.sampling.{'loaded' if load else 'idle'}.{rate}hz"
+                params = {"target_hz": rate, "samples": samples, "load_workers": load}
+                results.append(metric(f"{name}.achieved_hz", sampling["achieved_hz"], "Hz", **params))
+                results.append(metric(f"{name}.jitter_p99_ms", sampling["jitter_ms"]["p99"], "ms", **params))
+                results.append(metric(f"{name}.missed_deadlines", sampling["missed"], "deadlines", **params))
+        finally:
+            for worker in workers:
+                worker.kill()
+                worker.wait()
+
+    mpu.close()
+    return results
+
+
+def bench_metrics(i2c_latency, readings, rounds=10, cpu_readings=200):
+    """
+    Cost of the stage instrumentation on the MPU6050 path.
+
+    The added time per reading is measured CPU-bound (no bus latency, no
+    sleeps between samples), where it is not lost in the noise of sleep
+    timing, as the median difference of adjacent off/on rounds. It is
+    then expressed against back-to-back readings at the simulated I2C
+    latency, the worst case; polled readings also sleep between samples.
+    """
+    metrics = Metrics()
+    mpu = MPU6050(smbus=FakeSMBus(latency=0.0))
+    differences = []
+    for _ in range(rounds):
+        medians = []
+        for enabled in (False, True):
+            mpu.metrics = metrics if enabled else None
+            timings = []
+            for _ in range(cpu_readings):
+                start = time.perf_counter()
+                mpu.read_sensor_data(num_samples=10, sample_interval=0.0)
+                timings.append(time.perf_counter() - start)
+            medians.append(statistics.median(timings))
+        differences.append(medians[1] - medians[0])
+    mpu.close()
+    cost_us = max(0.0, statistics.median(differences) * 1e6)
+
+    mpu = MPU6050(smbus=FakeSMBus(latency=i2c_latency))
+    latencies = []
+    for _ in range(readings):
+        start = time.perf_counter()
+        mpu.read_sensor_data(num_samples=10, sample_interval=0.0)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    mpu.close()
+    reading_ms = statistics.median(latencies)
+
+    return [
+        metric("metrics.cost_us_per_reading", round(cost_us, 1), "us", num_samples=10),
+        metric("metrics.overhead_pct", round(cost_us / 10.0 / reading_ms, 3), "%",
+               num_samples=10, i2c_latency_us=i2c_latency * 1e6, reading_ms=round(reading_ms, 3))
+    ]
+
+
+def bench_modem(response_delay, commands, messages):
+    """AT command round trip and SMS submit latency, polling vs event-driven."""
+    from sensor_drivers.sim800l_driver import SIM800L
+
+    results = []
+    for event_driven in (False, True):
+        mode = "event" if event_driven else "polling"
+        fake = FakeSIM800L(response_delay=response_delay)
+        gsm = SIM800L(port=fake.port, baudrate=115200, timeout=5, event_driven=event_driven)
+        try:
+            latencies = []
+            for _ in range(commands):
+                start = time.perf_counter()
+                gsm.send_at_command('AT+CSQ')
+                latencies.append((time.perf_counter() - start) * 1000.0)
+            results.append(metric(f"sim800l.{mode}.at_command_latency_ms", summarize(latencies), "ms",
+                                  response_delay_ms=response_delay * 1000.0))
+
+            latencies = []
+            for i in range(messages):
+                start = time.perf_counter()
+                gsm.send_sms("+919876543210", f"Benchmark message {i}")
+                latencies.append((time.perf_counter() - start) * 1000.0)
+            results.append(metric(f"sim800l.{mode}.sms_submit_latency_ms", summarize(latencies), "ms",
+                                  response_delay_ms=response_delay * 1000.0))
+
+            # Regression: texts that look like result codes must not cut the listing short
+            for text in FakeSIM800L.AMBIGUOUS_TEXTS:
+                fake.inject_sms("+919876543210", text)
+            listed = gsm.list_sms("ALL") or []
+            received = [message["message"] for message in listed]
+            misparsed = sum(a != b for a, b in zip(received, FakeSIM800L.AMBIGUOUS_TEXTS))
+            misparsed += abs(len(received) - len(FakeSIM800L.AMBIGUOUS_TEXTS))
+            results.append(metric(f"sim800l.{mode}.inbox_misparsed", misparsed, "messages",
+                                  messages=len(FakeSIM800L.AMBIGUOUS_TEXTS)))
+        finally:
+            gsm.close()
+            fake.close()
+
+    return results
+
+
+def bench_read_sensors(runs):
+    """End-to-end latency of one-shot read_sensors.py, interpreter start included."""
+    command = [sys.executable, str(script_dir / "read_sensors.py"), "--simulate-i2c"]
+    latencies = []
+    failures = 0
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        try:
+            json.loads(result.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            failures += 1
+
+    return [
+        metric("read_sensors.end_to_end_latency_ms", summarize(latencies), "ms", runs=runs),
+        metric("read_sensors.invalid_outputs", failures, "runs", runs=runs),
+    ]
+
+
+def river_stream(records, period=0.1):
+    """Reader records of a slowly rising river with a steady DHT22."""
+    stream = []
+    start = time.time()
+    for i in range(records):
+        angle = 5.0 + 0.002 * i + 0.003 * math.sin(i / 7.0)
+        level = round((2.0 - 1.5 * math.sin(math.radians(angle)) - 0.15) * 100.0, 2)
+        stream.append({
+            "device_id": "CWC-RJ-001",
+            "timestamp": datetime.fromtimestamp(start + i * period).isoformat(),
+            "mpu6050": {"pitch_angle": round(angle, 2), "water_level_cm": level, "status": "OK",
+                        "raw_angle": round(angle, 2)},
+            "dht22": {"temperature": 31.4, "humidity": 62.0, "status": "OK"},
+            "consensus_level_cm": level,
+            "rate_of_change_cm_per_hour": 1.2,
+            "rate_confidence": 0.95,
+            "calibration": {"L_arm": 1.5, "H_pivot": 2.0, "R_float": 0.15, "mpu6050_offset": 0.0}
+        })
+    return stream
+
+
+def bench_frames(records):
+    """Bytes and encode+decode time per record, JSON lines vs binary frames."""
+    # 10 Hz stream
+    stream = river_stream(records)
+
+    begin = time.perf_counter()
+    data = [(json.dumps(record) + "\n").encode() for record in stream]
+    for line in data:
+        json.loads(line)
+    json_s = time.perf_counter() - begin
+    json_bytes = sum(len(line) for line in data)
+
+    encoder, decoder = FrameEncoder(), FrameDecoder()
+    begin = time.perf_counter()
+    data = [encoder.encode(record) for record in stream]
+    for frame in data:
+        decoder.feed(frame)
+    binary_s = time.perf_counter() - begin
+    binary_bytes = sum(len(frame) for frame in data)
+
+    return [
+        metric("frames.json.bytes_per_record", round(json_bytes / records, 1), "bytes", records=records),
+        metric("frames.binary.bytes_per_record", round(binary_bytes / records, 1), "bytes", records=records),
+        metric("frames.json.codec_us_per_record", round(json_s / records * 1e6, 1), "us", records=records),
+        metric("frames.binary.codec_us_per_record", round(binary_s / records * 1e6, 1), "us", records=records),
+    ]
+
+
+def bench_uplink(response_delay, bearer_delay, readings, batch_size):
+    """Bearer sessions, bytes, AT commands and modem-on time per reading, one by one vs batched."""
+    from sensor_drivers.sim800l_driver import SIM800L
+    from varuna.uplink import UplinkBuffer, UplinkSender, UplinkReceiver
+
+    results = []
+    stream = river_stream(readings, period=60.0)
+    receiver = UplinkReceiver()
+    try:
+        for size in (1, batch_size):
+            fake = FakeSIM800L(response_delay=response_delay, bearer_delay=bearer_delay)
+            gsm = SIM800L(port=fake.port, baudrate=115200, timeout=5, event_driven=True)
+            setup_commands = len(fake.commands)
+            with tempfile.TemporaryDirectory() as directory:
+                buffer = UplinkBuffer(os.path.join(directory, "uplink.db"), f"BENCH-{size}")
+                # One bearer session per batch
+                sender = UplinkSender(buffer, receiver.url, "internet", batch_size=size, max_batches_per_session=1)
+                try:
+                    for record in stream:
+                        buffer.add(record)
+                    start = time.perf_counter()
+                    while sender.process(gsm):
+                        pass
+                    elapsed = time.perf_counter() - start
+                finally:
+                    buffer.close()
+                    gsm.close()
+                    fake.close()
+
+            params = dict(batch_size=size, readings=readings, bearer_delay_ms=bearer_delay * 1000.0)
+            stats = sender.stats
+            results += [
+                metric(f"uplink.batch{size}.sessions", stats["sessions"], "sessions", **params),
+                metric(f"uplink.batch{size}.bytes_per_reading", round(stats["bytes_sent"] / readings, 1),
+                       "bytes", raw_bytes_per_reading=round(stats["raw_bytes"] / readings, 1), **params),
+                metric(f"uplink.batch{size}.at_commands_per_reading",
+                       round((len(fake.commands) - setup_commands) / readings, 2), "commands", **params),
+                metric(f"uplink.batch{size}.bearer_ms_per_reading",
+                       round(fake.bearer_seconds / readings * 1000.0, 1), "ms", **params),
+                metric(f"uplink.batch{size}.wall_ms_per_reading", round(elapsed / readings * 1000.0, 1), "ms",
+                       **params),
+            ]
+    finally:
+        receiver.close()
+
+    return results
+
+
+def bench_alerts(response_delay, crossings, recipients=2):
+    """Danger crossing to SMS accepted by the modem, cold (modem opened) and with the session kept open."""
+    from sensor_drivers.sim800l_driver import SIM800L
+    from varuna.alert_engine import AlertEngine, AlertNotifier
+
+    fake = FakeSIM800L(response_delay=response_delay)
+    engine = AlertEngine(warning_cm=200.0, danger_cm=250.0, holdoff_s=60.0, notify_clear=False)
+    phones = [f"+9198765432{i:02d}" for i in range(recipients)]
+    notifier = AlertNotifier(
+        phones,
+        open_modem=lambda: SIM800L(port=fake.port, baudrate=115200, timeout=5, event_driven=True),
+        idle_close_s=60.0
+    )
+    try:
+        now = time.time()
+        for _ in range(crossings):
+            notifier.submit(engine.evaluate(255.0, now=now))
+            delivered = len(notifier.reports) + 1
+            while len(notifier.reports) < delivered:
+                time.sleep(0.001)
+            # Fall back below the hysteresis band for the hold-off to re-arm
+            engine.evaluate(100.0, now=now + 1)
+            engine.evaluate(100.0, now=now + 62)
+            now += 120
+    finally:
+        notifier.close(10.0)
+        fake.close()
+
+    latencies = [report["latency_s"] * 1000.0 for report in notifier.reports]
+    params = dict(recipients=recipients, response_delay_ms=response_delay * 1000.0)
+    return [
+        metric("alerts.cold_latency_ms", round(latencies[0], 1), "ms", **params),
+        metric("alerts.warm_latency_ms", summarize(latencies[1:]), "ms", crossings=crossings - 1, **params),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=script_dir,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark the driver stack on simulated hardware')
+    parser.add_argument('--i2c-latency-us', type=float, default=500.0,
+                        help='Simulated I2C transaction time (about 500 us at 400 kHz)')
+    parser.add_argument('--modem-delay-ms', type=float, default=5.0,
+                        help='Simulated SIM800L response time')
+    parser.add_argument('--duration', type=float, default=1.0, help='Seconds of raw-sample throughput')
+    parser.add_argument('--readings', type=int, default=20, help='read_sensor_data calls per mode')
+    parser.add_argument('--sampling-samples', type=int, default=200,
+                        help='Polled samples per target rate in the sampling benchmark')
+    parser.add_argument('--load-workers', type=int, default=os.cpu_count() or 1,
+                        help='Busy processes started for the loaded sampling run (0 = idle only)')
+    parser.add_argument('--commands', type=int, default=50, help='AT commands per modem mode')
+    parser.add_argument('--messages', type=int, default=5, help='SMS submits per modem mode')
+    parser.add_argument('--runs', type=int, default=5, help='read_sensors.py subprocess runs')
+    parser.add_argument('--records', type=int, default=5000, help='Records per output format')
+    parser.add_argument('--uplink-readings', type=int, default=60, help='Readings sent per uplink mode')
+    parser.add_argument('--uplink-batch', type=int, default=60, help='Readings per batch in batched mode')
+    parser.add_argument('--bearer-delay-ms', type=float, default=50.0,
+                        help='Simulated GPRS attach time (a real SIM800L takes 1-3 s)')
+    parser.add_argument('--alert-crossings', type=int, default=10,
+                        help='Danger crossings in the alert latency benchmark (the first opens the modem)')
+    parser.add_argument('--skip', action='append', default=[],
+                        choices=['mpu', 'sampling', 'metrics', 'modem', 'read_sensors', 'frames', 'uplink',
+                                 'alerts'],
+                        help='Skip a benchmark group')
+    parser.add_argument('--output', default=str(script_dir.parent / "data" / "benchmarks" / "driver_benchmarks.json"),
+                        help='JSON results file')
+    parser.add_argument('--history', default=str(script_dir.parent / "data" / "benchmarks" / "history.jsonl"),
+                        help='JSONL file every run is appended to ("" to disable)')
+
+    args = parser.parse_args()
+
+    results = []
+    # Driver diagnostics go to stderr; stdout carries the summary table
+    with contextlib.redirect_stdout(sys.stderr):
+        if 'mpu' not in args.skip:
+            results += bench_mpu(args.i2c_latency_us / 1e6, args.duration, args.readings)
+        if 'sampling' not in args.skip:
+            results += bench_sampling(args.i2c_latency_us / 1e6, args.sampling_samples, args.load_workers)
+        if 'metrics' not in args.skip:
+            results += bench_metrics(args.i2c_latency_us / 1e6, args.readings)
+        if 'modem' not in args.skip:
+            results += bench_modem(args.modem_delay_ms / 1000.0, args.commands, args.messages)
+        if 'read_sensors' not in args.skip:
+            results += bench_read_sensors(args.runs)
+        if 'frames' not in args.skip:
+            results += bench_frames(args.records)
+        if 'uplink' not in args.skip:
+            results += bench_uplink(args.modem_delay_ms / 1000.0, args.bearer_delay_ms / 1000.0,
+                                    args.uplink_readings, args.uplink_batch)
+        if 'alerts' not in args.skip:
+            results += bench_alerts(args.modem_delay_ms / 1000.0, max(2, args.alert_crossings))
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "revision": git_revision(),
+        "driver_version": sensor_drivers.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(report) + "\n")
+
+    print(f"{'metric':<48}{'value':>24}  unit")
+    for r in results:
+        value = r["value"]
+        if isinstance(value, dict):
+            value = f"{value['median']} (p95 {value['p95']})"
+        print(f"{r['name']:<48}{str(value):>24}  {r['unit']}")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/benchmark_drivers.py
+═══════════════════════════════════════════════════════════════
+"""
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/benchmark_filters.py
+PHASE: PRODUCTION - Real MPU6050 Integration
+LOCATION: varuna_ui/python/scripts/benchmark_filters.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from sensor_drivers.fusion_filters import FILTERS
+
+
+def generate_samples(num_samples, true_angle, accel_noise, gyro_bias, gyro_noise, seed):
+    """
+    Synthesize a stationary arm: noisy accel angle, biased noisy gyro rate.
+    Nothing depends on the sample period; only the filters are given dt.
+
+    Returns:
+        List of (accel_angle, gyro_rate) tuples
+    """
+    rng = random.Random(seed)
+    return [
+        (true_angle + rng.gauss(0.0, accel_noise), gyro_bias + rng.gauss(0.0, gyro_noise))
+        for _ in range(num_samples)
+    ]
+
+
+def samples_to_convergence(angles, true_angle, tolerance, hold):
+    """
+    First sample index after which the error stays within tolerance for
+    `hold` consecutive samples.
+
+    Returns:
+        Sample count, or None if the filter never converged
+    """
+    run = 0
+    for i, angle in enumerate(angles):
+        if abs(angle - true_angle) <= tolerance:
+            run += 1
+            if run >= hold:
+                return i - hold + 2
+        else:
+            run = 0
+    return None
+
+
+def benchmark_filter(name, samples, dt, true_angle, tolerance, hold, repeats):
+    """Measure per-sample CPU cost and convergence of one filter."""
+    cost_ns = []
+    angles = []
+
+    for _ in range(repeats):
+        fusion = FILTERS[name]()
+        update = fusion.update
+        angles = []
+
+        start = time.process_time_ns()
+        for accel_angle, gyro_rate in samples:
+            angles.append(update(accel_angle, gyro_rate, dt))
+        cost_ns.append((time.process_time_ns() - start) / len(samples))
+
+    tail = angles[len(angles) // 2:]
+    tail_error = sum(abs(a - true_angle) for a in tail) / len(tail)
+
+    return {
+        "filter": name,
+        "cpu_ns_per_sample": round(min(cost_ns), 1),
+        "samples_to_convergence": samples_to_convergence(angles, true_angle, tolerance, hold),
+        "steady_state_error_deg": round(tail_error, 4)
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark MPU6050 pitch fusion filters')
+    parser.add_argument('--samples', type=int, default=2000, help='Samples per run')
+    parser.add_argument('--rate-hz', type=float, default=50.0, help='Sample rate')
+    parser.add_argument('--angle', type=float, default=12.0, help='True arm angle (degrees)')
+    parser.add_argument('--accel-noise', type=float, default=1.0, help='Accel angle noise sigma (degrees)')
+    parser.add_argument('--gyro-bias', type=float, default=0.5, help='Gyro bias (degrees/second)')
+    parser.add_argument('--gyro-noise', type=float, default=0.2, help='Gyro noise sigma (degrees/second)')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Convergence band (degrees)')
+    parser.add_argument('--hold', type=int, default=25, help='Samples the error must stay in band')
+    parser.add_argument('--repeats', type=int, default=5, help='Timing repeats (best is reported)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    dt = 1.0 / args.rate_hz
+    samples = generate_samples(args.samples, args.angle, args.accel_noise,
+                               args.gyro_bias, args.gyro_noise, args.seed)
+
+    results = [
+        benchmark_filter(name, samples, dt, args.angle, args.tolerance, args.hold, args.repeats)
+        for name in FILTERS
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'filter':<15}{'ns/sample':>12}{'converged @':>14}{'steady err (°)':>16}")
+    for r in results:
+        converged = r["samples_to_convergence"]
+        converged = "never" if converged is None else str(converged)
+        print(f"{r['filter']:<15}{r['cpu_ns_per_sample']:>12.1f}{converged:>14}{r['steady_state_error_deg']:>16.4f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/benchmark_filters.py
+═══════════════════════════════════════════════════════════════
+"""
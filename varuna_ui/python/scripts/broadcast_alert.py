@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/broadcast_alert.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/scripts/broadcast_alert.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import json
+import argparse
+import contextlib
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from varuna.alert_broadcast import AlertBroadcaster, AlertLog
+
+
+def load_config():
+    """Load configuration from config.json file."""
+    config_path = script_dir.parent / "config" / "config.json"
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"WARNING: Failed to load config - {e}", file=sys.stderr)
+        return {}
+
+
+def parse_recipients(values):
+    """Flatten repeated/comma-separated --to values."""
+    recipients = []
+    for value in values or []:
+        recipients.extend(number.strip() for number in value.split(',') if number.strip())
+    return recipients
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Send one alert to many recipients')
+    parser.add_argument('message', help='Alert text (long text is sent as concatenated SMS)')
+    parser.add_argument('--to', action='append',
+                        help='Recipient(s), comma-separated or repeated (default: alerts.recipients)')
+    parser.add_argument('--key', default=None,
+                        help='Alert condition for repeat suppression, e.g. DANGER (default: message text)')
+    parser.add_argument('--window-min', type=float, default=None,
+                        help='Suppress repeats of the same alert within this many minutes')
+    parser.add_argument('--port', default=None, help='Serial port for SIM800L')
+    parser.add_argument('--via-outbox', action='store_true',
+                        help='Queue CRITICAL outbox messages instead of opening the modem '
+                             '(use while sms_outbox_service.py owns the port)')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Accept a missing modem (messages are only logged)')
+
+    args = parser.parse_args()
+    config = load_config()
+    alerts_config = config.get("alerts", {})
+
+    recipients = parse_recipients(args.to) or alerts_config.get("recipients", [])
+    if not recipients:
+        print("ERROR: No recipients (use --to or alerts.recipients in config.json)", file=sys.stderr)
+        return 1
+
+    window_min = args.window_min if args.window_min is not None else alerts_config.get("dedup_window_minutes", 30)
+    log = AlertLog(script_dir.parent / alerts_config.get("log_path", "data/alert_log.db"))
+
+    # Driver diagnostics go to stderr; stdout carries only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        gsm = None
+        try:
+            if args.via_outbox:
+                from varuna.sms_outbox import SMSOutbox
+
+                outbox_config = config.get("sms_outbox", {})
+                outbox = SMSOutbox(script_dir.parent / outbox_config.get("path", "data/sms_outbox.db"))
+
+                def send(phone, message):
+                    return outbox.enqueue(phone, message, priority="CRITICAL") is not None
+
+                broadcaster = AlertBroadcaster(send, log, window_min * 60.0, queued=True)
+                report = broadcaster.broadcast(recipients, args.message, args.key)
+                outbox.close()
+            else:
+                from sensor_drivers.sim800l_driver import SIM800L
+
+                port = args.port or config.get("sms_outbox", {}).get("port", "/dev/ttyUSB0")
+                gsm = SIM800L(port=port, baudrate=9600, timeout=10, event_driven=True)
+                if gsm.serial_port is None and not args.simulate:
+                    print(f"ERROR: Modem unavailable on {port}", file=sys.stderr)
+                    return 1
+
+                broadcaster = AlertBroadcaster(gsm.send_sms, log, window_min * 60.0)
+                report = broadcaster.broadcast(recipients, args.message, args.key)
+        finally:
+            if gsm:
+                gsm.close()
+            log.prune()
+            log.close()
+
+    print(json.dumps(report))
+    print(f"Broadcast: {report['sent'] + report['queued']}/{report['recipients']} delivered, "
+          f"{report['failed']} failed, {report['suppressed']} suppressed in {report['elapsed_s']}s",
+          file=sys.stderr)
+
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/broadcast_alert.py
+═══════════════════════════════════════════════════════════════
+"""
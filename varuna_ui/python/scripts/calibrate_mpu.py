@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/calibrate_mpu.py
+PHASE: PRODUCTION - Real MPU6050 Integration
+LOCATION: varuna_ui/python/scripts/calibrate_mpu.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from sensor_drivers.mpu6050_driver import MPU6050
+from varuna.config_manager import save_calibration, ConfigError
+
+config_path = script_dir.parent / "config" / "config.json"
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Calibrate the MPU6050 and save the offset and gyro bias to config.json')
+    parser.add_argument('--samples', type=int, default=100, help='Minimum still samples before stopping early')
+    parser.add_argument('--target-stderr', type=float, default=0.02,
+                        help='Stop once the standard error of the pitch is below this (degrees)')
+    parser.add_argument('--max-seconds', type=float, default=15.0, help='Give up sampling after this long')
+    parser.add_argument('--force', action='store_true',
+                        help='Save the result even if it did not reach --target-stderr')
+    parser.add_argument('--yes', action='store_true', help='Do not wait for ENTER before starting')
+    parser.add_argument('--dry-run', action='store_true', help='Print the result as JSON without saving it')
+    parser.add_argument('--simulate-i2c', action='store_true',
+                        help='Use the simulated MPU6050 register model instead of /dev/i2c-1')
+
+    args = parser.parse_args()
+
+    print("=== MPU6050 CALIBRATION ===", file=sys.stderr)
+    print("IMPORTANT: Position the arm HORIZONTAL before starting", file=sys.stderr)
+    if not args.yes:
+        print("Press ENTER when ready...", file=sys.stderr)
+        input()
+
+    smbus = None
+    if args.simulate_i2c:
+        from sensor_drivers.simulated_hardware import FakeSMBus
+        smbus = FakeSMBus(bus=1)
+
+    try:
+        mpu = MPU6050(address=0x68, bus=1, smbus=smbus)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        result = mpu.calibrate_static(target_stderr=args.target_stderr, min_samples=args.samples,
+                                      max_seconds=args.max_seconds)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        mpu.close()
+
+    offset = result["offset_deg"]
+    if args.dry_run:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    if not result["converged"] and not args.force:
+        print(f"ERROR: Pitch uncertainty {result['stderr_deg']:.3f}° is above {args.target_stderr}° - "
+              f"keep the arm still and retry, or use --force. Nothing saved.", file=sys.stderr)
+        return 1
+
+    # Atomic rename: a running reader sees the old or the new file and
+    # picks the new offset and gyro bias up on its next reading
+    try:
+        save_calibration(config_path, result)
+    except (OSError, ConfigError) as e:
+        print(f"ERROR: Could not save offset {offset:.2f} - {e}", file=sys.stderr)
+        return 1
+
+    print(f"Calibration complete: mpu6050_offset = {offset:.2f} saved to {config_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/calibrate_mpu.py
+═══════════════════════════════════════════════════════════════
+"""
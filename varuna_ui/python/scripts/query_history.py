@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/query_history.py
+PHASE: PRODUCTION - Station Services
+LOCATION: varuna_ui/python/scripts/query_history.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from varuna.history import ReadingHistory, STATUS_CODES
+
+
+def load_history_config():
+    """Read the "history" section of config.json."""
+    config_path = script_dir.parent / "config" / "config.json"
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f).get("history", {})
+    except Exception as e:
+        print(f"WARNING: Failed to load config - {e}", file=sys.stderr)
+        return {}
+
+
+def summarize(records):
+    """Min/max/mean water level over a record array."""
+    if len(records) == 0:
+        return {"count": 0}
+
+    levels = records["level"]
+    return {
+        "count": int(len(records)),
+        "first": float(records["timestamp"][0]),
+        "last": float(records["timestamp"][-1]),
+        "level_min_cm": round(float(levels.min()), 1),
+        "level_max_cm": round(float(levels.max()), 1),
+        "level_mean_cm": round(float(levels.mean()), 1)
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Query the on-device reading history')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--last', type=int, default=60, help='Newest N records (default 60)')
+    group.add_argument('--hours', type=float, help='Records from the last H hours')
+    parser.add_argument('--summary', action='store_true', help='Print level statistics only')
+    parser.add_argument('--path', help='Ring file (default from config.json)')
+
+    args = parser.parse_args()
+
+    history_config = load_history_config()
+    path = args.path or script_dir.parent / history_config.get("path", "data/history.ring")
+
+    if not Path(path).exists():
+        print(f"ERROR: History file not found: {path}", file=sys.stderr)
+        return 1
+
+    history = ReadingHistory(path, sync_every=0)
+
+    if args.hours is not None:
+        records = history.since(time.time() - args.hours * 3600.0)
+    else:
+        records = history.latest(args.last)
+
+    if args.summary:
+        print(json.dumps(summarize(records)))
+    else:
+        status_names = {code: name for name, code in STATUS_CODES.items()}
+        print(json.dumps({
+            "timestamp": records["timestamp"].tolist(),
+            "pitch_angle": records["pitch"].astype("f8").round(2).tolist(),
+            "water_level_cm": records["level"].astype("f8").round(1).tolist(),
+            "temperature": records["temperature"].astype("f8").round(1).tolist(),
+            "humidity": records["humidity"].astype("f8").round(1).tolist(),
+            "status": [status_names.get(int(code), "UNKNOWN") for code in records["status"]]
+        }))
+
+    del records
+    history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/query_history.py
+═══════════════════════════════════════════════════════════════
+"""
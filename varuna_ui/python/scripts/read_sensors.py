@@ -11,6 +11,14 @@ LOCATION: varuna_ui/python/scripts/read_sensors.py
 import sys
 import os
 import json
+import time
+
+# Cold-start reference for --profile-startup (everything above is builtin)
+_START = time.perf_counter()
+
+import signal
+import socket
+import argparse
 from datetime import datetime
 from pathlib import Path
 
@@ -19,106 +27,949 @@ script_dir = Path(__file__).parent
 lib_dir = script_dir.parent / "lib"
 sys.path.insert(0, str(lib_dir))
 
-# Import sensor drivers
-from sensor_drivers.mpu6050_driver import MPU6050
+# Drivers are imported by the registry, and only if enabled in config.json
+from sensor_drivers.registry import DriverRegistry
+from sensor_drivers.fusion_filters import create_filter
+from sensor_drivers.metrics import Metrics, TextfileExporter, span
+from varuna.rate_estimator import create_estimator
+from varuna.acquisition import ConcurrentAcquisition
+from varuna.consensus import create_consensus
+from varuna.scheduler import create_scheduler, read_battery_percent, load_state, save_state
+from varuna.config_manager import ConfigManager, ConfigError
 
-# Try to import DHT22 (optional)
-try:
-    from sensor_drivers.dht22_driver import DHT22
-    DHT_AVAILABLE = True
-except:
-    DHT_AVAILABLE = False
 
+config_path = script_dir.parent / "config" / "config.json"
+
+DEFAULT_CONFIG = {
+    "calibration": {
+        "L_arm": 1.5,
+        "H_pivot": 2.0,
+        "R_float": 0.15,
+        "mpu6050_offset": 0.0
+    }
+}
+
+# Sections read once at startup; changing them needs a reader restart
+RESTART_SECTIONS = ("drivers", "fusion", "mpu6050", "acquisition", "consensus", "scheduler",
+                    "rate_estimator", "history", "uplink", "metrics", "alert_engine")
+
+
+class StartupProfile:
+    """Wall-clock breakdown of a cold start, printed by --profile-startup."""
+
+    def __init__(self):
+        self.phases = []
+        self._mark = _START
+
+    def mark(self, phase):
+        """Close the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._mark) * 1000.0))
+        self._mark = now
+
+    def report(self, registry, budget_ms=None):
+        """
+        Print the breakdown to stderr (stdout carries only the record).
+
+        Args:
+            registry: DriverRegistry whose per-driver times are listed
+            budget_ms: Startup budget from "reader.startup_budget_ms", or None
+        """
+        interpreter_ms = process_age_ms()
+        if interpreter_ms is not None:
+            # Process start to the first line of this script
+            interpreter_ms = max(0.0, interpreter_ms - (time.perf_counter() - _START) * 1000.0)
+
+        print("Startup profile (ms):", file=sys.stderr)
+        if interpreter_ms is not None:
+            print(f"  {'interpreter':<28}{interpreter_ms:>8.1f}", file=sys.stderr)
+        for phase, ms in self.phases:
+            print(f"  {phase:<28}{ms:>8.1f}", file=sys.stderr)
+        total = sum(ms for _, ms in self.phases) + (interpreter_ms or 0.0)
+        print(f"  {'total':<28}{total:>8.1f}", file=sys.stderr)
+
+        # Already counted in the phases above (the DHT22 of a one-shot
+        # reading loads on its worker, in parallel with the MPU6050)
+        print("Drivers (ms):", file=sys.stderr)
+        for name, timing in registry.profile().items():
+            print(f"  {name:<12}import {timing['import_ms']:>7.1f}  init {timing['init_ms']:>7.1f}  "
+                  f"{timing['status']}", file=sys.stderr)
+        if budget_ms is not None and total > budget_ms:
+            print(f"WARNING: Startup took {total:.0f} ms, budget is {budget_ms} ms", file=sys.stderr)
 
-def load_config():
-    """Load configuration from config.json file."""
-    config_path = script_dir.parent / "config" / "config.json"
 
+def process_age_ms():
+    """Milliseconds since this process started (Linux only, 10 ms resolution)."""
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        return config
-    except FileNotFoundError:
-        print(f"WARNING: Config file not found, using defaults", file=sys.stderr)
-        return {
-            "calibration": {
-                "L_arm": 1.5,
-                "H_pivot": 2.0,
-                "R_float": 0.15,
-                "mpu6050_offset": 0.0
-            }
-        }
-    except Exception as e:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        started = start_ticks / os.sysconf("SC_CLK_TCK")
+        return (time.clock_gettime(time.CLOCK_BOOTTIME) - started) * 1000.0
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def open_config():
+    """ConfigManager for config.json (defaults while the file is missing)."""
+    return ConfigManager(config_path, defaults=DEFAULT_CONFIG)
+
+
+def load_config(config_manager=None):
+    """Load configuration from config.json file."""
+    try:
+        return (config_manager or open_config()).get()
+    except ConfigError as e:
         print(f"ERROR: Failed to load config - {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def main():
-    """Main function - reads REAL sensors and outputs JSON."""
-    try:
-        # Load configuration
-        config = load_config()
-        calib = config.get("calibration", {})
-
-        # Get calibration constants
-        L_arm = calib.get("L_arm", 1.5)
-        H_pivot = calib.get("H_pivot", 2.0)
-        R_float = calib.get("R_float", 0.15)
-        mpu_offset = calib.get("mpu6050_offset", 0.0)
-
-        # Initialize MPU6050 with REAL hardware
-        mpu = MPU6050(
-            address=0x68,
-            bus=1,
-            calibration_offset=mpu_offset
-        )
+def apply_config_change(mpu, old, new, scheduler=None, engine=None):
+    """
+    Apply a reloaded configuration to a running reader.
 
-        # Read MPU6050 data
-        mpu_data = mpu.read_sensor_data(
-            L_arm=L_arm,
-            H_pivot=H_pivot,
-            R_float=R_float,
-            num_samples=10
-        )
+    L_arm, H_pivot and R_float are read from the configuration snapshot of
+    each reading, so only the MPU6050 offset and gyro bias have to be
+    pushed to the driver, and the warning/danger levels to the scheduler
+    and the alert engine.
 
-        # Read DHT22 if available
-        if DHT_AVAILABLE:
-            try:
-                dht = DHT22(pin=4)
-                dht_data = dht.read_sensor_data()
-                dht.close()
-            except Exception as e:
-                print(f"WARNING: DHT22 read failed - {e}", file=sys.stderr)
-                dht_data = {
-                    "temperature": 0.0,
-                    "humidity": 0.0,
-                    "status": "FAULT"
-                }
-        else:
-            dht_data = {
+    Args:
+        mpu: Running MPU6050 instance
+        old: Previous configuration dictionary
+        new: Reloaded configuration dictionary
+        scheduler: AdaptiveScheduler to update, or None
+        engine: AlertEngine to update, or None
+    """
+    offset = new.get("calibration", {}).get("mpu6050_offset", 0.0)
+    if offset != mpu.calibration_offset:
+        print(f"Config: MPU6050 offset {mpu.calibration_offset:.2f} -> {offset:.2f}", file=sys.stderr)
+        mpu.calibration_offset = offset
+
+    gyro_bias = tuple(new.get("calibration", {}).get("gyro_bias_dps", (0.0, 0.0, 0.0)))
+    if gyro_bias != mpu.gyro_bias:
+        print(f"Config: MPU6050 gyro bias {mpu.gyro_bias} -> {gyro_bias}", file=sys.stderr)
+        mpu.gyro_bias = gyro_bias
+
+    thresholds = new.get("thresholds", {})
+    if thresholds != old.get("thresholds", {}):
+        warning = thresholds.get("warning_level_cm", 200.0)
+        danger = thresholds.get("danger_level_cm", 250.0)
+        print(f"Config: Thresholds warning {warning} cm, danger {danger} cm", file=sys.stderr)
+        if scheduler is not None:
+            scheduler.warning_cm, scheduler.danger_cm = warning, danger
+        if engine is not None:
+            engine.thresholds.update(WARNING=warning, DANGER=danger)
+
+    for section in RESTART_SECTIONS:
+        if old.get(section) != new.get(section):
+            print(f"WARNING: '{section}' changed, restart the reader to apply it", file=sys.stderr)
+
+
+def read_dht22(dht=None, registry=None, metrics=None):
+    """
+    Read the DHT22, optionally reusing an already constructed driver.
+
+    Args:
+        dht: Open DHT22 instance, or None to construct and close one
+        registry: DriverRegistry used to construct the driver
+        metrics: Metrics for a driver constructed here, or None
+
+    Returns:
+        DHT22 data dictionary
+    """
+    try:
+        if dht is not None:
+            return dht.read_sensor_data()
+
+        dht = registry.create("dht22", metrics=metrics)
+        if dht is None:
+            return {
                 "temperature": 0.0,
                 "humidity": 0.0,
-                "status": "NOT_INSTALLED"
+                "status": registry.status("dht22")
             }
+        dht_data = dht.read_sensor_data()
+        dht.close()
+        return dht_data
+    except Exception as e:
+        print(f"WARNING: DHT22 read failed - {e}", file=sys.stderr)
+        return {
+            "temperature": 0.0,
+            "humidity": 0.0,
+            "status": "FAULT"
+        }
+
+
+def create_acquisition(config, dht=None, registry=None, metrics=None):
+    """
+    Register the slow sensors that are read alongside the MPU6050 loop.
+
+    Deadlines come from "acquisition.deadline_ms" in config.json.
+
+    Args:
+        config: Parsed configuration dictionary
+        dht: Open DHT22 instance, or None for a one-shot read
+        registry: DriverRegistry for one-shot reads (one is created if None)
+        metrics: Metrics for the one-shot DHT22 driver, or None
+
+    Returns:
+        ConcurrentAcquisition instance
+    """
+    deadlines = config.get("acquisition", {}).get("deadline_ms", {})
+    registry = registry or DriverRegistry(config)
+
+    acquisition = ConcurrentAcquisition()
+    acquisition.register(
+        "dht22",
+        lambda: read_dht22(dht, registry, metrics),
+        deadlines.get("dht22", 1500) / 1000.0,
+        {"temperature": 0.0, "humidity": 0.0, "status": "FAULT"}
+    )
+    return acquisition
+
+
+def apply_profile(mpu, profile):
+    """
+    Configure the MPU6050 for a scheduler profile.
 
-        # Build output data
-        output = {
-            "device_id": config.get("device_id", "CWC-RJ-001"),
-            "timestamp": datetime.now().isoformat(),
-            "mpu6050": mpu_data,
-            "dht22": dht_data,
-            "consensus_level_cm": mpu_data["water_level_cm"],
-            "rate_of_change_cm_per_hour": 0.0,
-            "calibration": calib
+    Args:
+        mpu: Initialized MPU6050 instance
+        profile: Scheduler profile, or None for the fixed defaults
+
+    Returns:
+        Tuple of (num_samples, seconds between polled samples)
+    """
+    if profile is None:
+        return 10, 0.02
+
+    rate_hz = profile["sample_rate_hz"]
+    # The FIFO is re-timed only when the rate actually changes
+    if mpu.fifo_enabled and abs(1.0 / mpu.fifo_sample_period - rate_hz) > 0.5:
+        mpu.enable_fifo(sample_rate_hz=rate_hz)
+    return profile["num_samples"], 1.0 / rate_hz
+
+
+def acquire_reading(config, mpu, dht=None, rate=None, acquisition=None, consensus=None, scheduler=None,
+                    metrics=None):
+    """
+    Take one complete reading and build the output record.
+
+    Args:
+        config: Parsed configuration dictionary
+        mpu: Initialized MPU6050 instance
+        dht: Open DHT22 instance, or None for a one-shot read
+        rate: SlidingWindowRate fed with every usable consensus level, or None
+        acquisition: ConcurrentAcquisition reused across readings, or None
+                     to create one for this reading
+        consensus: LevelConsensus reused across readings (it adapts the
+                   per-sensor noise), or None to create one
+        scheduler: AdaptiveScheduler whose profile sets the samples per
+                   reading and that is fed the result, or None for the
+                   fixed 10 samples
+        metrics: Metrics that times the acquisition, consensus and rate
+                 stages, or None
+
+    Returns:
+        Output record dictionary (the schema Backend::parseJsonData expects)
+    """
+    calib = config.get("calibration", {})
+
+    if acquisition is None:
+        acquisition = create_acquisition(config, dht)
+
+    num_samples, sample_interval = apply_profile(mpu, scheduler.profile if scheduler else None)
+
+    # Sample the MPU6050 here while the slower sensors are read on workers
+    with span(metrics, "acquire"):
+        mpu_data, sensors = acquisition.acquire(lambda: mpu.read_sensor_data(
+            L_arm=calib.get("L_arm", 1.5),
+            H_pivot=calib.get("H_pivot", 2.0),
+            R_float=calib.get("R_float", 0.15),
+            num_samples=num_samples,
+            sample_interval=sample_interval
+        ))
+    dht_data = sensors["dht22"]
+
+    # Every sensor that reports a level (float arm, and ultrasonic or
+    # pressure once registered) votes; outliers are dropped, not re-read
+    if consensus is None:
+        consensus = create_consensus(config.get("consensus"))
+    levels = {"mpu6050": mpu_data}
+    levels.update({name: data for name, data in sensors.items() if "water_level_cm" in data})
+    with span(metrics, "consensus"):
+        result = consensus.update(levels)
+
+    level = result["level_cm"]
+    if level is None:
+        # No usable source: keep the float arm's value, flagged FAULT below
+        level = mpu_data["water_level_cm"]
+
+    now = datetime.now()
+
+    # Regression slope over the recent window (faulty levels are skipped)
+    slope, confidence = 0.0, 0.0
+    if rate is not None:
+        with span(metrics, "rate"):
+            if result["status"] != "FAULT":
+                rate.add(now.timestamp(), level)
+            slope, confidence, _ = rate.estimate()
+
+    # Choose the profile for the next reading from this one
+    schedule = None
+    if scheduler is not None:
+        battery = read_battery_percent(config.get("scheduler", {}).get("battery_path"))
+        scheduler.update(result["level_cm"], slope if rate is not None else None, confidence, battery)
+        schedule = {
+            "mode": scheduler.mode,
+            "next_interval_ms": scheduler.profile["interval_ms"],
+            "samples": num_samples
         }
 
-        # Output ONLY valid JSON to stdout
-        print(json.dumps(output))
+    # Build output data
+    output = {
+        "device_id": config.get("device_id", "CWC-RJ-001"),
+        "location": config.get("location"),
+        "timestamp": now.isoformat(),
+        "mpu6050": mpu_data,
+        "dht22": dht_data,
+        "consensus_level_cm": round(level, 2),
+        "consensus": {
+            "status": result["status"],
+            "used": result["used"],
+            "rejected": result["rejected"],
+            "spread_cm": None if result["spread_cm"] is None else round(result["spread_cm"], 2)
+        },
+        "rate_of_change_cm_per_hour": round(slope, 2),
+        "rate_confidence": round(confidence, 3),
+        "calibration": calib
+    }
+
+    if schedule is not None:
+        output["schedule"] = schedule
+
+    # Additional level sensors are published under their own names
+    for name, data in sensors.items():
+        output.setdefault(name, data)
+
+    return output
+
+
+def create_session(output_format, config):
+    """
+    Encoder factory for the selected output format.
+
+    Binary encoders keep per-receiver state (what was last sent), so every
+    receiver gets its own session from the factory.
+
+    Args:
+        output_format: "json" or "binary"
+        config: Parsed configuration dictionary ("reader.epsilon")
+
+    Returns:
+        Callable returning an encode(record) -> bytes function, or None
+        for JSON lines
+    """
+    if output_format != "binary":
+        return None
+
+    from varuna.binary_frames import FrameEncoder
+    epsilon = config.get("reader", {}).get("epsilon")
+    return lambda: FrameEncoder(epsilon).encode
+
 
-        # Close sensor
+def write_record(output, encode=None, metrics=None):
+    """Write one record to stdout as a JSON line or as binary frames."""
+    if encode is None:
+        with span(metrics, "json_encode"):
+            line = json.dumps(output)
+        print(line, flush=True)
+    else:
+        with span(metrics, "binary_encode"):
+            data = encode(output)
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+
+class SocketBroadcaster:
+    """Streams records to every client of a Unix socket."""
+
+    def __init__(self, path, client_timeout=1.0, session=None):
+        """
+        Create and bind the listening socket.
+
+        Args:
+            path: Filesystem path of the Unix domain socket
+            client_timeout: Send timeout per client in seconds
+            session: Encoder factory from create_session (one encoder per
+                     client), or None for newline-delimited JSON
+        """
+        self.path = path
+        self.client_timeout = client_timeout
+        self.session = session
+        self.clients = []      # (socket, encode function or None)
+
+        # Remove a stale socket left behind by a previous run
+        if os.path.exists(path):
+            os.unlink(path)
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(8)
+        self.server.setblocking(False)
+        print(f"Daemon: Streaming records on unix socket {path}", file=sys.stderr)
+
+    def _accept_pending(self):
+        """Accept every client that connected since the last record."""
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            client.settimeout(self.client_timeout)
+            self.clients.append((client, self.session() if self.session else None))
+
+    def send(self, record):
+        """Send one record to all connected clients, dropping dead ones."""
+        self._accept_pending()
+        line = None
+
+        for entry in list(self.clients):
+            client, encode = entry
+            if encode is not None:
+                data = encode(record)
+            else:
+                if line is None:
+                    line = (json.dumps(record) + "\n").encode()
+                data = line
+            try:
+                client.sendall(data)
+            except OSError:
+                client.close()
+                self.clients.remove(entry)
+
+    def close(self):
+        """Close all clients and remove the socket file."""
+        for client, _ in self.clients:
+            client.close()
+        self.clients = []
+        self.server.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def open_history(config):
+    """
+    Open the on-device reading history configured under "history".
+
+    Args:
+        config: Parsed configuration dictionary
+
+    Returns:
+        ReadingHistory instance, or None if disabled or unavailable
+    """
+    history_config = config.get("history")
+    if not history_config or not history_config.get("enabled", True):
+        return None
+
+    # Reading history needs numpy, so it is only imported when enabled
+    try:
+        from varuna.history import ReadingHistory
+    except ImportError:
+        print("WARNING: numpy not installed, reading history disabled", file=sys.stderr)
+        return None
+
+    path = script_dir.parent / history_config.get("path", "data/history.ring")
+    try:
+        return ReadingHistory(path, capacity=history_config.get("capacity", 525600))
+    except Exception as e:
+        print(f"WARNING: Cannot open reading history - {e}", file=sys.stderr)
+        return None
+
+
+def record_history(history, output):
+    """Append a record to the history without letting failures stop the reader."""
+    if history is None:
+        return
+    try:
+        history.append_reading(output)
+    except Exception as e:
+        print(f"WARNING: History append failed - {e}", file=sys.stderr)
+
+
+def open_uplink_buffer(config):
+    """
+    Open the telemetry uplink buffer if "uplink" is enabled.
+
+    Returns:
+        UplinkBuffer, or None if disabled or unavailable
+    """
+    if not config.get("uplink", {}).get("enabled", False):
+        return None
+    from varuna.uplink import open_uplink
+    try:
+        return open_uplink(config, script_dir.parent)
+    except Exception as e:
+        print(f"WARNING: Cannot open uplink buffer - {e}", file=sys.stderr)
+        return None
+
+
+def record_uplink(uplink, output):
+    """Buffer a record for the uplink without letting failures stop the reader."""
+    if uplink is None:
+        return
+    try:
+        uplink.add(output)
+    except Exception as e:
+        print(f"WARNING: Uplink buffer append failed - {e}", file=sys.stderr)
+
+
+def create_metrics(config, enable=False):
+    """
+    Set up pipeline metrics if "metrics.enabled" in config.json (or --metrics).
+
+    Args:
+        config: Parsed configuration dictionary
+        enable: Enable regardless of config.json
+
+    Returns:
+        Tuple of (Metrics, TextfileExporter or None), or (None, None) when
+        disabled; the drivers then skip timing altogether
+    """
+    metrics_config = config.get("metrics", {})
+    if not (enable or metrics_config.get("enabled", False)):
+        return None, None
+
+    metrics = Metrics()
+    exporter = None
+    textfile = metrics_config.get("textfile", "data/metrics/varuna_reader.prom")
+    if textfile:
+        exporter = TextfileExporter(
+            metrics,
+            script_dir.parent / textfile,
+            interval=metrics_config.get("textfile_interval_s", 15.0),
+            labels={"device_id": config.get("device_id", "CWC-RJ-001")}
+        )
+    return metrics, exporter
+
+
+def with_metrics(output, metrics, config):
+    """
+    The record to write, with a "_metrics" snapshot unless metrics.output
+    is false. A copy, so history and uplink never store the block.
+    """
+    if metrics is None or not config.get("metrics", {}).get("output", True):
+        return output
+    return dict(output, _metrics=metrics.snapshot())
+
+
+def create_alerting(config, state=None, metrics=None):
+    """
+    Set up the on-device alert engine if "alert_engine.enabled".
+
+    The SIM800L is opened on the notifier thread at the first alert (and
+    closed after alert_engine.idle_close_s), so readings never wait for it.
+
+    Args:
+        config: Parsed configuration dictionary
+        state: Saved AlertEngine.state() for one-shot readings, or None
+        metrics: Metrics for the "alert_latency" stage and AT timing, or None
+
+    Returns:
+        Tuple of (AlertEngine, AlertNotifier or None), or (None, None) when
+        disabled
+    """
+    if not config.get("alert_engine", {}).get("enabled", False):
+        return None, None
+    from varuna.alert_engine import create_alert_engine, create_notifier
+    engine = create_alert_engine(config, state)
+    port = config["alert_engine"].get("port") or config.get("sms_outbox", {}).get("port", "/dev/ttyUSB0")
+
+    def open_modem():
+        from sensor_drivers.sim800l_driver import SIM800L
+        gsm = SIM800L(port=port, baudrate=9600, timeout=10, event_driven=True, metrics=metrics)
+        if gsm.serial_port is None:
+            gsm.close()
+            return None
+        return gsm
+
+    try:
+        notifier = create_notifier(config, script_dir.parent, open_modem, metrics)
+    except Exception as e:
+        print(f"WARNING: Cannot start alert notifier - {e}", file=sys.stderr)
+        notifier = None
+    return engine, notifier
+
+
+def check_alerts(engine, notifier, output):
+    """
+    Evaluate a record, hand any alerts to the notifier and add the
+    "alerts" list (active alert keys) to the record.
+    """
+    if engine is None:
+        return
+    events = engine.evaluate(
+        output["consensus_level_cm"],
+        output["rate_of_change_cm_per_hour"],
+        output["rate_confidence"],
+        output["consensus"]["status"]
+    )
+    if events and notifier:
+        notifier.submit(events)
+    output["alerts"] = engine.active()
+
+
+def create_rate_estimator(config, history=None):
+    """
+    Build the rate-of-change estimator, primed from the reading history.
+
+    One-shot invocations start a fresh process per reading, so the window
+    is reloaded from the history ring instead of starting empty.
+
+    Args:
+        config: Parsed configuration dictionary
+        history: Open ReadingHistory, or None
+
+    Returns:
+        SlidingWindowRate instance
+    """
+    rate = create_estimator(config.get("rate_estimator"))
+
+    if history is not None:
+        from varuna.history import STATUS_CODES
+        ok = STATUS_CODES["OK"]
+        for record in history.since(time.time() - rate.window):
+            if record["status"] == ok:
+                rate.add(float(record["timestamp"]), float(record["level"]))
+
+    return rate
+
+
+def create_mpu(config, smbus=None, registry=None, metrics=None):
+    """
+    Initialize the MPU6050 from configuration.
+
+    The "fusion" section selects the pitch filter. An optional
+    "mpu6050": {"fifo_rate_hz": N} section switches the driver to
+    hardware-timed FIFO sampling at N Hz.
+
+    Args:
+        config: Parsed configuration dictionary
+        smbus: SMBus-like object to use instead of /dev/i2c-1, or None
+        registry: DriverRegistry to construct the driver with (one is
+                  created if None); address and bus come from
+                  "drivers.mpu6050"
+        metrics: Metrics the driver times I2C and the filter into, or None
+
+    Returns:
+        Initialized MPU6050 instance
+    """
+    calib = config.get("calibration", {})
+    registry = registry or DriverRegistry(config)
+
+    # Initialize MPU6050 with REAL hardware
+    mpu = registry.create(
+        "mpu6050",
+        calibration_offset=calib.get("mpu6050_offset", 0.0),
+        gyro_bias=calib.get("gyro_bias_dps", (0.0, 0.0, 0.0)),
+        fusion_filter=create_filter(config.get("fusion")),
+        smbus=smbus,
+        metrics=metrics
+    )
+    if mpu is None:
+        # The water level comes from the MPU6050; there is no record without it
+        raise RuntimeError(f"MPU6050 driver is {registry.status('mpu6050')}")
+
+    fifo_rate = config.get("mpu6050", {}).get("fifo_rate_hz")
+    if fifo_rate:
+        mpu.enable_fifo(sample_rate_hz=fifo_rate)
+
+    return mpu
+
+
+def run_once(config, smbus=None, registry=None, profile=None, session=None, metrics=None, exporter=None):
+    """
+    One-shot mode: initialize, take a single reading, print it and exit.
+
+    Args:
+        config: Parsed configuration dictionary
+        smbus: SMBus-like object to use instead of /dev/i2c-1, or None
+        registry: DriverRegistry (one is created if None)
+        profile: StartupProfile to mark phases on, or None
+        session: Encoder factory from create_session, or None for JSON
+        metrics: Metrics from create_metrics, or None
+        exporter: TextfileExporter written once before exit, or None
+
+    Returns:
+        Process exit code
+    """
+    registry = registry or DriverRegistry(config)
+    mark = profile.mark if profile else (lambda phase: None)
+
+    mpu = create_mpu(config, smbus, registry, metrics)
+    mark("mpu6050")
+    history = open_history(config)
+    rate = create_rate_estimator(config, history)
+    mark("history")
+
+    # The mode survives between one-shot processes in a small state file
+    state_path = script_dir.parent / config.get("scheduler", {}).get("state_path", "data/scheduler_state.json")
+    state = load_state(state_path)
+    scheduler = create_scheduler(config, state)
+
+    alert_state_path = script_dir.parent / config.get("alert_engine", {}).get("state_path", "data/alert_state.json")
+    alert_state = load_state(alert_state_path) if config.get("alert_engine", {}).get("enabled", False) else None
+    engine, notifier = create_alerting(config, alert_state, metrics)
+
+    # The DHT22 is imported and constructed on its acquisition worker
+    acquisition = create_acquisition(config, registry=registry, metrics=metrics)
+    with span(metrics, "reading"):
+        output = acquire_reading(config, mpu, rate=rate, acquisition=acquisition, scheduler=scheduler,
+                                 metrics=metrics)
+        check_alerts(engine, notifier, output)
+
+        # Output ONLY the record (valid JSON by default) to stdout
+        write_record(with_metrics(output, metrics, config), session() if session else None, metrics)
+    mark("first reading")
+
+    with span(metrics, "history"):
+        record_history(history, output)
+    if history:
+        history.close()
+
+    uplink = open_uplink_buffer(config)
+    with span(metrics, "uplink"):
+        record_uplink(uplink, output)
+    if uplink:
+        uplink.close()
+
+    if scheduler and scheduler.state() != state:
+        try:
+            save_state(state_path, scheduler.state())
+        except OSError as e:
+            print(f"WARNING: Cannot save scheduler state - {e}", file=sys.stderr)
+
+    if engine and engine.state() != alert_state:
+        try:
+            save_state(alert_state_path, engine.state())
+        except OSError as e:
+            print(f"WARNING: Cannot save alert state - {e}", file=sys.stderr)
+
+    # Close sensor
+    mpu.close()
+
+    # Alerts raised by this reading are sent before the process exits
+    if notifier and not notifier.close(config["alert_engine"].get("max_latency_s", 30.0)):
+        print("WARNING: Alert delivery still pending at exit", file=sys.stderr)
+
+    if exporter:
+        exporter.write()
+
+    if profile:
+        profile.report(registry, config.get("reader", {}).get("startup_budget_ms"))
+
+    return 0
+
+
+def run_daemon(config, interval_ms, socket_path=None, smbus=None, config_manager=None,
+               registry=None, profile=None, session=None, metrics=None, exporter=None):
+    """
+    Daemon mode: initialize drivers once and stream one record per reading.
+
+    Readings are scheduled against absolute monotonic deadlines so the
+    period does not drift by the acquisition time. If a reading overruns
+    its slot the schedule restarts from now instead of bursting to catch up.
+    Without a fixed interval the "scheduler" section picks the interval
+    and samples per reading from the operating mode after every reading.
+
+    Args:
+        config: Parsed configuration dictionary
+        interval_ms: Fixed interval between readings in milliseconds, or
+                     None to follow the scheduler (reader.interval_ms when
+                     the scheduler is disabled)
+        socket_path: Unix socket path, or None to write to stdout
+        smbus: SMBus-like object to use instead of /dev/i2c-1, or None
+        config_manager: ConfigManager checked before every reading so
+                        calibration changes apply without a restart
+        registry: DriverRegistry (one is created if None)
+        profile: StartupProfile reported after the first record, or None
+        session: Encoder factory from create_session, or None for JSON lines
+        metrics: Metrics from create_metrics (cumulative since start), or None
+        exporter: TextfileExporter run on its own thread, or None
+
+    Returns:
+        Process exit code
+    """
+    scheduler = create_scheduler(config) if interval_ms is None else None
+    if interval_ms is None and scheduler is None:
+        interval_ms = config.get("reader", {}).get("interval_ms", 1000)
+
+    def current_interval():
+        return (scheduler.profile["interval_ms"] if scheduler else interval_ms) / 1000.0
+
+    interval = current_interval()
+
+    running = [True]
+
+    def stop(signum, frame):
+        running[0] = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    registry = registry or DriverRegistry(config)
+    mark = profile.mark if profile else (lambda phase: None)
+
+    mpu = create_mpu(config, smbus, registry, metrics)
+    mark("mpu6050")
+
+    dht = None
+    try:
+        dht = registry.create("dht22", metrics=metrics)
+        if dht:
+            # Readings come from the sampler's cache instead of blocking the
+            # loop; it samples often enough that the cache is never STALE
+            dht.start_sampler(interval=min(interval, dht.STALE_AFTER / 2))
+    except Exception as e:
+        print(f"WARNING: DHT22 init failed - {e}", file=sys.stderr)
+    mark("dht22")
+
+    history = open_history(config)
+    rate = create_rate_estimator(config, history)
+    mark("history")
+    uplink = open_uplink_buffer(config)
+    engine, notifier = create_alerting(config, metrics=metrics)
+    if config_manager:
+        config_manager.on_change(lambda old, new: apply_config_change(mpu, old, new, scheduler, engine))
+    acquisition = create_acquisition(config, dht, registry)
+    consensus = create_consensus(config.get("consensus"))
+    broadcaster = SocketBroadcaster(socket_path, session=session) if socket_path else None
+    encode = session() if session and not broadcaster else None
+    if scheduler:
+        print(f"Daemon: Started with adaptive schedule ({scheduler.mode}, "
+              f"{scheduler.profile['interval_ms']} ms)", file=sys.stderr)
+    else:
+        print(f"Daemon: Started with interval {interval_ms} ms", file=sys.stderr)
+    if exporter:
+        exporter.start()
+
+    try:
+        deadline = time.monotonic()
+        while running[0]:
+            started = time.perf_counter()
+            if config_manager:
+                # Cached; re-parsed only when config.json is replaced or edited
+                config = config_manager.get()
+            output = acquire_reading(config, mpu, dht, rate, acquisition, consensus, scheduler, metrics)
+            check_alerts(engine, notifier, output)
+            with span(metrics, "history"):
+                record_history(history, output)
+            with span(metrics, "uplink"):
+                record_uplink(uplink, output)
+
+            record = with_metrics(output, metrics, config)
+            if broadcaster:
+                with span(metrics, "broadcast"):
+                    broadcaster.send(record)
+            else:
+                try:
+                    write_record(record, encode, metrics)
+                except BrokenPipeError:
+                    print("Daemon: Reader closed stdout, stopping", file=sys.stderr)
+                    break
+            if metrics:
+                # Acquisition to output, without the sleep to the next slot
+                metrics.observe("reading", time.perf_counter() - started)
+
+            if profile:
+                mark("first reading")
+                profile.report(registry, config.get("reader", {}).get("startup_budget_ms"))
+                profile = None
+
+            interval = current_interval()
+            deadline += interval
+            if deadline <= time.monotonic():
+                deadline = time.monotonic()
+
+            # Sleep in short steps so a stop signal is not held up by a
+            # LOW_POWER interval of several minutes
+            while running[0]:
+                delay = deadline - time.monotonic()
+                if delay <= 0:
+                    break
+                time.sleep(min(delay, 0.5))
+    finally:
+        if notifier:
+            notifier.close(config.get("alert_engine", {}).get("max_latency_s", 30.0))
+        if exporter:
+            exporter.stop()
+        if broadcaster:
+            broadcaster.close()
+        if history:
+            history.close()
+        if uplink:
+            uplink.close()
+        if dht:
+            dht.close()
         mpu.close()
+        print("Daemon: Stopped", file=sys.stderr)
+
+    return 0
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Read Varuna sensors and output JSON')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep drivers open and stream one record per reading')
+    parser.add_argument('--interval-ms', type=int, default=None,
+                        help='Fixed interval between readings in daemon mode (ms); by default the '
+                             'scheduler in config.json picks it from the operating mode')
+    parser.add_argument('--socket', default=None,
+                        help='Stream records on this Unix socket instead of stdout')
+    parser.add_argument('--simulate-i2c', action='store_true',
+                        help='Use the simulated MPU6050 register model instead of /dev/i2c-1 (CI, benchmarks)')
+    parser.add_argument('--format', choices=['json', 'binary'], default=None,
+                        help='Record encoding: JSON lines, or length-prefixed binary frames that '
+                             'send only changed fields (default from config.json, else json)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print the cold-start time per phase and per driver to stderr')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Time every pipeline stage and add a "_metrics" block to the output '
+                             '(also enabled by metrics.enabled in config.json)')
+
+    args = parser.parse_args(argv)
+    if args.interval_ms is not None and args.interval_ms <= 0:
+        parser.error('--interval-ms must be positive')
+    return args
+
+
+def main(argv=None):
+    """Main function - reads REAL sensors and outputs JSON."""
+    args = parse_args(argv)
+    profile = StartupProfile() if args.profile_startup else None
+    if profile:
+        profile.mark("imports")
+
+    try:
+        # Load configuration
+        config_manager = open_config()
+        config = load_config(config_manager)
+        registry = DriverRegistry(config)
+
+        smbus = None
+        if args.simulate_i2c:
+            from sensor_drivers.simulated_hardware import FakeSMBus
+            smbus = FakeSMBus(bus=1)
+        session = create_session(args.format or config.get("reader", {}).get("format", "json"), config)
+        metrics, exporter = create_metrics(config, args.metrics)
+        if profile:
+            profile.mark("config")
+
+        if args.daemon:
+            return run_daemon(config, args.interval_ms, args.socket, smbus, config_manager,
+                              registry, profile, session, metrics, exporter)
 
-        return 0
+        return run_once(config, smbus, registry, profile, session, metrics, exporter)
 
     except Exception as e:
         print(f"FATAL ERROR: {e}", file=sys.stderr)
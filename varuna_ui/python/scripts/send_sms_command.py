@@ -9,6 +9,7 @@ LOCATION: varuna_ui/python/scripts/send_sms_command.py
 """
 
 import sys
+import json
 import argparse
 from pathlib import Path
 
@@ -17,7 +18,37 @@ script_dir = Path(__file__).parent
 lib_dir = script_dir.parent / "lib"
 sys.path.insert(0, str(lib_dir))
 
-from sensor_drivers.sim800l_driver import SIM800L
+from varuna.sms_outbox import SMSOutbox, PRIORITIES
+
+
+def enqueue_sms(phone_number, message, priority='NORMAL'):
+    """
+    Queue an SMS for the outbox service and return immediately.
+
+    Args:
+        phone_number: Recipient phone number
+        message: Message text
+        priority: CRITICAL, HIGH, NORMAL or LOW
+
+    Returns:
+        0 on success, 1 on failure
+    """
+    config_path = script_dir.parent / "config" / "config.json"
+
+    try:
+        with open(config_path, 'r') as f:
+            outbox_config = json.load(f).get("sms_outbox", {})
+
+        outbox = SMSOutbox(script_dir.parent / outbox_config.get("path", "data/sms_outbox.db"))
+        message_id = outbox.enqueue(phone_number, message, priority)
+        outbox.close()
+
+        print(f"QUEUED: SMS #{message_id} to {phone_number} ({priority})", file=sys.stderr)
+        return 0
+
+    except Exception as e:
+        print(f"ERROR: Could not queue SMS - {e}", file=sys.stderr)
+        return 1
 
 
 def send_sms(phone_number, message, port='/dev/ttyUSB0'):
@@ -32,6 +63,8 @@ def send_sms(phone_number, message, port='/dev/ttyUSB0'):
     Returns:
         0 on success, 1 on failure
     """
+    from sensor_drivers.sim800l_driver import SIM800L
+
     try:
         # Initialize SIM800L
         gsm = SIM800L(port=port, baudrate=9600, timeout=10)
@@ -59,11 +92,18 @@ def main():
     parser = argparse.ArgumentParser(description='Send SMS via SIM800L')
     parser.add_argument('phone', help='Phone number (with country code)')
     parser.add_argument('message', help='Message text')
-    parser.add_argument('--port', default='/dev/ttyUSB0', help='Serial port')
+    parser.add_argument('--port', default='/dev/ttyUSB0', help='Serial port (with --direct)')
+    parser.add_argument('--priority', default='NORMAL', choices=list(PRIORITIES),
+                        help='Outbox priority (CRITICAL is sent first)')
+    parser.add_argument('--direct', action='store_true',
+                        help='Open the modem and send now instead of queueing')
 
     args = parser.parse_args()
 
-    return send_sms(args.phone, args.message, args.port)
+    if args.direct:
+        return send_sms(args.phone, args.message, args.port)
+
+    return enqueue_sms(args.phone, args.message, args.priority)
 
 
 if __name__ == "__main__":
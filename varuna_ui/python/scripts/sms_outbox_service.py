@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+═══════════════════════════════════════════════════════════════
+FILE: python/scripts/sms_outbox_service.py
+PHASE: Phase 7 - Communication and Control Features
+LOCATION: varuna_ui/python/scripts/sms_outbox_service.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import sys
+import time
+import signal
+import argparse
+from pathlib import Path
+
+# Add lib directory to path
+script_dir = Path(__file__).parent
+lib_dir = script_dir.parent / "lib"
+sys.path.insert(0, str(lib_dir))
+
+from sensor_drivers.sim800l_driver import SIM800L
+from sensor_drivers.metrics import Metrics, TextfileExporter
+from varuna.sms_outbox import SMSOutbox, OutboxService
+from varuna.uplink import open_uplink, create_sender
+from varuna.sms_commands import CommandDispatcher
+from varuna.config_manager import read_config, update_config, save_calibration
+
+config_path = script_dir.parent / "config" / "config.json"
+
+MIN_INTERVAL_S = 1
+MAX_INTERVAL_S = 3600
+
+
+def load_config():
+    """Read config.json, or an empty configuration if it is unreadable."""
+    try:
+        return read_config(config_path)
+    except Exception as e:
+        print(f"WARNING: Failed to load config - {e}", file=sys.stderr)
+        return {}
+
+
+def open_outbox(outbox_config):
+    """Open the outbox database configured under "sms_outbox"."""
+    return SMSOutbox(
+        script_dir.parent / outbox_config.get("path", "data/sms_outbox.db"),
+        max_attempts=outbox_config.get("max_attempts", 5),
+        retry_base=outbox_config.get("retry_base_s", 10.0),
+        retry_max=outbox_config.get("retry_max_s", 600.0)
+    )
+
+
+def status_command(args, sender):
+    """STATUS - latest recorded reading."""
+    config = load_config()
+    history_config = config.get("history", {})
+    path = script_dir.parent / history_config.get("path", "data/history.ring")
+
+    if not path.exists():
+        return f"{config.get('device_id', 'VARUNA')}: no readings recorded"
+
+    from varuna.history import ReadingHistory, STATUS_CODES
+
+    history = ReadingHistory(path, sync_every=0)
+    try:
+        records = history.latest(1)
+        if len(records) == 0:
+            return f"{config.get('device_id', 'VARUNA')}: no readings recorded"
+        # Copy out of the mapping before it is closed
+        record = records[-1:].copy()[0]
+    finally:
+        history.close()
+
+    status = {code: name for name, code in STATUS_CODES.items()}.get(int(record["status"]), "UNKNOWN")
+    level = float(record["level"])
+    thresholds = config.get("thresholds", {})
+    if level >= thresholds.get("danger_level_cm", 250):
+        band = "DANGER"
+    elif level >= thresholds.get("warning_level_cm", 200):
+        band = "WARNING"
+    else:
+        band = "NORMAL"
+
+    taken = time.strftime("%d-%m %H:%M", time.localtime(float(record["timestamp"])))
+    return (f"{config.get('device_id', 'VARUNA')} {taken}: level {level:.1f}cm ({band}), "
+            f"temp {float(record['temperature']):.1f}C, humidity {float(record['humidity']):.0f}%, "
+            f"sensor {status}")
+
+
+def interval_command(args, sender):
+    """INTERVAL n - set the reading interval in seconds."""
+    if len(args) != 1:
+        raise ValueError("expected one value in seconds")
+    try:
+        seconds = int(args[0])
+    except ValueError:
+        raise ValueError(f"'{args[0]}' is not a whole number")
+    if not MIN_INTERVAL_S <= seconds <= MAX_INTERVAL_S:
+        raise ValueError(f"interval must be {MIN_INTERVAL_S}-{MAX_INTERVAL_S}s")
+
+    # With the adaptive scheduler the interval is the NORMAL-mode one;
+    # FLOOD and CRITICAL keep their shorter intervals
+    if load_config().get("scheduler", {}).get("enabled", False):
+        update_config(config_path, {"scheduler": {"profiles": {"NORMAL": {"interval_ms": seconds * 1000}}}})
+        return f"NORMAL interval set to {seconds}s (applies when the reader restarts)"
+
+    update_config(config_path, {"reader": {"interval_ms": seconds * 1000}})
+    return f"Interval set to {seconds}s (applies when the reader restarts)"
+
+
+def calibrate_command(args, sender):
+    """CALIBRATE - zero the MPU6050 with the arm horizontal."""
+    from sensor_drivers.mpu6050_driver import MPU6050
+
+    offset_before = load_config().get("calibration", {}).get("mpu6050_offset", 0.0)
+    mpu = MPU6050(address=0x68, bus=1)
+    try:
+        result = mpu.calibrate_static()
+    except RuntimeError as e:
+        return f"Calibration failed: {e}"
+    finally:
+        mpu.close()
+
+    if not result["converged"]:
+        return (f"Calibration not saved: arm not still enough "
+                f"(+/-{result['stderr_deg']:.3f} deg after {result['elapsed_s']:.0f}s)")
+
+    save_calibration(config_path, result)
+    return f"Calibrated: offset {result['offset_deg']:.2f} deg (was {offset_before:.2f})"
+
+
+def create_dispatcher(commands_config, outbox):
+    """
+    Build the remote command dispatcher and its inbox handler.
+
+    Args:
+        commands_config: "remote_commands" section of config.json
+        outbox: SMSOutbox that carries the replies
+
+    Returns:
+        Callable(modem) for OutboxService.inbox_handler
+    """
+    dispatcher = CommandDispatcher(commands_config.get("authorized_senders", []))
+    dispatcher.register("STATUS", status_command, "STATUS")
+    dispatcher.register("INTERVAL", interval_command, "INTERVAL <seconds>")
+    dispatcher.register("CALIBRATE", calibrate_command, "CALIBRATE")
+
+    def reply(sender, text):
+        outbox.enqueue(sender, text, priority="HIGH")
+
+    def handle_inbox(modem):
+        processed = dispatcher.process_inbox(modem, reply)
+        if processed:
+            print(f"Commands: Processed {processed} message(s)", file=sys.stderr)
+
+    return handle_inbox
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Send queued SMS through one SIM800L session')
+    parser.add_argument('--port', help='Serial port for SIM800L (default from config.json)')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Accept a missing modem (messages are only logged)')
+    parser.add_argument('--commands', action='store_true',
+                        help='Answer remote SMS commands (also enabled by config.json)')
+    parser.add_argument('--uplink-url', help='Forward buffered telemetry to this URL '
+                                             '(overrides uplink.url; uplink.enabled must be true)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Time AT round-trips and count timeouts in metrics.outbox_textfile '
+                             '(also enabled by metrics.enabled in config.json)')
+
+    args = parser.parse_args()
+    config = load_config()
+    metrics_config = config.get("metrics", {})
+    outbox_config = config.get("sms_outbox", {})
+    commands_config = config.get("remote_commands", {})
+    port = args.port or outbox_config.get("port", "/dev/ttyUSB0")
+
+    metrics = None
+    exporter = None
+    if args.metrics or metrics_config.get("enabled", False):
+        metrics = Metrics()
+        exporter = TextfileExporter(
+            metrics,
+            script_dir.parent / metrics_config.get("outbox_textfile", "data/metrics/varuna_outbox.prom"),
+            interval=metrics_config.get("textfile_interval_s", 15.0),
+            labels={"device_id": config.get("device_id", "CWC-RJ-001")}
+        )
+        exporter.start()
+
+    def open_modem():
+        gsm = SIM800L(port=port, baudrate=9600, timeout=10, event_driven=True, metrics=metrics)
+        if gsm.serial_port is None and not args.simulate:
+            gsm.close()
+            return None
+        return gsm
+
+    outbox = open_outbox(outbox_config)
+
+    inbox_handler = None
+    if args.commands or commands_config.get("enabled", False):
+        inbox_handler = create_dispatcher(commands_config, outbox)
+
+    uplink = None
+    uplink_buffer = open_uplink(config, script_dir.parent)
+    if uplink_buffer is not None:
+        uplink = create_sender(config, uplink_buffer)
+        uplink.url = args.uplink_url or uplink.url
+        print(f"Outbox: Forwarding telemetry from {uplink_buffer.path} to {uplink.url}", file=sys.stderr)
+
+    service = OutboxService(
+        outbox,
+        open_modem,
+        min_send_interval=outbox_config.get("min_send_interval_s", 3.0),
+        inbox_handler=inbox_handler,
+        inbox_interval=commands_config.get("inbox_interval_s", 60.0),
+        uplink=uplink,
+        uplink_interval=config.get("uplink", {}).get("check_interval_s", 10.0)
+    )
+
+    def stop(signum, frame):
+        service.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Outbox: Serving {outbox.path} on {port}", file=sys.stderr)
+    try:
+        service.run()
+    finally:
+        outbox.close()
+        if uplink_buffer is not None:
+            uplink_buffer.close()
+        if exporter is not None:
+            exporter.stop()
+        print("Outbox: Stopped", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+═══════════════════════════════════════════════════════════════
+END OF FILE: python/scripts/sms_outbox_service.py
+═══════════════════════════════════════════════════════════════
+"""
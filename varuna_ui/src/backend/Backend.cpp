@@ -17,6 +17,10 @@
 #include <QProcess>
 #include <QRandomGenerator>  // FIX: Added for random number generation
 
+// Below this confidence the reader's slope comes from too few or too noisy
+// readings (scheduler.min_rate_confidence in config.json)
+static const qreal MIN_RATE_CONFIDENCE = 0.5;
+
 Backend::Backend(QObject *parent)
 : QObject(parent)
 , m_waterLevel(0.0)
@@ -220,8 +224,10 @@ void Backend::parseJsonData(const QByteArray &data)
     QJsonObject root = doc.object();
 
     // Update timestamp for rate calculation
+    // (the two-point estimate is only a fallback when the reader does not
+    // send its own regression slope)
     QDateTime now = QDateTime::currentDateTime();
-    if (!m_lastReadingTime.isNull()) {
+    if (!m_lastReadingTime.isNull() && !root.contains("rate_confidence")) {
         qint64 timeDiff = m_lastReadingTime.msecsTo(now);
         if (timeDiff > 0) {
             calculateRateOfChange();
@@ -278,6 +284,53 @@ void Backend::parseJsonData(const QByteArray &data)
         }
     }
 
+    // Parse additional level sensors (published when registered in the reader)
+    if (root.contains("ultrasonic")) {
+        QJsonObject ultrasonic = root["ultrasonic"].toObject();
+
+        qreal newDistance = ultrasonic["distance_cm"].toDouble(0.0);
+        qreal newLevel = ultrasonic["water_level_cm"].toDouble(0.0);
+        QString newStatus = ultrasonic["status"].toString("UNKNOWN");
+
+        if (qAbs(m_ultrasonicDistance - newDistance) > 0.01) {
+            m_ultrasonicDistance = newDistance;
+            emit ultrasonicDistanceChanged();
+        }
+
+        if (qAbs(m_ultrasonicWaterLevel - newLevel) > 0.01) {
+            m_ultrasonicWaterLevel = newLevel;
+            emit ultrasonicWaterLevelChanged();
+        }
+
+        if (m_ultrasonicStatus != newStatus) {
+            m_ultrasonicStatus = newStatus;
+            emit ultrasonicStatusChanged();
+        }
+    }
+
+    if (root.contains("pressure")) {
+        QJsonObject pressure = root["pressure"].toObject();
+
+        qreal newValue = pressure["pressure_mbar"].toDouble(0.0);
+        qreal newLevel = pressure["water_level_cm"].toDouble(0.0);
+        QString newStatus = pressure["status"].toString("UNKNOWN");
+
+        if (qAbs(m_pressureValue - newValue) > 0.01) {
+            m_pressureValue = newValue;
+            emit pressureValueChanged();
+        }
+
+        if (qAbs(m_pressureWaterLevel - newLevel) > 0.01) {
+            m_pressureWaterLevel = newLevel;
+            emit pressureWaterLevelChanged();
+        }
+
+        if (m_pressureStatus != newStatus) {
+            m_pressureStatus = newStatus;
+            emit pressureStatusChanged();
+        }
+    }
+
     // Parse consensus water level
     if (root.contains("consensus_level_cm")) {
         qreal newLevel = root["consensus_level_cm"].toDouble(0.0);
@@ -288,8 +341,11 @@ void Backend::parseJsonData(const QByteArray &data)
         }
     }
 
-    // Parse rate of change if provided
-    if (root.contains("rate_of_change_cm_per_hour")) {
+    // Parse rate of change if provided; a low-confidence slope is ignored
+    // and the last confident one kept, so a noisy window cannot force FLOOD
+    bool rateConfident = !root.contains("rate_confidence")
+        || root["rate_confidence"].toDouble(0.0) >= MIN_RATE_CONFIDENCE;
+    if (root.contains("rate_of_change_cm_per_hour") && rateConfident) {
         qreal newRate = root["rate_of_change_cm_per_hour"].toDouble(0.0);
 
         if (qAbs(m_rateOfChange - newRate) > 0.01) {
@@ -298,6 +354,15 @@ void Backend::parseJsonData(const QByteArray &data)
         }
     }
 
+    // Follow the reader's adaptive schedule: it shortens the polling
+    // interval in FLOOD/CRITICAL and stretches it in NORMAL/LOW_POWER
+    if (root.contains("schedule")) {
+        int nextInterval = root["schedule"].toObject()["next_interval_ms"].toInt(0);
+        if (nextInterval > 0 && qMax(1000, nextInterval) != m_updateInterval) {
+            setUpdateInterval(nextInterval);
+        }
+    }
+
     // Update operating mode based on readings
     updateOperatingMode();
 
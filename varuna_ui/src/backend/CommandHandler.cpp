@@ -105,11 +105,13 @@ void CommandHandler::handleProcessFinished(int exitCode, QProcess::ExitStatus ex
         QString output = m_commandProcess->readAllStandardOutput();
         QString error = m_commandProcess->readAllStandardError();
 
-        qDebug() << "CommandHandler: SMS sent successfully";
+        // send_sms_command.py hands the message to the outbox service,
+        // which sends and retries it in the background
+        qDebug() << "CommandHandler: SMS queued successfully";
         qDebug() << "CommandHandler: Output:" << output;
         qDebug() << "CommandHandler: Error:" << error;
 
-        m_lastResponse = "SMS sent successfully";
+        m_lastResponse = "SMS queued for sending";
         emit lastResponseChanged();
         emit smsSent(m_currentPhoneNumber, true);
     } else {